@@ -1,6 +1,7 @@
 import streamlit as st
 
 from persistence.engine import get_engine
+from persistence.input_cache import cached_input
 from persistence.repositories.scenario_repo import ScenarioRepo
 
 FLOW_TOPSIS = [
@@ -30,7 +31,7 @@ def sync_method_from_scenario(scenario_id: str | None = None):
         return None
 
     repo = ScenarioRepo(get_engine())
-    scenario = repo.get_scenario(sid)
+    scenario = cached_input("scenario", lambda: repo.get_scenario(sid), scenario_id=sid)
     if not scenario:
         return None
 
@@ -13,14 +13,23 @@ import streamlit as st
 from sqlalchemy import text
 
 from app.ui_theme import BLUE_SCALE, BLUE_TEAL_SCALE, DISCRETE_PALETTE, section_header
-from core.topsis import compute_topsis
+from core.distance import DISTANCES
+from core.normalization import NORMALIZATIONS
+from core.ranking import Ranking
+from core.sensitivity_artifacts import topsis_sensitivity_artifacts
+from core.topsis import CompactTopsisArtifacts, compute_topsis
+from core.value_functions import SCALING_TYPES
+from core.vft_kernel import score_vft
 from core.vft_model import Attribute
+from persistence.input_cache import invalidate_scenario
 from persistence.repositories.alternative_repo import AlternativeRepo
 from persistence.repositories.criterion_repo import CriterionRepo
 from persistence.repositories.measurement_repo import MeasurementRepo
 from persistence.repositories.preference_repo import PreferenceRepo
 from persistence.repositories.result_repo import ResultRepo
+from persistence.repositories.sensitivity_repo import SensitivityRepo
 from persistence.repositories.topsis_repo import TopsisRepo
+from persistence.unit_of_work import UnitOfWork
 from services.scenario_service import ScenarioService
 from services.vft_service import VFTService
 
@@ -118,8 +127,6 @@ def render_topsis_run(engine, scenario_id: str, user_name: str) -> None:
         st.session_state["run_label_default"] = run_label
 
     scenario_service = ScenarioService(engine)
-    result_repo = ResultRepo(engine)
-    topsis_repo = TopsisRepo(engine)
 
     preview_key = f"{scenario_id}|{pref_id}|topsis"
     if st.session_state.get("preview_key") != preview_key:
@@ -152,6 +159,34 @@ def render_topsis_run(engine, scenario_id: str, user_name: str) -> None:
             wt_row = pd.DataFrame([{c: wts.get(c, 0.0) for c in mat.columns}], index=["Weight"])
             st.dataframe(pd.concat([wt_row, mat]), use_container_width=True)
 
+    col_norm, col_dist, col_p = st.columns(3)
+    with col_norm:
+        normalization = st.selectbox(
+            "Normalization",
+            options=list(NORMALIZATIONS),
+            index=0,
+            key=f"topsis_norm_{scenario_id}",
+        )
+    with col_dist:
+        distance = st.selectbox(
+            "Distance",
+            options=list(DISTANCES),
+            index=0,
+            key=f"topsis_dist_{scenario_id}",
+        )
+    distance_p = None
+    if distance == "minkowski":
+        with col_p:
+            distance_p = float(
+                st.number_input("Minkowski order p", min_value=1.0, value=3.0, step=0.5, key=f"topsis_p_{scenario_id}")
+            )
+    compact = st.checkbox(
+        "Memory-lean preview (float32)",
+        value=False,
+        key=f"topsis_compact_{scenario_id}",
+        help="Keep the preview in float32 to save memory. Saving recomputes the run in full float64 precision, so stored matrices, ideals and scores all come from the same computation.",
+    )
+
     def compute_input_signature() -> str:
         w = data.weights.astype(float)
         w = w / (float(w.sum()) + 1e-12)
@@ -163,6 +198,9 @@ def render_topsis_run(engine, scenario_id: str, user_name: str) -> None:
         h.update(("dirs:" + "|".join(data.directions)).encode())
         h.update(mat.tobytes(order="C"))
         h.update(w.tobytes(order="C"))
+        # Only non-default strategies enter the hash so vector/euclidean runs keep their old signatures.
+        if (normalization, distance) != ("vector", "euclidean"):
+            h.update(f"cfg:{normalization}|{distance}|{distance_p}".encode())
         return h.hexdigest()
 
     def find_existing_identical_run(sig: str):
@@ -196,25 +234,22 @@ def render_topsis_run(engine, scenario_id: str, user_name: str) -> None:
         sig = compute_input_signature()
         w = data.weights.astype(float)
         w = w / (float(w.sum()) + 1e-12)
-        artifacts = compute_topsis(
-            matrix=data.matrix.astype(float),
-            weights=w,
-            directions=data.directions,
-        )
-        alt_scores = sorted(
-            [
-                {"alternative_name": data.alternative_names[i], "score": float(artifacts.c_star[i])}
-                for i in range(len(data.alternative_names))
-            ],
-            key=lambda r: r["score"],
-            reverse=True,
-        )
-        for i, r in enumerate(alt_scores, 1):
-            r["rank"] = i
-
+        try:
+            artifacts = compute_topsis(
+                matrix=data.matrix.astype(float),
+                weights=w,
+                directions=data.benefit_mask,
+                normalization=normalization,
+                distance=distance,
+                distance_p=distance_p,
+                compact=compact,
+            )
+        except ValueError as e:
+            st.error(str(e))
+            st.stop()
         existing_run_id, existing_meta = find_existing_identical_run(sig)
         st.session_state["dup_check"] = {"sig": sig, "existing_run_id": existing_run_id, "existing_meta": existing_meta}
-        st.session_state["topsis_preview"] = {"sig": sig, "scores": alt_scores, "artifacts": artifacts}
+        st.session_state["topsis_preview"] = {"sig": sig, "ranking": Ranking(artifacts.c_star), "artifacts": artifacts}
         st.rerun()
 
     preview = st.session_state.get("topsis_preview")
@@ -222,9 +257,25 @@ def render_topsis_run(engine, scenario_id: str, user_name: str) -> None:
 
     if preview:
         section_header("Preview Ranking", variant="sub")
-        scores_df = pd.DataFrame(preview["scores"])
+        ranking = preview["ranking"]
+        n_alts = len(ranking)
+        show_top = n_alts
+        if n_alts > 10:
+            show_top = int(
+                st.number_input(
+                    f"Show top (of {n_alts})", min_value=1, max_value=n_alts, value=10, step=1, key="topsis_preview_top_k"
+                )
+            )
+        top_idx = ranking.top(show_top)
+        scores_df = pd.DataFrame(
+            {
+                "alternative_name": [data.alternative_names[i] for i in top_idx],
+                "score": ranking.scores[top_idx],
+                "rank": np.arange(1, len(top_idx) + 1),
+            }
+        )
         fig = px.bar(
-            scores_df.sort_values("rank"),
+            scores_df,
             x="alternative_name",
             y="score",
             color="score",
@@ -261,6 +312,13 @@ def render_topsis_run(engine, scenario_id: str, user_name: str) -> None:
         )
         overwrite = st.checkbox("Overwrite existing run instead of creating a new one", value=True)
 
+    precompute_sensitivity = st.checkbox(
+        "Precompute sensitivity views",
+        value=True,
+        key=f"topsis_precompute_sens_{scenario_id}",
+        help="Store weight sweeps, tornado extremes and stability intervals with the run so Step 5 opens them without recomputing.",
+    )
+
     _sr_spacer, _sr_actions = st.columns([2, 3])
     with _sr_actions:
         _sr_save, _sr_next = st.columns(2)
@@ -283,61 +341,56 @@ def render_topsis_run(engine, scenario_id: str, user_name: str) -> None:
             st.stop()
 
         artifacts = preview["artifacts"]
+        if isinstance(artifacts, CompactTopsisArtifacts):
+            # Persist float64 artifacts only; float32 matrices would not match the stored ideals and scores.
+            w = data.weights.astype(float)
+            artifacts = compute_topsis(
+                matrix=data.matrix.astype(float),
+                weights=w / (float(w.sum()) + 1e-12),
+                directions=data.benefit_mask,
+                normalization=artifacts.normalization,
+                distance=artifacts.distance,
+                distance_p=artifacts.distance_p,
+            )
         sig = preview["sig"]
         label_clean = (run_label or "").strip() or None
         existing_run_id = dup_check.get("existing_run_id") if dup_check else None
 
-        def persist(run_id):
-            topsis_repo.save_run_config(run_id, normalization="vector", distance="euclidean")
+        normalized = artifacts.normalized_matrix
+        sens = None
+        if precompute_sensitivity:
+            w = data.weights.astype(float)
+            w = w / (float(w.sum()) + 1e-12)
+            sens = topsis_sensitivity_artifacts(
+                normalized, data.benefit_mask, w, distance=artifacts.distance, distance_p=artifacts.distance_p
+            )
+
+        def persist(uow, run_id):
+            topsis_repo = uow.repo(TopsisRepo)
+            sensitivity_repo = uow.repo(SensitivityRepo)
+            topsis_repo.save_run_config(
+                run_id,
+                normalization=artifacts.normalization,
+                distance=artifacts.distance,
+                distance_p=artifacts.distance_p,
+            )
             alt_id_to_score = {data.alternative_ids[i]: float(artifacts.c_star[i]) for i in range(len(data.alternative_ids))}
-            result_repo.replace_scores(run_id, alt_id_to_score)
-            m, n = data.matrix.shape
-            norm_rows, w_rows, ideal_rows, dist_rows = [], [], [], []
-            for i in range(m):
-                for j in range(n):
-                    norm_rows.append(
-                        {
-                            "run_id": run_id,
-                            "alternative_id": data.alternative_ids[i],
-                            "criterion_id": data.criterion_ids[j],
-                            "value": float(artifacts.normalized_matrix[i, j]),
-                        }
-                    )
-                    w_rows.append(
-                        {
-                            "run_id": run_id,
-                            "alternative_id": data.alternative_ids[i],
-                            "criterion_id": data.criterion_ids[j],
-                            "value": float(artifacts.weighted_matrix[i, j]),
-                        }
-                    )
-            for j in range(n):
-                ideal_rows.append(
-                    {
-                        "run_id": run_id,
-                        "criterion_id": data.criterion_ids[j],
-                        "pos_ideal": float(artifacts.pis[j]),
-                        "neg_ideal": float(artifacts.nis[j]),
-                    }
-                )
-            for i in range(m):
-                dist_rows.append(
-                    {
-                        "run_id": run_id,
-                        "alternative_id": data.alternative_ids[i],
-                        "s_pos": float(artifacts.s_pos[i]),
-                        "s_neg": float(artifacts.s_neg[i]),
-                        "c_star": float(artifacts.c_star[i]),
-                    }
-                )
-            topsis_repo.replace_normalized(run_id, norm_rows)
-            topsis_repo.replace_weighted(run_id, w_rows)
-            topsis_repo.replace_ideals(run_id, ideal_rows)
-            topsis_repo.replace_distances(run_id, dist_rows)
+            uow.repo(ResultRepo).replace_scores(run_id, alt_id_to_score)
+            topsis_repo.replace_normalized(run_id, data.alternative_ids, data.criterion_ids, normalized)
+            topsis_repo.replace_weighted(run_id, data.alternative_ids, data.criterion_ids, artifacts.weighted_matrix)
+            topsis_repo.replace_ideals(run_id, data.criterion_ids, artifacts.pis, artifacts.nis)
+            topsis_repo.replace_distances(
+                run_id, data.alternative_ids, artifacts.s_pos, artifacts.s_neg, artifacts.c_star
+            )
+            if sens is not None:
+                sensitivity_repo.save(run_id, data.alternative_names, data.criterion_names, sens)
+            else:
+                sensitivity_repo.delete(run_id)
 
+        # The run header and everything persist() writes commit together.
         if existing_run_id and overwrite:
-            with engine.begin() as conn:
-                conn.execute(
+            with UnitOfWork(engine) as uow:
+                uow.conn.execute(
                     text("""
                         UPDATE runs SET executed_at=now(), executed_by=:by,
                             engine_version=:ev, input_signature=:sig, run_label=:lbl
@@ -351,12 +404,12 @@ def render_topsis_run(engine, scenario_id: str, user_name: str) -> None:
                         "rid": existing_run_id,
                     },
                 )
-            persist(existing_run_id)
+                persist(uow, existing_run_id)
             run_id = existing_run_id
             st.success(f"✅ Updated existing run: {run_id[:8]}…")
         else:
-            with engine.begin() as conn:
-                row = conn.execute(
+            with UnitOfWork(engine) as uow:
+                row = uow.conn.execute(
                     text("""
                         INSERT INTO runs (scenario_id, preference_set_id, method, engine_version,
                                          executed_by, input_signature, run_label)
@@ -372,10 +425,11 @@ def render_topsis_run(engine, scenario_id: str, user_name: str) -> None:
                         "lbl": label_clean,
                     },
                 ).mappings().first()
-            run_id = str(row["run_id"])
-            persist(run_id)
+                run_id = str(row["run_id"])
+                persist(uow, run_id)
             st.success(f"✅ Saved new run: {run_id[:8]}…")
 
+        invalidate_scenario(scenario_id)
         st.session_state["last_run_id"] = run_id
         st.session_state.pop("topsis_preview", None)
         st.session_state.pop("dup_check", None)
@@ -454,8 +508,11 @@ def render_vft_run(engine, scenario_id: str, user_name: str) -> None:
                     name=cname,
                     min_val=min_val,
                     max_val=max_val,
-                    scaling_type="Linear",
+                    scaling_type=SCALING_TYPES.get(ft, "Linear"),
                     scaling_direction="Increasing" if is_inc else "Decreasing",
+                    rho=vf.get("rho"),
+                    midpoint=vf.get("midpoint"),
+                    steepness=vf.get("steepness"),
                 )
         else:
             is_inc = crit.get("direction") == "benefit"
@@ -521,37 +578,27 @@ def render_vft_run(engine, scenario_id: str, user_name: str) -> None:
         attr.swing_weight = attr.weight * 100
 
     def compute_preview():
-        utility_matrix = {}
-        weighted_matrix = {}
-        total_scores = {}
         attr_by_name = {a.name: a for a in attributes}
-
-        for alt_name in matrix_df.index:
-            utility_matrix[alt_name] = {}
-            weighted_matrix[alt_name] = {}
-            total = 0.0
-            for crit_name in matrix_df.columns:
-                raw = float(matrix_df.loc[alt_name, crit_name])
-                attr = attr_by_name.get(crit_name)
-                u = attr.get_value(raw) if attr else 0.0
-                w = float(weights.get(crit_name, 0.0))
-                if w_total > 0:
-                    w = w / w_total
-                utility_matrix[alt_name][crit_name] = u
-                weighted_matrix[alt_name][crit_name] = u * w
-                total += u * w
-            total_scores[alt_name] = total
-
-        return utility_matrix, weighted_matrix, total_scores
+        cols = list(matrix_df.columns)
+        w = np.array([float(weights.get(c, 0.0)) for c in cols], dtype=float)
+        if w_total > 0:
+            w = w / w_total
+        scores = score_vft(matrix_df.to_numpy(dtype=float), [attr_by_name.get(c) for c in cols], w)
+
+        alt_names = list(matrix_df.index)
+        utility_df = pd.DataFrame(scores.utility, index=alt_names, columns=cols)
+        weighted_df = pd.DataFrame(scores.weighted, index=alt_names, columns=cols)
+        total_scores = dict(zip(alt_names, scores.total.tolist()))
+        return utility_df, weighted_df, total_scores
 
     st.divider()
     section_header("Run Preview", variant="accent")
 
     if st.button("Preview VFT Scoring", type="primary", key="vft_preview_btn"):
-        utility_matrix, weighted_matrix, total_scores = compute_preview()
+        utility_df, weighted_df, total_scores = compute_preview()
         st.session_state["vft_preview"] = {
-            "utility_matrix": utility_matrix,
-            "weighted_matrix": weighted_matrix,
+            "utility_df": utility_df,
+            "weighted_df": weighted_df,
             "total_scores": total_scores,
         }
         st.rerun()
@@ -564,8 +611,8 @@ def render_vft_run(engine, scenario_id: str, user_name: str) -> None:
 
     if preview:
         total_scores = preview["total_scores"]
-        utility_matrix = preview["utility_matrix"]
-        weighted_matrix = preview["weighted_matrix"]
+        utility_df = preview["utility_df"]
+        weighted_df = preview["weighted_df"]
 
         sorted_alts = sorted(total_scores.items(), key=lambda x: x[1], reverse=True)
         teal_rank_colors = ["#2A9D8F", "#52B7A5", "#A7DAD0", "#74C7B8", "#8ED3C7"]
@@ -639,13 +686,11 @@ def render_vft_run(engine, scenario_id: str, user_name: str) -> None:
         st.dataframe(rank_df_display, use_container_width=True)
 
         section_header("Utility Matrix (0-1)", variant="sub")
-        util_df = pd.DataFrame(utility_matrix).T
-        util_df = util_df[crit_names]
+        util_df = utility_df[crit_names]
         _render_light_table(util_df.reset_index(drop=True), "{:.4f}")
 
         section_header("Weighted Contribution Matrix", variant="sub")
-        weighted_df = pd.DataFrame(weighted_matrix).T
-        weighted_df = weighted_df[crit_names]
+        weighted_df = weighted_df[crit_names].copy()
         weighted_df["Total"] = weighted_df.sum(axis=1)
         _render_light_table(weighted_df.reset_index(drop=True), "{:.4f}")
 
@@ -682,6 +727,13 @@ def render_vft_run(engine, scenario_id: str, user_name: str) -> None:
         st.divider()
         section_header("Save Run", variant="accent")
 
+        vft_precompute_sensitivity = st.checkbox(
+            "Precompute sensitivity views",
+            value=True,
+            key=f"vft_precompute_sens_{scenario_id}",
+            help="Store weight sweeps, tornado extremes and stability intervals with the run so Step 5 opens them without recomputing.",
+        )
+
         _vft_sr_spacer, _vft_sr_actions = st.columns([2, 3])
         with _vft_sr_actions:
             _vft_save_col, _vft_next_col = st.columns(2)
@@ -709,6 +761,7 @@ def render_vft_run(engine, scenario_id: str, user_name: str) -> None:
                 alt_map=alt_map,
                 crit_map=crit_map,
                 run_label=run_label or None,
+                precompute_sensitivity=vft_precompute_sensitivity,
             )
 
             st.success(f"✅ VFT run saved successfully. Run ID: {str(run_id)[:8]}…")
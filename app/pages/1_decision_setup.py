@@ -8,6 +8,7 @@ from sqlalchemy.exc import IntegrityError
 from app.app_context import set_scenario_context
 from app.sidebar_nav import render_sidebar
 from persistence.engine import get_engine
+from persistence.input_cache import invalidate_scenario
 from persistence.repositories.decision_repo import DecisionRepo
 from persistence.repositories.scenario_repo import ScenarioRepo
 from services.scenario_share_service import ScenarioShareService
@@ -139,6 +140,7 @@ with st.expander("Import a colleague's scenario (.mcda file)", expanded=False):
                                 text("UPDATE scenarios SET name=:name WHERE scenario_id=:sid"),
                                 {"name": new_name, "sid": result["scenario_id"]},
                             )
+                        invalidate_scenario(result["scenario_id"])
                     final_name = new_name or result.get("scenario_name", "")
                     st.session_state["decision_id"] = result["decision_id"]
                     st.session_state["scenario_id"] = result["scenario_id"]
@@ -315,6 +317,7 @@ else:
                     text("UPDATE scenarios SET name=:name WHERE scenario_id=:sid"),
                     {"name": new_scen_name.strip(), "sid": selected_scenario},
                 )
+            invalidate_scenario(selected_scenario)
             st.toast(f"✅ Renamed to '{new_scen_name.strip()}'", icon="✏️")
             st.rerun()
 
@@ -12,6 +12,7 @@ from persistence.engine import get_engine
 from persistence.repositories.criterion_repo import CriterionRepo
 from persistence.repositories.measurement_repo import MeasurementRepo
 from services.vft_service import VFTService
+from core.value_functions import SCALING_TYPES, curve_points
 from core.vft_model import Attribute
 
 st.set_page_config(page_title="MCDA — 3b · Value curves", layout="wide")
@@ -139,13 +140,17 @@ for tab_idx, (tab, crit) in enumerate(zip(crit_tabs, existing_crit)):
             st.caption(f"Direction: {dir_display} · Data range: `{data_min:.3f}` - `{data_max:.3f}` "
                        f"{selected_crit.get('unit') or ''}")
 
+            scaling_options = ["Linear", "Exponential", "S-Curve", "Custom (Piecewise)"]
+            existing_scaling = SCALING_TYPES.get(existing_ft, "Linear")
             scaling_type = st.selectbox(
                 "Scaling type",
-                ["Linear", "Custom (Piecewise)"],
-                index=0 if existing_ft == "linear" else 1,
+                scaling_options,
+                index=3 if existing_scaling == "Custom" else scaling_options.index(existing_scaling),
                 key=f"scale_type_{tab_idx}_{selected_crit_name}",
             )
-            is_linear = scaling_type == "Linear"
+            # Linear, Exponential and S-Curve are all defined by a direction and a raw range
+            is_linear = scaling_type != "Custom (Piecewise)"
+            curve_params = {}
 
             if is_linear:
                 direction = st.radio(
@@ -174,6 +179,36 @@ for tab_idx, (tab, crit) in enumerate(zip(crit_tabs, existing_crit)):
                         format="%.4f",
                     )
 
+                span = max(lin_max - lin_min, 1e-9)
+                if scaling_type == "Exponential":
+                    stored_rho = existing_vf.get("rho") if existing_ft == "exponential" else None
+                    curve_params["rho"] = st.number_input(
+                        "Shape ρ (smaller |ρ| bends more; negative ρ flips the bend)",
+                        value=float(stored_rho) if stored_rho is not None else span / 2.0,
+                        key=f"exp_rho_{tab_idx}_{selected_crit_name}",
+                        format="%.4f",
+                    )
+                elif scaling_type == "S-Curve":
+                    stored_s = existing_ft == "s_curve"
+                    s_col1, s_col2 = st.columns(2)
+                    with s_col1:
+                        curve_params["midpoint"] = st.number_input(
+                            "Midpoint (utility 0.5)",
+                            value=float(existing_vf["midpoint"]) if stored_s and existing_vf.get("midpoint") is not None
+                            else (lin_min + lin_max) / 2.0,
+                            key=f"s_mid_{tab_idx}_{selected_crit_name}",
+                            format="%.4f",
+                        )
+                    with s_col2:
+                        curve_params["steepness"] = st.number_input(
+                            "Steepness (per raw unit)",
+                            value=float(existing_vf["steepness"]) if stored_s and existing_vf.get("steepness") is not None
+                            else 10.0 / span,
+                            min_value=1e-9,
+                            key=f"s_steep_{tab_idx}_{selected_crit_name}",
+                            format="%.4f",
+                        )
+
                 custom_points = None
 
             else:
@@ -207,15 +242,19 @@ for tab_idx, (tab, crit) in enumerate(zip(crit_tabs, existing_crit)):
                          key=f"btn_save_vf_{tab_idx}_{selected_crit_name}"):
                 if is_linear:
                     if lin_max <= lin_min:
-                        st.error("Raw maximum must be greater than raw minimum for a linear value function.")
+                        st.error(f"Raw maximum must be greater than raw minimum for a {scaling_type.lower()} value function.")
+                        st.stop()
+                    if curve_params.get("rho") == 0:
+                        st.error("Shape ρ must be non-zero.")
                         st.stop()
 
                     attr = Attribute(
                         name=selected_crit_name,
                         min_val=lin_min,
                         max_val=lin_max,
-                        scaling_type="Linear",
+                        scaling_type=scaling_type,
                         scaling_direction="Increasing" if is_increasing else "Decreasing",
+                        **curve_params,
                     )
                 else:
                     if len(custom_points) < 2:
@@ -254,8 +293,9 @@ for tab_idx, (tab, crit) in enumerate(zip(crit_tabs, existing_crit)):
                     name=selected_crit_name,
                     min_val=plot_min,
                     max_val=plot_max,
-                    scaling_type="Linear",
+                    scaling_type=scaling_type,
                     scaling_direction=plot_direction,
+                    **{k: v for k, v in curve_params.items() if v != 0},
                 )
                 plot_pts = None
             else:
@@ -278,6 +318,8 @@ for tab_idx, (tab, crit) in enumerate(zip(crit_tabs, existing_crit)):
             if plot_pts and len(plot_pts) >= 2:
                 line_x = [p[0] for p in sorted(plot_pts, key=lambda pt: pt[0])]
                 line_y = [p[1] for p in sorted(plot_pts, key=lambda pt: pt[0])]
+            elif is_linear and scaling_type != "Linear":
+                line_x, line_y = map(list, zip(*curve_points(attr_plot.value_function, attr_plot.min_val, attr_plot.max_val)))
             else:
                 line_x = [attr_plot.min_val, attr_plot.max_val]
                 try:
@@ -11,10 +11,35 @@ from sqlalchemy import text
 
 from app.app_context import guard_page, sync_method_from_scenario
 from app.sidebar_nav import render_sidebar
+from core.distance import distance_order, get_distance
+from core.monte_carlo import (
+    acceptability_frame,
+    dirichlet_distribution,
+    interval_distribution,
+    topsis_monte_carlo,
+    vft_monte_carlo,
+)
+from core.sensitivity import (
+    topsis_tornado,
+    topsis_weight_sweep,
+    vft_break_even,
+    vft_score_sweep,
+    vft_tornado,
+    vft_weight_sweep,
+)
+from core.stability import topsis_stability_intervals, vft_stability_intervals
+from core.topsis import compile_directions, ideal_solutions, topsis_batch_from_normalized
+from core.topsis_incremental import IncrementalTopsis
+from core.value_functions import SCALING_TYPES, compile_value_function, piecewise_from_points
+from core.weight_plane import DEFAULT_GRID_POINTS, topsis_weight_plane, vft_weight_plane
 from persistence.engine import get_engine
+from persistence.input_cache import cached_loader, invalidate_scenario
+from persistence.repositories.comparison_repo import ComparisonRepo
 from persistence.repositories.preference_repo import PreferenceRepo
-from persistence.repositories.result_repo import ResultRepo
+from persistence.repositories.scenario_repo import FINGERPRINT_PARTS, ScenarioRepo
+from persistence.repositories.sensitivity_repo import SensitivityRepo
 from persistence.repositories.topsis_read_repo import TopsisReadRepo
+from persistence.repositories.topsis_repo import TopsisRepo
 
 st.set_page_config(page_title="MCDA - Sensitivity & Comparison", layout="wide")
 apply_theme()
@@ -30,8 +55,11 @@ section_header("Sensitivity Analysis & Preference Set Comparison", variant="grad
 
 engine = get_engine()
 pref_repo = PreferenceRepo(engine)
-result_repo = ResultRepo(engine)
+comparison_repo = ComparisonRepo(engine)
 topsis_read_repo = TopsisReadRepo(engine)
+topsis_repo = TopsisRepo(engine)
+scenario_repo = ScenarioRepo(engine)
+sensitivity_repo = SensitivityRepo(engine)
 
 scenario_id = st.session_state.get("scenario_id")
 user_name = st.session_state.get("user_name", "")
@@ -107,6 +135,24 @@ NEUTRAL_LINE = "#6C757D"
 
 PATTERN_SEQUENCE = ["", "/", "\\", "x", ".", "+", "-"]
 
+# core.sensitivity tornado frame -> chart column labels
+TORNADO_COLUMNS = {
+    "criterion": "Criterion",
+    "base_score": "Base Score",
+    "weight0_score": "Weight0 Score",
+    "weight1_score": "Weight1 Score",
+    "min_score": "Min Score",
+    "max_score": "Max Score",
+    "spread": "Spread",
+}
+
+STABILITY_TARGETS = {"Full ranking": "ranking", "Top alternative": "top1"}
+WEIGHT_DISTRIBUTIONS = [
+    "Dirichlet around current weights",
+    "Uniform over all weight vectors",
+    "Interval around current weights",
+]
+
 
 # -----------------------------------------------------------------------------
 # Generic helpers
@@ -150,6 +196,7 @@ def get_measurement_value_column() -> str:
     return "value_num"
 
 
+@cached_loader(scenario="sid")
 def load_measurements_long(sid: str) -> list[dict]:
     value_col = get_measurement_value_column()
     sql = f"""
@@ -168,6 +215,29 @@ def load_measurements_long(sid: str) -> list[dict]:
     return [dict(r) for r in rows]
 
 
+@cached_loader(scenario="sid")
+def load_criteria_meta(sid: str) -> list[dict]:
+    with engine.begin() as conn:
+        rows = conn.execute(
+            text(
+                """
+                SELECT name, direction, scale_type
+                FROM criteria
+                WHERE scenario_id = :sid
+                ORDER BY created_at
+                """
+            ),
+            {"sid": sid},
+        ).mappings().all()
+    return [dict(r) for r in rows]
+
+
+@cached_loader(preference_set="pid")
+def load_weights(pid: str) -> dict[str, float]:
+    return pref_repo.load_weights_by_criterion_name(pid)
+
+
+@cached_loader(scenario="sid")
 def load_prefs(sid: str) -> list[dict]:
     with engine.begin() as conn:
         rows = conn.execute(
@@ -208,6 +278,7 @@ def load_all_pref_options(method: str) -> list[dict]:
     return [dict(r) for r in rows]
 
 
+@cached_loader(scenario="sid")
 def load_runs_for_pref(sid: str, pid: str, method: str) -> list[dict]:
     with engine.begin() as conn:
         rows = conn.execute(
@@ -227,55 +298,49 @@ def load_runs_for_pref(sid: str, pid: str, method: str) -> list[dict]:
     return [dict(r) for r in rows]
 
 
-def get_scores(run_id: str) -> pd.DataFrame:
-    return pd.DataFrame(result_repo.get_scores_with_names(run_id))
-
-
-def get_distances(run_id: str) -> pd.DataFrame:
-    df = topsis_read_repo.get_distances(run_id)
-    return df if df is not None else pd.DataFrame()
-
-
+@cached_loader(run="run_id")
 def get_norm_matrix(run_id: str) -> pd.DataFrame:
     df = topsis_read_repo.get_matrix(run_id, "normalized")
     return df if df is not None else pd.DataFrame()
 
 
-def get_weighted_matrix(run_id: str) -> pd.DataFrame:
-    df = topsis_read_repo.get_matrix(run_id, "weighted")
-    return df if df is not None else pd.DataFrame()
+@cached_loader(run="run_id")
+def load_run_distance(run_id: str) -> tuple[str, float | None]:
+    """(distance, distance_p) the run was saved with; Euclidean when no config is stored."""
+    cfg = topsis_repo.get_run_config(run_id)
+    if not cfg:
+        return "euclidean", None
+    return cfg["distance"], cfg["distance_p"]
 
 
-def get_vft_weighted_long(run_id: str) -> pd.DataFrame:
-    with engine.begin() as conn:
-        rows = conn.execute(
-            text(
-                """
-                SELECT
-                    a.name AS alternative_name,
-                    c.name AS criterion_name,
-                    vwu.weighted_utility AS weighted_value
-                FROM vft_weighted_utilities vwu
-                JOIN alternatives a ON a.alternative_id = vwu.alternative_id
-                JOIN criteria c ON c.criterion_id = vwu.criterion_id
-                WHERE vwu.run_id = :rid
-                ORDER BY a.name, c.name
-                """
-            ),
-            {"rid": run_id},
-        ).mappings().all()
+@cached_loader(run="run_id")
+def load_run_sensitivity(run_id: str) -> dict | None:
+    return sensitivity_repo.get(run_id)
 
-    if not rows:
-        return pd.DataFrame()
 
-    df = pd.DataFrame(rows)
-    return df.rename(
-        columns={
-            "alternative_name": "Alternative",
-            "criterion_name": "Criterion",
-            "weighted_value": "Weighted Value",
-        }
-    )
+def stored_sensitivity(
+    run_id: str | None,
+    alt_names: list[str],
+    crit_names: list[str],
+    base_weights: np.ndarray,
+    base_scores: np.ndarray,
+):
+    """
+    Artifacts precomputed for run_id, or None when absent or not for these
+    inputs. A stored set that does not match is reported, not silently skipped.
+    """
+    stored = load_run_sensitivity(run_id) if run_id else None
+    if not stored:
+        return None
+    artifacts = stored["artifacts"]
+    if (
+        stored["alternative_names"] == list(alt_names)
+        and stored["criterion_names"] == list(crit_names)
+        and artifacts.matches(base_weights, base_scores)
+    ):
+        return artifacts
+    st.caption("Precomputed sensitivity views do not match these inputs; recomputing them.")
+    return None
 
 
 def build_spider_chart(df_weighted: pd.DataFrame, selected_alts: list[str], title: str) -> go.Figure:
@@ -315,7 +380,13 @@ def build_spider_chart(df_weighted: pd.DataFrame, selected_alts: list[str], titl
 # -----------------------------------------------------------------------------
 # TOPSIS helpers
 # -----------------------------------------------------------------------------
-def topsis_from_normalized(norm_df: pd.DataFrame, weights_by_name: dict, crit_meta_list: list[dict]) -> dict:
+def topsis_from_normalized(
+    norm_df: pd.DataFrame,
+    weights_by_name: dict,
+    crit_meta_list: list[dict],
+    distance: str = "euclidean",
+    distance_p: float | None = None,
+) -> dict:
     if norm_df is None or norm_df.empty:
         return {}
 
@@ -331,24 +402,14 @@ def topsis_from_normalized(norm_df: pd.DataFrame, weights_by_name: dict, crit_me
     weighted_df = norm_df.astype(float).mul(w_series, axis=1)
 
     meta_by_name = {c["name"]: c for c in crit_meta_list}
-    pos_ideal, neg_ideal = {}, {}
-
-    for c in crits:
-        direction = meta_by_name.get(c, {}).get("direction", "benefit")
-        col = weighted_df[c].astype(float)
-        if direction == "cost":
-            pos_ideal[c] = float(col.min())
-            neg_ideal[c] = float(col.max())
-        else:
-            pos_ideal[c] = float(col.max())
-            neg_ideal[c] = float(col.min())
+    benefit_mask = compile_directions(
+        [meta_by_name.get(c, {}).get("direction", "benefit") for c in crits]
+    )
 
-    pos_vec = np.array([pos_ideal[c] for c in crits])
-    neg_vec = np.array([neg_ideal[c] for c in crits])
     x_mat = weighted_df[crits].astype(float).values
+    pos_vec, neg_vec = ideal_solutions(x_mat, benefit_mask)
 
-    s_pos = np.sqrt(((x_mat - pos_vec) ** 2).sum(axis=1))
-    s_neg = np.sqrt(((x_mat - neg_vec) ** 2).sum(axis=1))
+    s_pos, s_neg = get_distance(distance, distance_p)(x_mat, pos_vec, neg_vec)
 
     denom = s_pos + s_neg
     denom[denom == 0] = 1e-12
@@ -383,11 +444,82 @@ def topsis_from_normalized(norm_df: pd.DataFrame, weights_by_name: dict, crit_me
     }
 
 
+def topsis_sandbox_incremental(
+    baseline_run_id: str,
+    norm_df: pd.DataFrame,
+    weights_raw_by_name: dict,
+    crit_meta_list: list[dict],
+    distance: str = "euclidean",
+    distance_p: float | None = None,
+) -> dict:
+    """
+    Same output as topsis_from_normalized, but keeps an IncrementalTopsis per
+    baseline run in session state so a slider move only recomputes one column.
+    Chebyshev has no incremental form and is scored in full each time.
+    """
+    if norm_df is None or norm_df.empty:
+        return {}
+
+    crits = list(norm_df.columns)
+    w_raw = np.array([float(weights_raw_by_name.get(c, 0.0)) for c in crits], dtype=float)
+    if w_raw.sum() <= 0 or np.isinf(distance_order(distance, distance_p)):
+        return topsis_from_normalized(norm_df, weights_raw_by_name, crit_meta_list, distance, distance_p)
+
+    state_key = f"sb_incremental_topsis_{baseline_run_id}"
+    cached = st.session_state.get(state_key)
+    if (
+        cached is None
+        or cached["crits"] != crits
+        or cached["alts"] != list(norm_df.index)
+        or cached["distance"] != (distance, distance_p)
+    ):
+        meta_by_name = {c["name"]: c for c in crit_meta_list}
+        directions = [meta_by_name.get(c, {}).get("direction", "benefit") for c in crits]
+        inc = IncrementalTopsis.from_normalized(
+            norm_df.astype(float).values,
+            w_raw,
+            directions,
+            distance=distance,
+            distance_p=distance_p,
+            normalize_weights=True,
+        )
+        cached = {"crits": crits, "alts": list(norm_df.index), "distance": (distance, distance_p), "inc": inc}
+        st.session_state[state_key] = cached
+    else:
+        inc = cached["inc"]
+        inc.set_weights(w_raw)
+
+    s_pos, s_neg, c_star = inc.s_pos, inc.s_neg, inc.c_star
+    ranking_df = (
+        pd.DataFrame({"alternative_name": list(norm_df.index), "score": c_star})
+        .sort_values("score", ascending=False)
+        .reset_index(drop=True)
+    )
+    ranking_df["rank"] = np.arange(1, len(ranking_df) + 1)
+
+    dist_df = pd.DataFrame(
+        {
+            "alternative": list(norm_df.index),
+            "s_pos": s_pos,
+            "s_neg": s_neg,
+            "c_star": c_star,
+        }
+    )
+
+    return {
+        "ranking_df": ranking_df,
+        "dist_df": dist_df,
+        "weighted_df": pd.DataFrame(inc.weighted_matrix, index=norm_df.index, columns=crits),
+        "weights_series": pd.Series(inc.weights, index=crits),
+    }
+
+
 # -----------------------------------------------------------------------------
 # VFT helpers
 # -----------------------------------------------------------------------------
+@cached_loader(scenario="sid", preference_set="preference_set_id")
 def load_vft_model_inputs(sid: str, preference_set_id: str) -> dict:
-    weights_by_name = pref_repo.load_weights_by_criterion_name(preference_set_id)
+    weights_by_name = load_weights(preference_set_id)
 
     with engine.begin() as conn:
         crit_rows = conn.execute(
@@ -420,6 +552,9 @@ def load_vft_model_inputs(sid: str, preference_set_id: str) -> dict:
                 SELECT
                     c.name AS criterion_name,
                     vf.function_type,
+                    vf.rho,
+                    vf.midpoint,
+                    vf.steepness,
                     vfp.point_order,
                     vfp.x,
                     vfp.y
@@ -446,10 +581,13 @@ def load_vft_model_inputs(sid: str, preference_set_id: str) -> dict:
         raw_matrix.loc[r["alternative_name"], r["criterion_name"]] = float(r["measurement_value"])
 
     vf_map: dict[str, list[tuple[float, float]]] = {}
+    vf_shapes: dict[str, dict] = {}  # exponential / s_curve parameters
     for r in vf_rows:
         cname = r["criterion_name"]
         if cname not in vf_map:
             vf_map[cname] = []
+            if r["function_type"] in ("exponential", "s_curve"):
+                vf_shapes[cname] = {k: r[k] for k in ("function_type", "rho", "midpoint", "steepness")}
         if r["x"] is not None and r["y"] is not None:
             vf_map[cname].append((float(r["x"]), float(r["y"])))
 
@@ -478,11 +616,27 @@ def load_vft_model_inputs(sid: str, preference_set_id: str) -> dict:
         else:
             scaling_direction = "Custom"
 
+        # Parametric curves are scored exactly; their stored points are samples
+        shape = vf_shapes.get(cname)
+        if shape and len(points) >= 2:
+            value_fn = compile_value_function(
+                SCALING_TYPES[shape["function_type"]],
+                float(points[0][0]),
+                float(points[-1][0]),
+                "Increasing" if points[-1][1] >= points[0][1] else "Decreasing",
+                rho=shape["rho"],
+                midpoint=shape["midpoint"],
+                steepness=shape["steepness"],
+            )
+        else:
+            value_fn = piecewise_from_points(points)
+
         attributes.append(
             {
                 "name": cname,
                 "weight": float(weights_by_name.get(cname, 0.0)),
                 "points": points,
+                "value_fn": value_fn,
                 "min_val": float(points[0][0]),
                 "max_val": float(points[-1][0]),
                 "unit": "",
@@ -490,20 +644,24 @@ def load_vft_model_inputs(sid: str, preference_set_id: str) -> dict:
             }
         )
 
+    raw = raw_matrix.loc[alt_names, [a["name"] for a in attributes]].to_numpy(dtype=float)
+    utility = (
+        np.column_stack([a["value_fn"](raw[:, j]) for j, a in enumerate(attributes)])
+        if attributes
+        else np.zeros((len(alt_names), 0))
+    )
+    utility.setflags(write=False)
+
     return {
         "attributes": attributes,
         "alternatives": alt_names,
         "raw_matrix": raw_matrix,
+        "utility": utility,  # (alternatives, attributes), aligned with the lists above
     }
 
 
-def interp_value_from_points(raw_value: float, points: list[tuple[float, float]]) -> float:
-    if not points:
-        return 0.0
-    pts = sorted(points, key=lambda x: x[0])
-    xs = [p[0] for p in pts]
-    ys = [p[1] for p in pts]
-    return float(np.interp(raw_value, xs, ys))
+def interp_value_from_points(raw_value, points: list[tuple[float, float]]):
+    return piecewise_from_points(points)(raw_value)
 
 
 def compute_vft_base_scores(model_data: dict) -> tuple[dict, dict]:
@@ -514,15 +672,17 @@ def compute_vft_base_scores(model_data: dict) -> tuple[dict, dict]:
     alt_value_scores: dict[str, dict[str, float]] = {}
     base_total_scores: dict[str, float] = {}
 
-    for alt in alt_names:
-        alt_value_scores[alt] = {}
-        total = 0.0
-        for attr in attributes:
-            raw = float(raw_matrix.loc[alt, attr["name"]])
-            val = interp_value_from_points(raw, attr["points"])
-            alt_value_scores[alt][attr["name"]] = val
-            total += val * float(attr["weight"])
-        base_total_scores[alt] = total
+    values = model_data.get("utility")
+    if values is None:
+        raw = raw_matrix.loc[alt_names, [attr["name"] for attr in attributes]].to_numpy(dtype=float)
+        values = np.column_stack(
+            [attr["value_fn"](raw[:, j]) for j, attr in enumerate(attributes)]
+        ) if attributes else np.zeros((len(alt_names), 0))
+    totals = values @ np.array([float(attr["weight"]) for attr in attributes], dtype=float)
+
+    for i, alt in enumerate(alt_names):
+        alt_value_scores[alt] = {attr["name"]: float(values[i, j]) for j, attr in enumerate(attributes)}
+        base_total_scores[alt] = float(totals[i])
 
     return alt_value_scores, base_total_scores
 
@@ -530,56 +690,6 @@ def compute_vft_base_scores(model_data: dict) -> tuple[dict, dict]:
 # -----------------------------------------------------------------------------
 # Cross scenario validation helpers
 # -----------------------------------------------------------------------------
-def get_scenario_signature(sid: str) -> dict:
-    with engine.begin() as conn:
-        alt_rows = conn.execute(
-            text(
-                """
-                SELECT name
-                FROM alternatives
-                WHERE scenario_id = :sid
-                ORDER BY name
-                """
-            ),
-            {"sid": sid},
-        ).mappings().all()
-
-        crit_rows = conn.execute(
-            text(
-                """
-                SELECT name, direction, scale_type
-                FROM criteria
-                WHERE scenario_id = :sid
-                ORDER BY name
-                """
-            ),
-            {"sid": sid},
-        ).mappings().all()
-
-    meas_rows = load_measurements_long(sid)
-
-    alternatives = tuple(r["name"] for r in alt_rows)
-    criteria = tuple((r["name"], r["direction"], r.get("scale_type")) for r in crit_rows)
-
-    measurements = []
-    for r in meas_rows:
-        val = r["measurement_value"]
-        if val is None:
-            val_norm = None
-        else:
-            try:
-                val_norm = round(float(val), 10)
-            except Exception:
-                val_norm = str(val)
-        measurements.append((r["alternative_name"], r["criterion_name"], val_norm))
-
-    return {
-        "alternatives": alternatives,
-        "criteria": criteria,
-        "measurements": tuple(measurements),
-    }
-
-
 def validate_scenarios_comparable(
     scenario_ids: list[str],
     scenario_label_map: dict[str, str],
@@ -592,33 +702,29 @@ def validate_scenarios_comparable(
     if len(uniq_sids) <= 1:
         return True, ""
 
-    base_sid = uniq_sids[0]
-    base_sig = get_scenario_signature(base_sid)
+    # Stored fingerprints are maintained on every write, so this is one
+    # indexed lookup and a string comparison per scenario.
+    fingerprints = scenario_repo.get_content_fingerprints(uniq_sids)
+    messages = {
+        "alternatives": "Alternatives differ between '{a}' and '{b}'.",
+        "criteria": "Criteria metadata differs between '{a}' and '{b}'.",
+        "measurements": (
+            "Input measurement data differs between '{a}' and '{b}'. Cross-scenario comparison requires "
+            "identical alternatives, criteria, and measurements."
+        ),
+    }
 
+    base_sid = uniq_sids[0]
+    base_fp = fingerprints.get(base_sid) or ""
     for sid in uniq_sids[1:]:
-        other_sig = get_scenario_signature(sid)
-
-        if base_sig["alternatives"] != other_sig["alternatives"]:
-            return (
-                False,
-                f"Alternatives differ between '{scenario_label_map.get(base_sid, base_sid)}' "
-                f"and '{scenario_label_map.get(sid, sid)}'.",
-            )
-
-        if base_sig["criteria"] != other_sig["criteria"]:
-            return (
-                False,
-                f"Criteria metadata differs between '{scenario_label_map.get(base_sid, base_sid)}' "
-                f"and '{scenario_label_map.get(sid, sid)}'.",
-            )
-
-        if base_sig["measurements"] != other_sig["measurements"]:
-            return (
-                False,
-                f"Input measurement data differs between '{scenario_label_map.get(base_sid, base_sid)}' "
-                f"and '{scenario_label_map.get(sid, sid)}'. Cross-scenario comparison requires identical "
-                f"alternatives, criteria, and measurements.",
-            )
+        other_fp = fingerprints.get(sid) or ""
+        if other_fp == base_fp:
+            continue
+        labels = {"a": scenario_label_map.get(base_sid, base_sid), "b": scenario_label_map.get(sid, sid)}
+        for part, base_part, other_part in zip(FINGERPRINT_PARTS, base_fp.split(":"), other_fp.split(":")):
+            if base_part != other_part:
+                return False, messages[part].format(**labels)
+        return False, messages["measurements"].format(**labels)
 
     return True, ""
 
@@ -627,69 +733,56 @@ def validate_scenarios_comparable(
 # Comparison section helpers
 # -----------------------------------------------------------------------------
 def build_comparison_payload(selection_rows: list[dict], run_method: str) -> dict:
-    rows = []
-    dist_rows = []
-    weighted_rows = []
+    # A handful of bulk queries cover every selection: latest runs, scores,
+    # distances and weighted values.
+    latest = comparison_repo.latest_runs(
+        [(sel["scenario_id"], sel["preference_set_id"]) for sel in selection_rows], run_method
+    )
+
     missing = []
     selection_order = []
-
+    picked = []
     for sel in selection_rows:
-        sid = sel["scenario_id"]
-        pid = sel["preference_set_id"]
-        comparison_label = sel["comparison_label"]
-
-        runs_pref = load_runs_for_pref(sid, pid, run_method)
-        if not runs_pref:
-            missing.append(comparison_label)
+        run_id = latest.get((sel["scenario_id"], sel["preference_set_id"]))
+        if not run_id:
+            missing.append(sel["comparison_label"])
             continue
+        selection_order.append(sel["comparison_label"])
+        picked.append(
+            {
+                "run_id": run_id,
+                "comparison_label": sel["comparison_label"],
+                "scenario_id": sel["scenario_id"],
+                "preference_set_id": sel["preference_set_id"],
+            }
+        )
 
-        run_id = runs_pref[0]["run_id"]
-        selection_order.append(comparison_label)
-
-        sc_df = get_scores(run_id)
-        if not sc_df.empty:
-            sc_df = sc_df.copy()
-            if "alternative" in sc_df.columns and "alternative_name" not in sc_df.columns:
-                sc_df = sc_df.rename(columns={"alternative": "alternative_name"})
-            sc_df["comparison_label"] = comparison_label
-            sc_df["scenario_id"] = sid
-            sc_df["preference_set_id"] = pid
-            rows.append(
-                sc_df[
-                    ["alternative_name", "score", "rank", "comparison_label", "scenario_id", "preference_set_id"]
-                ]
-            )
+    long_df = pd.DataFrame()
+    dist_df = pd.DataFrame()
+    weighted_long_df = pd.DataFrame()
+    if picked:
+        meta = pd.DataFrame(picked)
+        run_ids = list(dict.fromkeys(meta["run_id"]))
+
+        scores = comparison_repo.load_scores(run_ids)
+        if not scores.empty:
+            long_df = meta.merge(scores, on="run_id")[
+                ["alternative_name", "score", "rank", "comparison_label", "scenario_id", "preference_set_id"]
+            ]
 
         if run_method == "topsis":
-            ddf = get_distances(run_id)
-            if not ddf.empty:
-                ddf = ddf.copy()
-                ddf["comparison_label"] = comparison_label
-                dist_rows.append(ddf)
-
-            w_df = get_weighted_matrix(run_id)
-            if w_df is not None and not w_df.empty:
-                for alt in w_df.index:
-                    for crit in w_df.columns:
-                        weighted_rows.append(
-                            {
-                                "Alternative": alt,
-                                "Criterion": crit,
-                                "Weighted Value": float(w_df.loc[alt, crit]),
-                                "comparison_label": comparison_label,
-                            }
-                        )
-
-        elif run_method == "vft":
-            vft_w_df = get_vft_weighted_long(run_id)
-            if not vft_w_df.empty:
-                vft_w_df = vft_w_df.copy()
-                vft_w_df["comparison_label"] = comparison_label
-                weighted_rows.extend(vft_w_df.to_dict(orient="records"))
+            dists = comparison_repo.load_distances(run_ids)
+            if not dists.empty:
+                dist_df = meta[["run_id", "comparison_label"]].merge(dists, on="run_id")[
+                    ["alternative", "s_pos", "s_neg", "c_star", "comparison_label"]
+                ]
 
-    long_df = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame()
-    dist_df = pd.concat(dist_rows, ignore_index=True) if dist_rows else pd.DataFrame()
-    weighted_long_df = pd.DataFrame(weighted_rows) if weighted_rows else pd.DataFrame()
+        if run_method in ("topsis", "vft"):
+            weighted = comparison_repo.load_weighted_long(run_ids, run_method)
+            if not weighted.empty:
+                weighted_long_df = meta[["run_id", "comparison_label"]].merge(weighted, on="run_id")[
+                    ["Alternative", "Criterion", "Weighted Value", "comparison_label"]
+                ]
 
     return {
         "long_df": long_df,
@@ -1030,6 +1123,7 @@ def render_save_sandbox_weights(
                                 {"pid": new_pid, "cid": cid, "w": float(wval)},
                             )
 
+                invalidate_scenario(current_scenario_id)
                 st.success(f"Saved preference set '{sb_name}'.")
             except Exception as e:
                 st.error(f"Save failed: {e}")
@@ -1043,10 +1137,21 @@ def render_topsis_sandbox(
     weights_base: dict,
     weights_sandbox: dict,
     current_user_name: str,
+    weights_sandbox_raw: dict | None = None,
 ):
     norm_df_base = get_norm_matrix(baseline_run_id)
-    base_calc = topsis_from_normalized(norm_df_base, weights_base, crit_meta_list)
-    sandbox_calc = topsis_from_normalized(norm_df_base, weights_sandbox, crit_meta_list)
+    # Rescore with the distance the baseline run was saved with.
+    distance, distance_p = load_run_distance(baseline_run_id)
+    base_calc = topsis_from_normalized(norm_df_base, weights_base, crit_meta_list, distance, distance_p)
+    # Raw slider values change one criterion at a time; the normalized vector changes everywhere.
+    sandbox_calc = topsis_sandbox_incremental(
+        baseline_run_id,
+        norm_df_base,
+        weights_sandbox_raw or weights_sandbox,
+        crit_meta_list,
+        distance,
+        distance_p,
+    )
 
     if not base_calc or norm_df_base.empty:
         st.info("TOPSIS sandbox could not be generated.")
@@ -1149,9 +1254,12 @@ def render_topsis_sandbox(
     base_alt_order = rb.sort_values("rank_base")["alternative_name"].tolist() if not rb.empty else list(norm_df_base.index)
     render_topsis_sandbox_advanced(
         norm_df_base=norm_df_base,
+        baseline_run_id=baseline_run_id,
         crit_meta_list=crit_meta_list,
         weights_base=weights_base,
         alt_order_default=base_alt_order,
+        distance=distance,
+        distance_p=distance_p,
     )
 
     render_save_sandbox_weights(
@@ -1162,11 +1270,222 @@ def render_topsis_sandbox(
     )
 
 
+def render_stability_intervals(intervals: pd.DataFrame, selected: str, fig: go.Figure, target_label: str):
+    """Draw the sweep chart with the selected criterion's stable range shaded, then list every range."""
+    row = intervals[intervals["criterion"] == selected]
+    if not row.empty:
+        fig.add_vrect(
+            x0=float(row["lower"].iloc[0]),
+            x1=float(row["upper"].iloc[0]),
+            fillcolor=NEUTRAL_LINE,
+            opacity=0.12,
+            line_width=0,
+            annotation_text="Stable range",
+            annotation_position="bottom left",
+        )
+    st.plotly_chart(fig, use_container_width=True)
+
+    def fmt_swap(pair):
+        return f"{pair[0]} / {pair[1]}" if pair else "-"
+
+    table = pd.DataFrame(
+        {
+            "Criterion": intervals["criterion"],
+            "Current Weight": intervals["base_weight"].round(4),
+            "Stable From": intervals["lower"].round(4),
+            "Stable To": intervals["upper"].round(4),
+            "Width": (intervals["upper"] - intervals["lower"]).round(4),
+            "Swap Below": intervals["lower_swap"].map(fmt_swap),
+            "Swap Above": intervals["upper_swap"].map(fmt_swap),
+        }
+    )
+    st.markdown(f"**Stability intervals ({target_label.lower()})**")
+    st.caption(
+        "Exact weight range per criterion, other weights rescaled proportionally, over which the "
+        "result does not change. Swap columns name the pair that trades places at each bound."
+    )
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+
+def render_weight_uncertainty(key_prefix: str, alt_names: list[str], base_weights: np.ndarray, simulate):
+    """
+    Monte Carlo controls and charts. simulate(distribution, n_samples, seed)
+    returns a MonteCarloResult; the last result is kept in session state so
+    reruns only redraw it.
+    """
+    st.subheader("Weight Uncertainty (Monte Carlo)")
+    st.caption(
+        "Sample many plausible weight vectors and count how often each alternative lands at each rank. "
+        "The same seed always reproduces the same result."
+    )
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        dist_label = st.selectbox("Weight distribution", WEIGHT_DISTRIBUTIONS, key=f"{key_prefix}_mc_dist")
+    with c2:
+        n_samples = int(
+            st.number_input("Samples", min_value=1000, max_value=500000, value=20000, step=1000, key=f"{key_prefix}_mc_n")
+        )
+    with c3:
+        seed = int(st.number_input("Seed", min_value=0, value=0, step=1, key=f"{key_prefix}_mc_seed"))
+
+    base = np.asarray(base_weights, dtype=float)
+    if base.sum() <= 0:
+        base = np.ones_like(base)
+    base = base / base.sum()
+
+    if dist_label == WEIGHT_DISTRIBUTIONS[0]:
+        concentration = float(
+            st.slider("Concentration (higher stays closer to current weights)", 2.0, 500.0, 50.0, key=f"{key_prefix}_mc_conc")
+        )
+        distribution = dirichlet_distribution(base, concentration)
+        dist_sig = ("dirichlet", concentration)
+    elif dist_label == WEIGHT_DISTRIBUTIONS[1]:
+        distribution = dirichlet_distribution(base)
+        dist_sig = ("uniform",)
+    else:
+        spread = float(st.slider("Interval half-width (% of each weight)", 5, 100, 25, key=f"{key_prefix}_mc_spread")) / 100.0
+        distribution = interval_distribution(base * (1.0 - spread), base * (1.0 + spread))
+        dist_sig = ("interval", spread)
+
+    sig = (tuple(alt_names), tuple(np.round(base, 10)), dist_sig, n_samples, seed)
+    state_key = f"{key_prefix}_mc_result"
+    if st.button("Run simulation", key=f"{key_prefix}_mc_run"):
+        with st.spinner(f"Scoring {n_samples:,} weight vectors..."):
+            st.session_state[state_key] = {"sig": sig, "result": simulate(distribution, n_samples, seed)}
+
+    cached = st.session_state.get(state_key)
+    if not cached or cached["sig"] != sig:
+        st.info("Run the simulation to see rank acceptability for the current settings.")
+        return
+    result = cached["result"]
+
+    df_acc = acceptability_frame(result, alt_names)
+    df_acc = df_acc[df_acc["acceptability"] > 0]
+    fig_acc = px.bar(
+        df_acc,
+        x="acceptability",
+        y="alternative",
+        color="rank",
+        orientation="h",
+        color_continuous_scale=BLUE_SCALE,
+        title="Rank Acceptability",
+        labels={"acceptability": "Share of Samples", "alternative": "Alternative", "rank": "Rank"},
+    )
+    fig_acc.update_layout(
+        xaxis_range=[0, 1.0],
+        height=max(320, 28 * len(alt_names)),
+        yaxis={"categoryorder": "array", "categoryarray": list(np.asarray(alt_names)[np.argsort(result.holistic)])},
+    )
+    st.plotly_chart(fig_acc, use_container_width=True)
+
+    summary = pd.DataFrame(
+        {
+            "Alternative": alt_names,
+            "First-Rank Acceptability": result.rank_acceptability[:, 0].round(4),
+            "Holistic Acceptability": result.holistic.round(4),
+            "Confidence Factor": result.confidence,
+        }
+    ).sort_values("Holistic Acceptability", ascending=False)
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+
+
+def render_weight_plane(key_prefix: str, alt_names: list[str], crit_names: list[str], base_weights: np.ndarray, compute):
+    """
+    Two-criterion weight-plane heatmap. compute(i, j, grid_points) returns a
+    WeightPlane for criteria i (x axis) and j (y axis).
+    """
+    st.subheader("Two-Criterion Weight Plane")
+    st.caption(
+        "Vary the weights of two criteria together, other weights sharing the remainder in proportion. "
+        "Each cell shows which alternative wins there; the blank corner is where the two weights exceed 1."
+    )
+    if len(crit_names) < 3:
+        st.info("The weight plane needs at least three criteria.")
+        return
+
+    c1, c2, c3, c4 = st.columns(4)
+    with c1:
+        x_name = st.selectbox("X-axis criterion", crit_names, index=0, key=f"{key_prefix}_plane_x")
+    with c2:
+        y_options = [c for c in crit_names if c != x_name]
+        y_name = st.selectbox("Y-axis criterion", y_options, index=0, key=f"{key_prefix}_plane_y")
+    with c3:
+        grid_points = int(
+            st.slider("Grid resolution", 21, 201, DEFAULT_GRID_POINTS, step=10, key=f"{key_prefix}_plane_res")
+        )
+    with c4:
+        color_by = st.radio("Colour by", ["Winner", "Margin"], horizontal=True, key=f"{key_prefix}_plane_color")
+
+    i, j = crit_names.index(x_name), crit_names.index(y_name)
+    plane = compute(i, j, grid_points)
+    m = len(alt_names)
+    names = np.asarray(alt_names, dtype=object)
+    winner_names = np.where(plane.feasible, names[np.clip(plane.winner, 0, None)], "")
+
+    if color_by == "Winner":
+        colors = color_map_from_labels(alt_names, ALT_PALETTE)
+        colorscale = []
+        for k, name in enumerate(alt_names):
+            colorscale += [[k / m, colors[name]], [(k + 1) / m, colors[name]]]
+        heat = go.Heatmap(
+            z=np.where(plane.feasible, plane.winner, np.nan),
+            zmin=-0.5,
+            zmax=m - 0.5,
+            colorscale=colorscale,
+            showscale=False,
+        )
+    else:
+        heat = go.Heatmap(z=plane.margin, colorscale=BLUE_SCALE, colorbar=dict(title="Margin"))
+    heat.update(
+        x=plane.grid,
+        y=plane.grid,
+        customdata=np.dstack([winner_names, np.round(plane.margin, 4)]),
+        hovertemplate=(
+            f"{x_name}: %{{x:.3f}}<br>{y_name}: %{{y:.3f}}<br>"
+            "Winner: %{customdata[0]}<br>Margin: %{customdata[1]}<extra></extra>"
+        ),
+    )
+    fig = go.Figure(heat)
+    base = np.asarray(base_weights, dtype=float)
+    base = base / base.sum() if base.sum() > 0 else np.ones_like(base) / len(base)
+    fig.add_trace(
+        go.Scatter(
+            x=[base[i]],
+            y=[base[j]],
+            mode="markers",
+            marker=dict(size=12, color="#FFFFFF", line=dict(color=NEUTRAL_LINE, width=2)),
+            name="Current Weights",
+        )
+    )
+    fig.update_layout(
+        title=f"Winning Alternative over {x_name} / {y_name} Weights",
+        xaxis_title=f"Weight of {x_name}",
+        yaxis_title=f"Weight of {y_name}",
+        xaxis_range=[0, 1],
+        yaxis_range=[0, 1],
+        height=520,
+        showlegend=False,
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    share = plane.win_share(m)
+    table = pd.DataFrame({"Alternative": alt_names, "Share of Plane Won": share.round(4)})
+    st.dataframe(
+        table[table["Share of Plane Won"] > 0].sort_values("Share of Plane Won", ascending=False),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+
 def render_topsis_sandbox_advanced(
     norm_df_base: pd.DataFrame,
     crit_meta_list: list[dict],
     weights_base: dict,
     alt_order_default: list[str] | None = None,
+    baseline_run_id: str | None = None,
+    distance: str = "euclidean",
+    distance_p: float | None = None,
 ):
     if norm_df_base is None or norm_df_base.empty:
         return
@@ -1187,40 +1506,45 @@ def render_topsis_sandbox_advanced(
         crits,
         key="topsis_weight_sens_attr",
     )
+    stability_label = st.radio(
+        "Stability target",
+        list(STABILITY_TARGETS),
+        horizontal=True,
+        key="topsis_stability_target",
+    )
 
-    weight_range = np.linspace(0.0, 1.0, 50)
-    other_crits = [c for c in crits if c != weight_attr]
-    base_other_weights = {c: float(weights_base.get(c, 0.0)) for c in other_crits}
-    sum_other_weights = sum(base_other_weights.values())
-
-    plot_rows = []
-    for w in weight_range:
-        temp_weights = {c: 0.0 for c in crits}
-        temp_weights[weight_attr] = float(w)
-        remaining_weight = 1.0 - float(w)
-
-        if other_crits:
-            if sum_other_weights > 0:
-                for oc in other_crits:
-                    temp_weights[oc] = remaining_weight * base_other_weights[oc] / sum_other_weights
-            else:
-                equal_weight = remaining_weight / len(other_crits)
-                for oc in other_crits:
-                    temp_weights[oc] = equal_weight
-
-        temp_calc = topsis_from_normalized(norm_df_base, temp_weights, crit_meta_list)
-        rdf = temp_calc.get("ranking_df", pd.DataFrame())
-        for _, row in rdf.iterrows():
-            plot_rows.append(
-                {
-                    "Weight of Selected Criterion": w,
-                    "Alternative": row["alternative_name"],
-                    "Score": row["score"],
-                }
-            )
+    meta_by_name = {c["name"]: c for c in crit_meta_list}
+    benefit_mask = compile_directions([meta_by_name.get(c, {}).get("direction", "benefit") for c in crits])
+    base_w_vec = np.array([float(weights_base.get(c, 0.0)) for c in crits], dtype=float)
+    norm_values = norm_df_base.astype(float).values
+    base_scores = topsis_batch_from_normalized(
+        norm_values, base_w_vec[None, :], benefit_mask, distance=distance, distance_p=distance_p
+    ).c_star[0]
+    stored = stored_sensitivity(baseline_run_id, alt_names, crits, base_w_vec, base_scores)
+
+    if stored is not None:
+        weight_range = stored.grid
+        sweep_scores = stored.sweeps[crits.index(weight_attr)].astype(float)
+    else:
+        weight_range = np.linspace(0.0, 1.0, 50)
+        sweep_scores = topsis_weight_sweep(
+            norm_values,
+            benefit_mask,
+            base_w_vec,
+            crits.index(weight_attr),
+            weight_range,
+            distance=distance,
+            distance_p=distance_p,
+        )
 
-    if plot_rows:
-        df_w = pd.DataFrame(plot_rows)
+    if sweep_scores.size:
+        df_w = pd.DataFrame(
+            {
+                "Weight of Selected Criterion": np.repeat(weight_range, len(alt_names)),
+                "Alternative": np.tile(alt_names, len(weight_range)),
+                "Score": sweep_scores.ravel(),
+            }
+        )
         fig_w = px.line(
             df_w,
             x="Weight of Selected Criterion",
@@ -1240,8 +1564,21 @@ def render_topsis_sandbox_advanced(
             annotation_text="Current Weight",
             annotation_position="top right",
         )
+        if stored is not None:
+            intervals = stored.stability_frame(alt_names, crits, STABILITY_TARGETS[stability_label])
+        else:
+            intervals = topsis_stability_intervals(
+                norm_values,
+                benefit_mask,
+                base_w_vec,
+                alt_names,
+                crits,
+                mode=STABILITY_TARGETS[stability_label],
+                distance=distance,
+                distance_p=distance_p,
+            )
         fig_w.update_layout(yaxis_range=[-0.02, 1.02], xaxis_range=[-0.02, 1.02], height=440)
-        st.plotly_chart(fig_w, use_container_width=True)
+        render_stability_intervals(intervals, weight_attr, fig_w, stability_label)
 
     selected_alt_name_r = st.selectbox(
         "Alternative for robustness chart",
@@ -1250,50 +1587,16 @@ def render_topsis_sandbox_advanced(
         key="topsis_robust_sens_alt",
     )
 
-    base_calc = topsis_from_normalized(norm_df_base, weights_base, crit_meta_list)
-    base_score_df = base_calc.get("ranking_df", pd.DataFrame())
-    base_score_map = dict(zip(base_score_df.get("alternative_name", []), base_score_df.get("score", [])))
-    base_score = float(base_score_map.get(selected_alt_name_r, 0.0))
-
-    tornado_data = []
-    for crit in crits:
-        other_crits = [c for c in crits if c != crit]
-        base_other_weights = {c: float(weights_base.get(c, 0.0)) for c in other_crits}
-        sum_other_weights = sum(base_other_weights.values())
-
-        w0 = {c: 0.0 for c in crits}
-        w1 = {c: 0.0 for c in crits}
-        w1[crit] = 1.0
-
-        if other_crits:
-            if sum_other_weights > 0:
-                for oc in other_crits:
-                    w0[oc] = base_other_weights[oc] / sum_other_weights
-            else:
-                eq = 1.0 / len(other_crits)
-                for oc in other_crits:
-                    w0[oc] = eq
-
-        calc_w0 = topsis_from_normalized(norm_df_base, w0, crit_meta_list)
-        calc_w1 = topsis_from_normalized(norm_df_base, w1, crit_meta_list)
-        score_map_w0 = dict(zip(calc_w0["ranking_df"]["alternative_name"], calc_w0["ranking_df"]["score"]))
-        score_map_w1 = dict(zip(calc_w1["ranking_df"]["alternative_name"], calc_w1["ranking_df"]["score"]))
-        w0_score = float(score_map_w0.get(selected_alt_name_r, 0.0))
-        w1_score = float(score_map_w1.get(selected_alt_name_r, 0.0))
-
-        min_score = min(w0_score, w1_score)
-        max_score = max(w0_score, w1_score)
-        tornado_data.append(
-            {
-                "Criterion": crit,
-                "Base Score": base_score,
-                "Weight0 Score": w0_score,
-                "Weight1 Score": w1_score,
-                "Min Score": min_score,
-                "Max Score": max_score,
-                "Spread": max_score - min_score,
-            }
+    # One batched pass covers every alternative; the selectbox only filters.
+    if stored is not None:
+        tornado_all = stored.tornado_frame(alt_names, crits)
+    else:
+        tornado_all = topsis_tornado(
+            norm_values, benefit_mask, base_w_vec, alt_names, crits, distance=distance, distance_p=distance_p
         )
+    tornado_sel = tornado_all[tornado_all["alternative"] == selected_alt_name_r]
+    base_score = float(tornado_sel["base_score"].iloc[0]) if not tornado_sel.empty else 0.0
+    tornado_data = tornado_sel.drop(columns=["alternative"]).rename(columns=TORNADO_COLUMNS)
 
     df_t = pd.DataFrame(tornado_data)
     if not df_t.empty:
@@ -1350,6 +1653,38 @@ def render_topsis_sandbox_advanced(
         )
         st.plotly_chart(fig_t, use_container_width=True)
 
+    render_weight_plane(
+        "topsis_sb",
+        alt_names,
+        crits,
+        base_w_vec,
+        lambda i, j, grid_points: topsis_weight_plane(
+            norm_values,
+            benefit_mask,
+            base_w_vec,
+            i,
+            j,
+            grid_points=grid_points,
+            distance=distance,
+            distance_p=distance_p,
+        ),
+    )
+
+    render_weight_uncertainty(
+        "topsis_sb",
+        alt_names,
+        base_w_vec,
+        lambda dist, n_samples, seed: topsis_monte_carlo(
+            norm_values,
+            benefit_mask,
+            dist,
+            n_samples=n_samples,
+            seed=seed,
+            distance=distance,
+            distance_p=distance_p,
+        ),
+    )
+
 
 def render_vft_sandbox(
     current_scenario_id: str,
@@ -1374,6 +1709,7 @@ def render_vft_sandbox(
         "attributes": list(base_attr_map.values()),
         "alternatives": alt_names,
         "raw_matrix": raw_matrix,
+        "utility": model_data.get("utility"),
     }
 
     sandbox_attr_map = {a["name"]: dict(a) for a in attributes}
@@ -1383,6 +1719,7 @@ def render_vft_sandbox(
         "attributes": list(sandbox_attr_map.values()),
         "alternatives": alt_names,
         "raw_matrix": raw_matrix,
+        "utility": model_data.get("utility"),
     }
 
     base_value_scores, base_total_scores = compute_vft_base_scores(base_model_data)
@@ -1520,7 +1857,7 @@ def render_vft_sandbox(
             st.plotly_chart(fig_spider, use_container_width=True)
 
     render_vft_sandbox_advanced_inline(
-        attributes=attributes,
+        attributes=base_model_data["attributes"],
         alt_names=alt_names,
         raw_matrix=raw_matrix,
         alt_value_scores=base_value_scores,
@@ -1535,6 +1872,84 @@ def render_vft_sandbox(
     )
 
 
+def render_score_sweep(
+    selected_alt: str,
+    selected_attr: dict,
+    alt_names: list[str],
+    raw_matrix: pd.DataFrame,
+    alt_value_scores: dict,
+    base_total_scores: dict,
+    alt_color_map: dict,
+):
+    """Total score of one alternative as its raw value on one objective moves, with exact break-even values."""
+    name = selected_attr["name"]
+    weight = float(selected_attr["weight"])
+    points = selected_attr["points"]
+    rest_total = base_total_scores[selected_alt] - weight * alt_value_scores[selected_alt][name]
+    others = [a for a in alt_names if a != selected_alt]
+    other_totals = np.array([base_total_scores[a] for a in others], dtype=float)
+
+    break_even = vft_break_even(points, weight, rest_total, other_totals, others)
+    lo, hi = float(selected_attr["min_val"]), float(selected_attr["max_val"])
+    # Breakpoints and break-even values are added so the drawn curve and crossings are exact.
+    knots = np.concatenate([[x for x, _ in points], break_even["raw_value"].to_numpy(dtype=float)])
+    score_range = np.union1d(np.linspace(lo, hi, 50), knots[(knots >= lo) & (knots <= hi)])
+    totals = vft_score_sweep(points, score_range, weight, rest_total)
+
+    g = len(score_range)
+    df_s = pd.DataFrame(
+        {
+            "Raw Score": np.tile(score_range, len(alt_names)),
+            "Alternative": np.repeat([selected_alt] + others, g),
+            "Total Score": np.concatenate([totals, np.repeat(other_totals, g)]),
+        }
+    )
+    fig_s = px.line(
+        df_s,
+        x="Raw Score",
+        y="Total Score",
+        color="Alternative",
+        color_discrete_map=alt_color_map,
+        title=f"Score Sensitivity for {selected_alt} on {name}",
+        labels={"Raw Score": "Raw Score", "Total Score": "Overall Score"},
+    )
+    current_raw_score = float(raw_matrix.loc[selected_alt, name])
+    fig_s.add_vline(
+        x=current_raw_score,
+        line_dash="dash",
+        line_color=NEUTRAL_LINE,
+        annotation_text="Current Score",
+        annotation_position="top right",
+    )
+    if not break_even.empty:
+        fig_s.add_trace(
+            go.Scatter(
+                x=break_even["raw_value"],
+                y=break_even["total"],
+                mode="markers",
+                marker=dict(size=9, color="#FFFFFF", line=dict(color=NEUTRAL_LINE, width=2)),
+                name="Break-even",
+                customdata=break_even["competitor"],
+                hovertemplate="Ties %{customdata} at %{x:.4f}<extra></extra>",
+            )
+        )
+    fig_s.update_layout(yaxis_range=[-0.02, 1.05], height=440)
+    st.plotly_chart(fig_s, use_container_width=True)
+
+    if break_even.empty:
+        st.caption(f"{selected_alt} does not change places with any alternative over this range.")
+        return
+    table = pd.DataFrame(
+        {
+            "Competitor": break_even["competitor"],
+            "Break-even Raw Score": break_even["raw_value"].round(6),
+            "Change From Current": (break_even["raw_value"] - current_raw_score).round(6),
+            f"{selected_alt} Above It": np.where(break_even["ahead_above"], "Higher raw scores", "Lower raw scores"),
+        }
+    )
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+
 def render_vft_sandbox_advanced_inline(
     attributes: list[dict],
     alt_names: list[str],
@@ -1630,41 +2045,9 @@ def render_vft_sandbox_advanced_inline(
 
     selected_attr_s = next((a for a in attributes if a["name"] == selected_attr_name_s), None)
     if selected_attr_s:
-        score_range = np.linspace(float(selected_attr_s["min_val"]), float(selected_attr_s["max_val"]), 50)
-        other_alts = [a for a in alt_names if a != selected_alt_name_s]
-        plot_data_s = []
-        for score in score_range:
-            new_val = interp_value_from_points(score, selected_attr_s["points"])
-            new_total = 0.0
-            for attr in attributes:
-                if attr["name"] == selected_attr_s["name"]:
-                    new_total += new_val * float(attr["weight"])
-                else:
-                    new_total += alt_value_scores[selected_alt_name_s][attr["name"]] * float(attr["weight"])
-            plot_data_s.append({"Raw Score": score, "Alternative": selected_alt_name_s, "Total Score": new_total})
-            for other_alt in other_alts:
-                plot_data_s.append({"Raw Score": score, "Alternative": other_alt, "Total Score": base_total_scores[other_alt]})
-
-        df_s = pd.DataFrame(plot_data_s)
-        fig_s = px.line(
-            df_s,
-            x="Raw Score",
-            y="Total Score",
-            color="Alternative",
-            color_discrete_map=alt_color_map,
-            title=f"Score Sensitivity for {selected_alt_name_s} on {selected_attr_s['name']}",
-            labels={"Raw Score": "Raw Score", "Total Score": "Overall Score"},
-        )
-        current_raw_score = float(raw_matrix.loc[selected_alt_name_s, selected_attr_s["name"]])
-        fig_s.add_vline(
-            x=current_raw_score,
-            line_dash="dash",
-            line_color=NEUTRAL_LINE,
-            annotation_text="Current Score",
-            annotation_position="top right",
+        render_score_sweep(
+            selected_alt_name_s, selected_attr_s, alt_names, raw_matrix, alt_value_scores, base_total_scores, alt_color_map
         )
-        fig_s.update_layout(yaxis_range=[-0.02, 1.05], height=440)
-        st.plotly_chart(fig_s, use_container_width=True)
 
     st.markdown("**Robustness Analysis**")
     top_alt_name = ranked_alts[0][0] if ranked_alts else alt_names[0]
@@ -1675,37 +2058,17 @@ def render_vft_sandbox_advanced_inline(
         key="vft_robust_sens_alt_inline",
     )
 
-    tornado_data = []
+    attr_names_t = [a["name"] for a in attributes]
+    utility_t = np.array([[alt_value_scores[alt][name] for name in attr_names_t] for alt in alt_names], dtype=float)
+    tornado_all = vft_tornado(
+        utility_t, np.array([float(a["weight"]) for a in attributes], dtype=float), alt_names, attr_names_t
+    )
     base_score = base_total_scores[selected_alt_name_r]
-    for attr in attributes:
-        other_attrs = [a for a in attributes if a["name"] != attr["name"]]
-        base_other_weights = {a["name"]: float(a["weight"]) for a in other_attrs}
-        sum_other_weights = sum(base_other_weights.values())
-
-        w0_score = 0.0
-        if sum_other_weights > 0:
-            for other_attr in other_attrs:
-                proportional_weight = base_other_weights[other_attr["name"]] / sum_other_weights
-                w0_score += alt_value_scores[selected_alt_name_r][other_attr["name"]] * proportional_weight
-        elif other_attrs:
-            equal_weight = 1.0 / len(other_attrs)
-            for other_attr in other_attrs:
-                w0_score += alt_value_scores[selected_alt_name_r][other_attr["name"]] * equal_weight
-
-        w1_score = alt_value_scores[selected_alt_name_r][attr["name"]] * 1.0
-        min_score = min(w0_score, w1_score)
-        max_score = max(w0_score, w1_score)
-        tornado_data.append(
-            {
-                "Objective": attr["name"],
-                "Base Score": base_score,
-                "Weight0 Score": w0_score,
-                "Weight1 Score": w1_score,
-                "Min Score": min_score,
-                "Max Score": max_score,
-                "Spread": max_score - min_score,
-            }
-        )
+    tornado_data = (
+        tornado_all[tornado_all["alternative"] == selected_alt_name_r]
+        .drop(columns=["alternative"])
+        .rename(columns={**TORNADO_COLUMNS, "criterion": "Objective"})
+    )
 
     df_t = pd.DataFrame(tornado_data)
     if not df_t.empty:
@@ -1777,22 +2140,10 @@ def render_common_sandbox_section(
         st.info(f"No {current_method_choice.upper()} runs found for this preference set. Run the model first.")
         return
 
-    with engine.begin() as conn:
-        crit_meta = conn.execute(
-            text(
-                """
-                SELECT name, direction, scale_type
-                FROM criteria
-                WHERE scenario_id = :sid
-                ORDER BY created_at
-                """
-            ),
-            {"sid": current_scenario_id},
-        ).mappings().all()
-    crit_meta_list = [dict(r) for r in crit_meta]
+    crit_meta_list = load_criteria_meta(current_scenario_id)
 
     crits = [c["name"] for c in crit_meta_list]
-    weights_base = pref_repo.load_weights_by_criterion_name(picked_pref_sb)
+    weights_base = load_weights(picked_pref_sb)
 
     base_w_vec = np.array([float(weights_base.get(c, 0.0)) for c in crits], dtype=float)
     if base_w_vec.sum() > 0:
@@ -1837,6 +2188,7 @@ def render_common_sandbox_section(
             weights_base=weights_base,
             weights_sandbox=weights_sandbox,
             current_user_name=current_user_name,
+            weights_sandbox_raw=sandbox_weights_raw,
         )
     else:
         render_vft_sandbox(
@@ -1894,52 +2246,47 @@ def render_vft_advanced_sensitivity(
     ranked_alts = sorted(base_total_scores.items(), key=lambda item: item[1], reverse=True)
     alt_color_map = color_map_from_labels(alt_names, ALT_PALETTE)
 
+    attr_names = [a["name"] for a in attributes]
+    utility_t = np.array([[alt_value_scores[alt][name] for name in attr_names] for alt in alt_names], dtype=float)
+    base_w_vec = np.array([float(a["weight"]) for a in attributes], dtype=float)
+    vft_runs = load_runs_for_pref(current_scenario_id, selected_vft_pref, "vft")
+    stored = stored_sensitivity(
+        vft_runs[0]["run_id"] if vft_runs else None, alt_names, attr_names, base_w_vec, utility_t @ base_w_vec
+    )
+
     # 1. Weight sensitivity
     st.subheader("Weight Sensitivity")
     st.caption("See how changing the weight of one objective affects total scores for all alternatives.")
 
-    attr_names = [a["name"] for a in attributes]
     selected_attr_name_w = st.selectbox(
         "Select objective to vary",
         attr_names,
         key="vft_weight_sens_attr",
     )
+    stability_label = st.radio(
+        "Stability target",
+        list(STABILITY_TARGETS),
+        horizontal=True,
+        key="vft_stability_target",
+    )
     selected_attr_w = next((a for a in attributes if a["name"] == selected_attr_name_w), None)
 
     if selected_attr_w:
-        weight_range = np.linspace(0.0, 1.0, 50)
-        other_attrs = [a for a in attributes if a["name"] != selected_attr_w["name"]]
-        base_other_weights = {a["name"]: float(a["weight"]) for a in other_attrs}
-        sum_other_weights = sum(base_other_weights.values())
-
-        plot_data_w = []
-        for w in weight_range:
-            for alt in alt_names:
-                total_score = alt_value_scores[alt][selected_attr_w["name"]] * w
-
-                if sum_other_weights > 0:
-                    remaining_weight = 1.0 - w
-                    for other_attr in other_attrs:
-                        proportional_weight = (
-                            base_other_weights[other_attr["name"]] / sum_other_weights * remaining_weight
-                        )
-                        total_score += alt_value_scores[alt][other_attr["name"]] * proportional_weight
-                else:
-                    if other_attrs:
-                        remaining_weight = 1.0 - w
-                        equal_weight = remaining_weight / len(other_attrs)
-                        for other_attr in other_attrs:
-                            total_score += alt_value_scores[alt][other_attr["name"]] * equal_weight
-
-                plot_data_w.append(
-                    {
-                        "Weight of Selected Objective": w,
-                        "Alternative": alt,
-                        "Total Score": total_score,
-                    }
-                )
+        j_w = attr_names.index(selected_attr_w["name"])
+        if stored is not None:
+            weight_range = stored.grid
+            sweep_scores = stored.sweeps[j_w].astype(float)
+        else:
+            weight_range = np.linspace(0.0, 1.0, 50)
+            sweep_scores = vft_weight_sweep(utility_t, base_w_vec, j_w, weight_range)
 
-        df_w = pd.DataFrame(plot_data_w)
+        df_w = pd.DataFrame(
+            {
+                "Weight of Selected Objective": np.repeat(weight_range, len(alt_names)),
+                "Alternative": np.tile(alt_names, len(weight_range)),
+                "Total Score": sweep_scores.ravel(),
+            }
+        )
         fig_w = px.line(
             df_w,
             x="Weight of Selected Objective",
@@ -1959,8 +2306,14 @@ def render_vft_advanced_sensitivity(
             annotation_text="Current Weight",
             annotation_position="top right",
         )
+        if stored is not None:
+            intervals = stored.stability_frame(alt_names, attr_names, STABILITY_TARGETS[stability_label])
+        else:
+            intervals = vft_stability_intervals(
+                utility_t, base_w_vec, alt_names, attr_names, mode=STABILITY_TARGETS[stability_label]
+            )
         fig_w.update_layout(yaxis_range=[-0.02, 1.05], xaxis_range=[-0.02, 1.02], height=440)
-        st.plotly_chart(fig_w, use_container_width=True)
+        render_stability_intervals(intervals, selected_attr_w["name"], fig_w, stability_label)
 
     # 2. Objective score sensitivity
     st.subheader("Objective Score Sensitivity")
@@ -1983,61 +2336,9 @@ def render_vft_advanced_sensitivity(
     selected_attr_s = next((a for a in attributes if a["name"] == selected_attr_name_s), None)
 
     if selected_attr_s:
-        score_range = np.linspace(float(selected_attr_s["min_val"]), float(selected_attr_s["max_val"]), 50)
-        other_alts = [a for a in alt_names if a != selected_alt_name_s]
-
-        plot_data_s = []
-        for score in score_range:
-            new_val = interp_value_from_points(score, selected_attr_s["points"])
-
-            new_total = 0.0
-            for attr in attributes:
-                if attr["name"] == selected_attr_s["name"]:
-                    new_total += new_val * float(attr["weight"])
-                else:
-                    new_total += alt_value_scores[selected_alt_name_s][attr["name"]] * float(attr["weight"])
-
-            plot_data_s.append(
-                {
-                    "Raw Score": score,
-                    "Alternative": selected_alt_name_s,
-                    "Total Score": new_total,
-                }
-            )
-
-            for other_alt in other_alts:
-                plot_data_s.append(
-                    {
-                        "Raw Score": score,
-                        "Alternative": other_alt,
-                        "Total Score": base_total_scores[other_alt],
-                    }
-                )
-
-        df_s = pd.DataFrame(plot_data_s)
-        fig_s = px.line(
-            df_s,
-            x="Raw Score",
-            y="Total Score",
-            color="Alternative",
-            color_discrete_map=alt_color_map,
-            title=f"Score Sensitivity for {selected_alt_name_s} on {selected_attr_s['name']}",
-            labels={
-                "Raw Score": "Raw Score",
-                "Total Score": "Overall Score",
-            },
-        )
-
-        current_raw_score = float(raw_matrix.loc[selected_alt_name_s, selected_attr_s["name"]])
-        fig_s.add_vline(
-            x=current_raw_score,
-            line_dash="dash",
-            line_color=NEUTRAL_LINE,
-            annotation_text="Current Score",
-            annotation_position="top right",
+        render_score_sweep(
+            selected_alt_name_s, selected_attr_s, alt_names, raw_matrix, alt_value_scores, base_total_scores, alt_color_map
         )
-        fig_s.update_layout(yaxis_range=[-0.02, 1.05], height=440)
-        st.plotly_chart(fig_s, use_container_width=True)
 
     # 3. Robustness analysis
     st.subheader("Robustness Analysis")
@@ -2051,42 +2352,16 @@ def render_vft_advanced_sensitivity(
         key="vft_robust_sens_alt",
     )
 
-    tornado_data = []
+    if stored is not None:
+        tornado_all = stored.tornado_frame(alt_names, attr_names)
+    else:
+        tornado_all = vft_tornado(utility_t, base_w_vec, alt_names, attr_names)
     base_score = base_total_scores[selected_alt_name_r]
-
-    for attr in attributes:
-        other_attrs = [a for a in attributes if a["name"] != attr["name"]]
-        base_other_weights = {a["name"]: float(a["weight"]) for a in other_attrs}
-        sum_other_weights = sum(base_other_weights.values())
-
-        w0_score = 0.0
-        if sum_other_weights > 0:
-            for other_attr in other_attrs:
-                proportional_weight = base_other_weights[other_attr["name"]] / sum_other_weights
-                w0_score += alt_value_scores[selected_alt_name_r][other_attr["name"]] * proportional_weight
-        else:
-            if other_attrs:
-                equal_weight = 1.0 / len(other_attrs)
-                for other_attr in other_attrs:
-                    w0_score += alt_value_scores[selected_alt_name_r][other_attr["name"]] * equal_weight
-
-        w1_score = alt_value_scores[selected_alt_name_r][attr["name"]] * 1.0
-
-        min_score = min(w0_score, w1_score)
-        max_score = max(w0_score, w1_score)
-        spread = max_score - min_score
-
-        tornado_data.append(
-            {
-                "Objective": attr["name"],
-                "Base Score": base_score,
-                "Weight0 Score": w0_score,
-                "Weight1 Score": w1_score,
-                "Min Score": min_score,
-                "Max Score": max_score,
-                "Spread": spread,
-            }
-        )
+    tornado_data = (
+        tornado_all[tornado_all["alternative"] == selected_alt_name_r]
+        .drop(columns=["alternative"])
+        .rename(columns={**TORNADO_COLUMNS, "criterion": "Objective"})
+    )
 
     df_t = pd.DataFrame(tornado_data)
     if not df_t.empty:
@@ -2149,6 +2424,23 @@ def render_vft_advanced_sensitivity(
         )
         st.plotly_chart(fig_t, use_container_width=True)
 
+    # 4. Two-criterion weight plane
+    render_weight_plane(
+        "vft_adv",
+        alt_names,
+        attr_names,
+        base_w_vec,
+        lambda i, j, grid_points: vft_weight_plane(utility_t, base_w_vec, i, j, grid_points=grid_points),
+    )
+
+    # 5. Weight uncertainty
+    render_weight_uncertainty(
+        "vft_adv",
+        alt_names,
+        base_w_vec,
+        lambda dist, n_samples, seed: vft_monte_carlo(utility_t, dist, n_samples=n_samples, seed=seed),
+    )
+
 
 # -----------------------------------------------------------------------------
 # Load base preference data
@@ -15,12 +15,15 @@ from sqlalchemy import text
 
 from app.app_context import guard_page, sync_method_from_scenario
 from app.sidebar_nav import render_sidebar
-from core.topsis import compute_topsis
+from core.topsis import topsis_batch_from_normalized
+from core.weight_plane import WeightPlane, topsis_weight_plane, vft_weight_plane
 from persistence.engine import get_engine
+from persistence.repositories.comparison_repo import ComparisonRepo
 from persistence.repositories.measurement_repo import MeasurementRepo
 from persistence.repositories.preference_repo import PreferenceRepo
 from persistence.repositories.result_repo import ResultRepo
 from persistence.repositories.topsis_read_repo import TopsisReadRepo
+from persistence.repositories.topsis_repo import TopsisRepo
 from services.vft_service import VFTService
 
 st.set_page_config(page_title="MCDA — Report Builder", layout="wide")
@@ -37,6 +40,8 @@ meas_repo = MeasurementRepo(engine)
 pref_repo = PreferenceRepo(engine)
 result_repo = ResultRepo(engine)
 topsis_read = TopsisReadRepo(engine)
+topsis_repo = TopsisRepo(engine)
+comparison_repo = ComparisonRepo(engine)
 vft_svc = VFTService(engine)
 
 scenario_id = st.session_state.get("scenario_id")
@@ -177,24 +182,6 @@ def get_vft_tables(run_id: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
     return util_df, weighted_df
 
 
-def load_topsis_weighted_long(run_id: str) -> pd.DataFrame:
-    with engine.begin() as conn:
-        rows = conn.execute(
-            text(
-                """
-                SELECT a.name AS alternative_name, c.name AS criterion_name, v.value AS weighted_value
-                FROM topsis_weighted_values v
-                JOIN alternatives a ON a.alternative_id = v.alternative_id
-                JOIN criteria c ON c.criterion_id = v.criterion_id
-                WHERE v.run_id = :rid
-                ORDER BY a.name, c.name
-                """
-            ),
-            {"rid": run_id},
-        ).mappings().all()
-    return pd.DataFrame([dict(r) for r in rows])
-
-
 def lighten_color(color, amount: float = 0.0):
     try:
         c = np.array(mcolors.to_rgb(color))
@@ -297,6 +284,14 @@ def sandbox_weight_controls(section_key: str, crits: List[str], base_weights_map
     return {crits[i]: float(w[i]) for i in range(len(crits))}
 
 
+def run_distance(run_id: str) -> Tuple[str, float | None]:
+    """(distance, distance_p) the TOPSIS run was saved with; Euclidean when no config is stored."""
+    cfg = topsis_repo.get_run_config(run_id)
+    if not cfg:
+        return "euclidean", None
+    return cfg["distance"], cfg["distance_p"]
+
+
 def topsis_sandbox_from_baseline_run(baseline_run_id: str, directions: List[str], sandbox_weights: Dict[str, float]):
     norm_df = topsis_read.get_matrix(baseline_run_id, "normalized")
     if norm_df is None or norm_df.empty:
@@ -305,18 +300,24 @@ def topsis_sandbox_from_baseline_run(baseline_run_id: str, directions: List[str]
     weights_vec = np.array([float(sandbox_weights.get(c, 0.0)) for c in crits], dtype=float)
     if weights_vec.sum() > 0:
         weights_vec = weights_vec / weights_vec.sum()
-    artifacts = compute_topsis(norm_df.values.astype(float), weights_vec, directions)
+    # The stored matrix is already normalized: score it as is, with the run's distance.
+    distance, distance_p = run_distance(baseline_run_id)
+    norm_values = norm_df.values.astype(float)
+    batch = topsis_batch_from_normalized(
+        norm_values, weights_vec[None, :], directions, distance=distance, distance_p=distance_p
+    )
+    c_star = batch.c_star[0]
     score_df = pd.DataFrame({
         "alternative_name": list(norm_df.index),
-        "score": artifacts.c_star,
+        "score": c_star,
     }).sort_values("score", ascending=False).reset_index(drop=True)
     score_df["rank"] = np.arange(1, len(score_df) + 1)
-    weighted_df = pd.DataFrame(artifacts.weighted_matrix, index=norm_df.index, columns=norm_df.columns)
+    weighted_df = pd.DataFrame(norm_values * weights_vec, index=norm_df.index, columns=norm_df.columns)
     dist_df = pd.DataFrame({
         "alternative_name": list(norm_df.index),
-        "s_pos": artifacts.s_pos,
-        "s_neg": artifacts.s_neg,
-        "c_star": artifacts.c_star,
+        "s_pos": batch.s_pos[0],
+        "s_neg": batch.s_neg[0],
+        "c_star": c_star,
     }).sort_values("c_star", ascending=False).reset_index(drop=True)
     return score_df, weighted_df, dist_df
 
@@ -335,6 +336,64 @@ def vft_sandbox_from_baseline_run(baseline_run_id: str, sandbox_weights: Dict[st
     return score_df, weighted_df
 
 
+def weight_plane_from_baseline_run(
+    baseline_run_id: str,
+    method: str,
+    directions_by_name: Dict[str, str],
+    base_weights_map: Dict[str, float],
+    x_name: str,
+    y_name: str,
+) -> Tuple[WeightPlane, List[str]] | None:
+    if method == "topsis":
+        values_df = topsis_read.get_matrix(baseline_run_id, "normalized")
+    else:
+        values_df, _ = get_vft_tables(baseline_run_id)
+    if values_df is None or values_df.empty:
+        return None
+    crits = list(values_df.columns)
+    if x_name not in crits or y_name not in crits or x_name == y_name or len(crits) < 3:
+        return None
+    base_w = np.array([float(base_weights_map.get(c, 0.0)) for c in crits], dtype=float)
+    i, j = crits.index(x_name), crits.index(y_name)
+    values = values_df.values.astype(float)
+    if method == "topsis":
+        directions = [directions_by_name.get(c, "benefit") for c in crits]
+        distance, distance_p = run_distance(baseline_run_id)
+        plane = topsis_weight_plane(values, directions, base_w, i, j, distance=distance, distance_p=distance_p)
+    else:
+        plane = vft_weight_plane(values, base_w, i, j)
+    return plane, list(values_df.index)
+
+
+def weight_plane_chart(plane: WeightPlane, alt_names: List[str], x_name: str, y_name: str, base_xy: Tuple[float, float]) -> io.BytesIO | None:
+    if not plane.feasible.any():
+        return None
+    colors = [BASE_COLORS[k % len(BASE_COLORS)] for k in range(len(alt_names))]
+    cmap = mcolors.ListedColormap(colors)
+    cmap.set_bad("white")
+    fig, ax = plt.subplots(figsize=(6.4, 5.2))
+    ax.imshow(
+        np.ma.masked_less(plane.winner, 0),
+        origin="lower",
+        extent=(0.0, 1.0, 0.0, 1.0),
+        cmap=cmap,
+        vmin=-0.5,
+        vmax=len(alt_names) - 0.5,
+        interpolation="nearest",
+    )
+    ax.scatter([base_xy[0]], [base_xy[1]], s=60, c="white", edgecolors="#475569", linewidths=1.5, zorder=3)
+    ax.set_xlabel(f"Weight of {x_name}")
+    ax.set_ylabel(f"Weight of {y_name}")
+    ax.set_title(f"Winning Alternative over {x_name} / {y_name} Weights", fontsize=11, fontweight="bold")
+    share = plane.win_share(len(alt_names))
+    handles = [
+        plt.Rectangle((0, 0), 1, 1, color=colors[k], label=f"{alt_names[k]} ({share[k]:.0%})")
+        for k in np.flatnonzero(share > 0)
+    ]
+    ax.legend(handles=handles, fontsize=7, bbox_to_anchor=(1.02, 1), loc="upper left", title="Winner")
+    return fig_to_buf(fig)
+
+
 def sandbox_compare_chart(base_scores_df: pd.DataFrame, sandbox_scores_df: pd.DataFrame, title: str) -> io.BytesIO | None:
     if base_scores_df.empty or sandbox_scores_df.empty:
         return None
@@ -421,47 +480,37 @@ def topsis_distance_chart(dist_df: pd.DataFrame, title: str) -> io.BytesIO | Non
 
 
 def build_compare_payload(sid: str, pref_ids: List[str], method: str, pref_name_map: Dict[str, str]) -> dict:
-    long_frames = []
-    weighted_payload = []
-    dist_payload = []
-    valid_labels = []
-    for pid in pref_ids:
-        run_id = load_latest_run_for_pref(sid, pid, method)
-        if not run_id:
-            continue
-        label = pref_name_map.get(pid, pid)
-        valid_labels.append(label)
-        sdf = pd.DataFrame(result_repo.get_scores_with_names(run_id))
-        if not sdf.empty:
-            sdf = sdf.copy()
-            sdf["comparison_label"] = label
-            long_frames.append(sdf)
+    latest = comparison_repo.latest_runs([(sid, pid) for pid in pref_ids], method)
+    picked = [
+        {"run_id": latest[(sid, pid)], "comparison_label": pref_name_map.get(pid, pid)}
+        for pid in pref_ids
+        if (sid, pid) in latest
+    ]
+    valid_labels = [p["comparison_label"] for p in picked]
+    long_df = pd.DataFrame()
+    weighted_long_df = pd.DataFrame()
+    dist_df = pd.DataFrame()
+    if picked:
+        meta = pd.DataFrame(picked)
+        run_ids = list(dict.fromkeys(meta["run_id"]))
+        scores = comparison_repo.load_scores(run_ids)
+        if not scores.empty:
+            long_df = meta.merge(scores, on="run_id").drop(columns="run_id")
+        weighted = comparison_repo.load_weighted_long(run_ids, "topsis" if method == "topsis" else "vft")
+        if not weighted.empty:
+            weighted_long_df = meta.merge(weighted, on="run_id")[
+                ["Alternative", "Criterion", "Weighted Value", "comparison_label"]
+            ]
         if method == "topsis":
-            weighted_long = load_topsis_weighted_long(run_id)
-            if not weighted_long.empty:
-                weighted_long = weighted_long.rename(columns={
-                    "alternative_name": "Alternative",
-                    "criterion_name": "Criterion",
-                    "weighted_value": "Weighted Value",
-                })
-                weighted_long["comparison_label"] = label
-                weighted_payload.append(weighted_long)
-            dist_df = topsis_read.get_distances(run_id)
-            if not dist_df.empty:
-                dist_df = dist_df.rename(columns={"alternative": "alternative_name"})
-                dist_df["comparison_label"] = label
-                dist_payload.append(dist_df)
-        else:
-            _, wt_df = get_vft_tables(run_id)
-            if not wt_df.empty:
-                long_w = wt_df.stack().reset_index()
-                long_w.columns = ["Alternative", "Criterion", "Weighted Value"]
-                long_w["comparison_label"] = label
-                weighted_payload.append(long_w)
+            dists = comparison_repo.load_distances(run_ids)
+            if not dists.empty:
+                dist_df = meta.merge(dists, on="run_id").drop(columns="run_id").rename(
+                    columns={"alternative": "alternative_name"}
+                )
     return {
-        "long_df": pd.concat(long_frames, ignore_index=True) if long_frames else pd.DataFrame(),
-        "weighted_long_df": pd.concat(weighted_payload, ignore_index=True) if weighted_payload else pd.DataFrame(),
-        "dist_df": pd.concat(dist_payload, ignore_index=True) if dist_payload else pd.DataFrame(),
+        "long_df": long_df,
+        "weighted_long_df": weighted_long_df,
+        "dist_df": dist_df,
         "selection_order": valid_labels,
         "method": method,
     }
@@ -728,6 +777,14 @@ with st.expander("Section 4: Sensitivity Analysis", expanded=False):
         sections["sec4_contrib"] = render_option("sec4_contrib", "Include sandbox contribution chart", run_method == "vft")
         if run_method == "topsis":
             sections["sec4_dist"] = render_option("sec4_dist", "Include TOPSIS distance decomposition chart")
+        if len(crit_names) >= 3:
+            sections["sec4_plane"] = render_option("sec4_plane", "Include two-criterion weight plane")
+            if sections["sec4_plane"][0]:
+                plane_x_col, plane_y_col = st.columns(2)
+                with plane_x_col:
+                    plane_x = st.selectbox("Weight plane X-axis criterion", crit_names, key="sec4_plane_x")
+                with plane_y_col:
+                    st.selectbox("Weight plane Y-axis criterion", [c for c in crit_names if c != plane_x], key="sec4_plane_y")
         st.dataframe(pd.concat([base_weights_df, sandbox_weights_df]).style.format("{:.4f}"), use_container_width=True)
 
         baseline_run_id = load_latest_run_for_pref(scenario_id, sb_pref_id, run_method)
@@ -966,6 +1023,25 @@ if do_export:
                     add_picture(doc, topsis_distance_chart(sb_dist_df, "Sandbox TOPSIS Distances"), width=6.6)
                     add_caption(doc, "Fig 4.6: TOPSIS distance decomposition under sandbox weights.")
                     add_note(doc, note)
+                selected, note = sections.get("sec4_plane", (False, ""))
+                plane_x = st.session_state.get("sec4_plane_x")
+                plane_y = st.session_state.get("sec4_plane_y")
+                if selected and plane_x and plane_y:
+                    directions_by_name = {c["name"]: (c.get("direction") or "benefit").strip().lower() for c in criteria_meta}
+                    plane_payload = weight_plane_from_baseline_run(
+                        baseline_run_id, run_method, directions_by_name, base_weights_for_sb, plane_x, plane_y
+                    )
+                    if plane_payload:
+                        plane, plane_alts = plane_payload
+                        doc.add_heading("4.7 Two-Criterion Weight Plane", level=2)
+                        base_xy = (base_weights_for_sb.get(plane_x, 0.0), base_weights_for_sb.get(plane_y, 0.0))
+                        add_picture(doc, weight_plane_chart(plane, plane_alts, plane_x, plane_y, base_xy), width=6.4)
+                        add_caption(
+                            doc,
+                            f"Fig 4.7: Winning alternative as the weights of {plane_x} and {plane_y} vary, other weights "
+                            "sharing the remainder in proportion. The marker shows the baseline weights.",
+                        )
+                        add_note(doc, note)
 
         if sections.get("sec5_enable"):
             cmp_pref_ids = st.session_state.get("rpt_cmp_pref_ids", [])
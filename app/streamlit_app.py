@@ -5,7 +5,7 @@ from app.ui_theme import apply_theme, BLUE_SCALE, TEAL_SCALE, BLUE_TEAL_SCALE, D
 import pandas as pd
 from app.sidebar_nav import render_sidebar
 from sqlalchemy import text
-from persistence.engine import get_engine, ping_db
+from persistence.engine import get_engine, ping_db, pool_stats
 
 st.set_page_config(
     page_title="MCDA Decision Tool",
@@ -121,6 +121,10 @@ except Exception:
 
 if db_ok:
     st.success("Database connected", icon=None)
+    with st.expander("Connection pool", expanded=False):
+        stats = pool_stats()
+        st.caption(stats.pop("status", ""))
+        st.json(stats)
 else:
     st.warning("Database not reachable — check DATABASE_URL in your .env file")
 
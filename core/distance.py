@@ -1,12 +1,28 @@
 # core/distance.py
 """
 Distance metrics for TOPSIS ideal-solution separation.
-TOPSIS currently uses Euclidean distance exclusively.
+
+Every metric is a member of the weighted Minkowski family applied to the
+weighted matrix v_ij = w_j * r_ij, so it is fully described by its order p:
+Manhattan (p=1), Euclidean (p=2), Chebyshev (p=inf) or a user-chosen p.
+get_distance() resolves a name (and p for 'minkowski') once per run.
 """
 from __future__ import annotations
 
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple
+
 import numpy as np
 
+SeparationFn = Callable[[np.ndarray, np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+DISTANCE_ORDERS: Dict[str, float] = {
+    "manhattan": 1.0,
+    "euclidean": 2.0,
+    "chebyshev": float("inf"),
+}
+DISTANCES = ("euclidean", "manhattan", "chebyshev", "minkowski")
+
 
 def euclidean_distance(a: np.ndarray, b: np.ndarray) -> float:
     """Euclidean distance between two 1-D vectors."""
@@ -34,3 +50,63 @@ def separation_measures(
     s_pos = np.sqrt(((weighted_matrix - pis) ** 2).sum(axis=1))
     s_neg = np.sqrt(((weighted_matrix - nis) ** 2).sum(axis=1))
     return s_pos, s_neg
+
+
+def manhattan_separation(
+    weighted_matrix: np.ndarray,
+    pis: np.ndarray,
+    nis: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """S*/S- as sums of absolute deviations; no squaring or square root."""
+    s_pos = np.abs(weighted_matrix - pis).sum(axis=1)
+    s_neg = np.abs(weighted_matrix - nis).sum(axis=1)
+    return s_pos, s_neg
+
+
+def chebyshev_separation(
+    weighted_matrix: np.ndarray,
+    pis: np.ndarray,
+    nis: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """S*/S- as the largest absolute deviation over criteria."""
+    s_pos = np.abs(weighted_matrix - pis).max(axis=1)
+    s_neg = np.abs(weighted_matrix - nis).max(axis=1)
+    return s_pos, s_neg
+
+
+def minkowski_separation(
+    weighted_matrix: np.ndarray,
+    pis: np.ndarray,
+    nis: np.ndarray,
+    p: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """S*/S- under the Minkowski metric of order p (p >= 1)."""
+    s_pos = (np.abs(weighted_matrix - pis) ** p).sum(axis=1) ** (1.0 / p)
+    s_neg = (np.abs(weighted_matrix - nis) ** p).sum(axis=1) ** (1.0 / p)
+    return s_pos, s_neg
+
+
+def distance_order(name: str, p: Optional[float] = None) -> float:
+    """Minkowski order of a named metric; 'minkowski' requires p >= 1."""
+    if name == "minkowski":
+        if p is None or np.isnan(p) or p < 1:
+            raise ValueError("minkowski distance requires p >= 1")
+        return float(p)
+    try:
+        return DISTANCE_ORDERS[name]
+    except KeyError:
+        raise ValueError(
+            f"unknown distance '{name}' (expected one of: {', '.join(DISTANCES)})"
+        ) from None
+
+
+def get_distance(name: str, p: Optional[float] = None) -> SeparationFn:
+    """Resolve a separation kernel by name, dispatching to the cheapest form of its order."""
+    order = distance_order(name, p)
+    if order == 1.0:
+        return manhattan_separation
+    if order == 2.0:
+        return separation_measures
+    if order == float("inf"):
+        return chebyshev_separation
+    return partial(minkowski_separation, p=order)
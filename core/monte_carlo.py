@@ -0,0 +1,281 @@
+# core/monte_carlo.py
+"""
+Monte Carlo weight-uncertainty analysis (SMAA-style) for TOPSIS and VFT.
+
+Weight vectors are drawn from a Dirichlet or an interval distribution and
+scored chunk by chunk with the batched kernels, so only one (chunk, m) score
+block exists at a time. Every chunk gets its own child of
+SeedSequence(seed), which makes a run reproducible and independent of how
+the chunks are spread over worker processes.
+
+Outputs per alternative:
+  rank_acceptability  share of samples placing it at each rank (ranks 1..max_rank)
+  holistic            SMAA-2 holistic index with linear meta-weights,
+                      (m - mean rank) / (m - 1)
+  central_weights     mean weight vector over the samples where it ranks first
+  confidence          whether it ranks first under its own central weights;
+                      with exact criteria values this is 0 or 1
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.topsis import Directions, compile_directions, topsis_batch_from_normalized
+
+DEFAULT_CHUNK_SIZE = 4096
+# Below this many alternatives a chunk is too cheap to be worth a process hop.
+POOL_MIN_ALTERNATIVES = 2000
+
+
+@dataclass(frozen=True)
+class WeightDistribution:
+    kind: str                              # 'dirichlet' or 'interval'
+    alpha: Optional[np.ndarray] = None     # Dirichlet concentration, shape (n,)
+    lower: Optional[np.ndarray] = None     # interval bounds before renormalizing, shape (n,)
+    upper: Optional[np.ndarray] = None
+
+    @property
+    def n(self) -> int:
+        return len(self.alpha) if self.kind == "dirichlet" else len(self.lower)
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """(size, n) weight vectors summing to 1."""
+        if self.kind == "dirichlet":
+            return rng.dirichlet(self.alpha, size=size)
+        w = rng.uniform(self.lower, self.upper, size=(size, self.n))
+        totals = w.sum(axis=1, keepdims=True)
+        return np.where(totals > 0, w / np.where(totals > 0, totals, 1.0), 1.0 / self.n)
+
+
+def dirichlet_distribution(
+    base_weights: Sequence[float],
+    concentration: Optional[float] = None,
+) -> WeightDistribution:
+    """
+    concentration=None samples uniformly from the weight simplex (no
+    preference information); otherwise alpha = concentration * normalized
+    base weights, so larger values stay closer to the base weights.
+    """
+    base = np.asarray(base_weights, dtype=float)
+    if base.ndim != 1 or len(base) == 0:
+        raise ValueError("base_weights must be a non-empty 1D sequence")
+    if concentration is None:
+        return WeightDistribution("dirichlet", alpha=np.ones_like(base))
+    if concentration <= 0:
+        raise ValueError("concentration must be > 0")
+    if base.min() < 0 or base.sum() <= 0:
+        raise ValueError("base_weights must be non-negative with a positive sum")
+    # A zero weight would give alpha = 0, which Dirichlet rejects.
+    alpha = np.maximum(concentration * base / base.sum(), 1e-6)
+    return WeightDistribution("dirichlet", alpha=alpha)
+
+
+def interval_distribution(lower: Sequence[float], upper: Sequence[float]) -> WeightDistribution:
+    """Independent uniform draws in [lower_j, upper_j], renormalized to sum to 1."""
+    lo = np.asarray(lower, dtype=float)
+    hi = np.asarray(upper, dtype=float)
+    if lo.shape != hi.shape or lo.ndim != 1 or len(lo) == 0:
+        raise ValueError("lower and upper must be 1D with the same length")
+    if lo.min() < 0 or np.any(hi < lo) or hi.sum() <= 0:
+        raise ValueError("intervals must satisfy 0 <= lower <= upper with some upper > 0")
+    return WeightDistribution("interval", lower=lo, upper=hi)
+
+
+@dataclass(frozen=True)
+class MonteCarloResult:
+    n_samples: int
+    rank_acceptability: np.ndarray   # (m, max_rank)
+    holistic: np.ndarray             # (m,)
+    central_weights: np.ndarray      # (m, n), NaN rows for never-first alternatives
+    confidence: np.ndarray           # (m,)
+
+
+class _TopsisScorer:
+    def __init__(self, normalized_matrix, directions, distance, distance_p):
+        self.normalized_matrix = np.asarray(normalized_matrix, dtype=float)
+        self.benefit_mask = np.array(compile_directions(directions))
+        self.distance = distance
+        self.distance_p = distance_p
+
+    def __call__(self, weights: np.ndarray) -> np.ndarray:
+        return topsis_batch_from_normalized(
+            self.normalized_matrix,
+            weights,
+            self.benefit_mask,
+            distance=self.distance,
+            distance_p=self.distance_p,
+        ).c_star
+
+
+class _VFTScorer:
+    def __init__(self, utility):
+        self.utility = np.asarray(utility, dtype=float)
+
+    def __call__(self, weights: np.ndarray) -> np.ndarray:
+        return weights @ self.utility.T
+
+
+Scorer = Callable[[np.ndarray], np.ndarray]
+
+# Set once per worker process by _init_worker so tasks only carry seeds.
+_worker_state: Optional[Tuple[Scorer, WeightDistribution, int]] = None
+
+
+def _init_worker(scorer: Scorer, distribution: WeightDistribution, max_rank: int) -> None:
+    global _worker_state
+    _worker_state = (scorer, distribution, max_rank)
+
+
+def _score_chunk(
+    scorer: Scorer,
+    distribution: WeightDistribution,
+    max_rank: int,
+    seed: np.random.SeedSequence,
+    size: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    weights = distribution.sample(np.random.default_rng(seed), size)
+    scores = scorer(weights)                                   # (size, m)
+    k, m = scores.shape
+    order = np.argsort(-scores, axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(m)[None, :], axis=1)
+
+    alt = np.broadcast_to(np.arange(m), (k, m))
+    tracked = ranks < max_rank
+    counts = np.bincount(
+        (alt[tracked] * max_rank + ranks[tracked]), minlength=m * max_rank
+    ).reshape(m, max_rank)
+    rank_sum = ranks.sum(axis=0, dtype=np.int64)
+    central_sum = np.zeros((m, weights.shape[1]))
+    np.add.at(central_sum, order[:, 0], weights)
+    return counts, rank_sum, central_sum
+
+
+def _score_chunk_in_worker(task: Tuple[np.random.SeedSequence, int]):
+    scorer, distribution, max_rank = _worker_state
+    return _score_chunk(scorer, distribution, max_rank, *task)
+
+
+def _run(
+    scorer: Scorer,
+    m: int,
+    distribution: WeightDistribution,
+    n_samples: int,
+    seed: Optional[int],
+    chunk_size: int,
+    workers: Optional[int],
+    max_rank: Optional[int],
+) -> MonteCarloResult:
+    if n_samples <= 0:
+        raise ValueError("n_samples must be > 0")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+    max_rank = m if max_rank is None else max(1, min(int(max_rank), m))
+
+    sizes = [chunk_size] * (n_samples // chunk_size)
+    if n_samples % chunk_size:
+        sizes.append(n_samples % chunk_size)
+    tasks: List[Tuple[np.random.SeedSequence, int]] = list(
+        zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes)
+    )
+
+    if workers is None:
+        workers = None if m >= POOL_MIN_ALTERNATIVES and len(tasks) > 1 else 1
+    if workers == 1 or len(tasks) == 1:
+        partials = (_score_chunk(scorer, distribution, max_rank, *t) for t in tasks)
+        return _collect(scorer, m, distribution.n, max_rank, n_samples, partials)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(scorer, distribution, max_rank),
+    ) as pool:
+        # map() yields in submission order, so float sums match a serial run.
+        partials = pool.map(_score_chunk_in_worker, tasks)
+        return _collect(scorer, m, distribution.n, max_rank, n_samples, partials)
+
+
+def _collect(scorer: Scorer, m: int, n: int, max_rank: int, n_samples: int, partials) -> MonteCarloResult:
+    counts = np.zeros((m, max_rank), dtype=np.int64)
+    rank_sum = np.zeros(m, dtype=np.int64)
+    central_sum = np.zeros((m, n))
+    for c, r, w in partials:
+        counts += c
+        rank_sum += r
+        central_sum += w
+
+    firsts = counts[:, 0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        central = central_sum / firsts[:, None]
+    confidence = np.zeros(m)
+    winners = np.flatnonzero(firsts > 0)
+    if winners.size:
+        best = scorer(central[winners]).argmax(axis=1)
+        confidence[winners] = (best == winners).astype(float)
+
+    mean_rank = rank_sum / n_samples                # 0-based
+    holistic = 1.0 - mean_rank / (m - 1) if m > 1 else np.ones(m)
+    return MonteCarloResult(
+        n_samples=n_samples,
+        rank_acceptability=counts / n_samples,
+        holistic=holistic,
+        central_weights=central,
+        confidence=confidence,
+    )
+
+
+def topsis_monte_carlo(
+    normalized_matrix: np.ndarray,
+    directions: Directions,
+    distribution: WeightDistribution,
+    n_samples: int = 10000,
+    seed: Optional[int] = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    max_rank: Optional[int] = None,
+    distance: str = "euclidean",
+    distance_p: Optional[float] = None,
+) -> MonteCarloResult:
+    """
+    normalized_matrix: r_ij, shape (m, n)
+    workers: process count; None picks a pool only for large m, 1 runs inline
+    max_rank: track acceptability for ranks 1..max_rank only (all when None)
+    """
+    r = np.asarray(normalized_matrix, dtype=float)
+    if r.ndim != 2 or r.shape[1] != distribution.n:
+        raise ValueError("distribution must have one weight per criterion")
+    scorer = _TopsisScorer(r, directions, distance, distance_p)
+    return _run(scorer, r.shape[0], distribution, n_samples, seed, chunk_size, workers, max_rank)
+
+
+def vft_monte_carlo(
+    utility: np.ndarray,
+    distribution: WeightDistribution,
+    n_samples: int = 10000,
+    seed: Optional[int] = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    max_rank: Optional[int] = None,
+) -> MonteCarloResult:
+    """utility: u_ij in [0, 1], shape (m, n); other arguments as topsis_monte_carlo."""
+    u = np.asarray(utility, dtype=float)
+    if u.ndim != 2 or u.shape[1] != distribution.n:
+        raise ValueError("distribution must have one weight per criterion")
+    return _run(_VFTScorer(u), u.shape[0], distribution, n_samples, seed, chunk_size, workers, max_rank)
+
+
+def acceptability_frame(result: MonteCarloResult, alternative_names: Sequence[str]) -> pd.DataFrame:
+    """Long table: alternative, rank (1-based), acceptability."""
+    m, r = result.rank_acceptability.shape
+    return pd.DataFrame(
+        {
+            "alternative": np.repeat(np.asarray(alternative_names, dtype=object), r),
+            "rank": np.tile(np.arange(1, r + 1), m),
+            "acceptability": result.rank_acceptability.ravel(),
+        }
+    )
@@ -1,13 +1,19 @@
 # core/normalization.py
 """
-Normalization utilities used by TOPSIS.
-Currently TOPSIS uses vector normalization internally; this module
-provides standalone helpers for alternative use-cases.
+Normalization strategies for TOPSIS.
+
+Each strategy maps an (m, n) raw matrix to an (m, n) normalized matrix
+column by column. compute_topsis() looks one up by name through
+get_normalization(); vector normalization remains the default.
 """
 from __future__ import annotations
 
+from typing import Callable, Dict
+
 import numpy as np
 
+NormalizationFn = Callable[[np.ndarray], np.ndarray]
+
 
 def vector_normalize(matrix: np.ndarray) -> np.ndarray:
     """
@@ -38,3 +44,45 @@ def sum_normalize(matrix: np.ndarray) -> np.ndarray:
     col_sum = matrix.sum(axis=0)
     col_sum = np.where(col_sum == 0, 1.0, col_sum)
     return matrix / col_sum
+
+
+def max_normalize(matrix: np.ndarray) -> np.ndarray:
+    """
+    Divide each column by its largest absolute value.
+    All-zero columns are left as-is.
+    """
+    col_max = np.abs(matrix).max(axis=0)
+    col_max = np.where(col_max == 0, 1.0, col_max)
+    return matrix / col_max
+
+
+def log_normalize(matrix: np.ndarray) -> np.ndarray:
+    """
+    Logarithmic normalization: ln(x_ij) / sum_i ln(x_ij).
+    Requires strictly positive values; zero-sum columns are left as ln(x).
+    """
+    if (matrix <= 0).any():
+        raise ValueError("logarithmic normalization requires strictly positive values")
+    logs = np.log(matrix)
+    col_sum = logs.sum(axis=0)
+    col_sum = np.where(col_sum == 0, 1.0, col_sum)
+    return logs / col_sum
+
+
+NORMALIZATIONS: Dict[str, NormalizationFn] = {
+    "vector": vector_normalize,
+    "minmax": minmax_normalize,
+    "sum": sum_normalize,
+    "max": max_normalize,
+    "logarithmic": log_normalize,
+}
+
+
+def get_normalization(name: str) -> NormalizationFn:
+    """Look up a normalization strategy by its registry name."""
+    try:
+        return NORMALIZATIONS[name]
+    except KeyError:
+        raise ValueError(
+            f"unknown normalization '{name}' (expected one of: {', '.join(NORMALIZATIONS)})"
+        ) from None
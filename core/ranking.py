@@ -0,0 +1,72 @@
+# core/ranking.py
+"""
+Ranking helpers for score vectors (higher is better).
+
+Ties keep input order, matching sorted(..., reverse=True) on the same items.
+top_k_indices() only partially sorts, so asking for the best k of m scores is
+O(m + k log k); the full order is computed on demand by Ranking.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first (ties by lower index)."""
+    scores = np.asarray(scores, dtype=float)
+    m = scores.shape[0]
+    if k >= m:
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    # The k-th best value splits the scores into a sure set above it and a
+    # tie group at it; take the tie group in index order to stay stable.
+    kth = -np.partition(-scores, k - 1)[k - 1]
+    above = np.flatnonzero(scores > kth)
+    ties = np.flatnonzero(scores == kth)[: k - len(above)]
+    idx = np.concatenate([above, ties])
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+class Ranking:
+    """
+    Lazy ranking of a score vector.
+
+    top(k) uses a partial sort; order and ranks trigger one full argsort the
+    first time either is read and are cached afterwards.
+    """
+
+    __slots__ = ("scores", "_order", "_ranks")
+
+    def __init__(self, scores: np.ndarray):
+        self.scores = np.asarray(scores, dtype=float)
+        self._order: Optional[np.ndarray] = None
+        self._ranks: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.scores.shape[0]
+
+    def top(self, k: int) -> np.ndarray:
+        """Indices of the best k alternatives, best first."""
+        if self._order is not None:
+            return self._order[:k]
+        return top_k_indices(self.scores, k)
+
+    @property
+    def order(self) -> np.ndarray:
+        """All indices, best first."""
+        if self._order is None:
+            self._order = np.argsort(-self.scores, kind="stable")
+        return self._order
+
+    @property
+    def ranks(self) -> np.ndarray:
+        """1-based rank of every alternative, in input order."""
+        if self._ranks is None:
+            ranks = np.empty(len(self), dtype=np.int64)
+            ranks[self.order] = np.arange(1, len(self) + 1)
+            self._ranks = ranks
+        return self._ranks
@@ -0,0 +1,236 @@
+# core/sensitivity.py
+"""
+Weight sensitivity for TOPSIS and VFT.
+
+A one-at-a-time sweep sets criterion j's weight to each grid value and
+shares the remainder among the other criteria in proportion to their base
+weights (equally when those are all zero). All grid points are scored in one
+batched call, so a sweep returns a (grid, m) score matrix. Tornado analysis
+scores the 2n extreme weight vectors (each criterion at weight 0 and at
+weight 1) the same way, for every alternative at once.
+
+Score sensitivity for VFT moves one alternative's raw value on one
+criterion. Only that alternative's total changes, and it is piecewise linear
+in the raw value, so the sweep is a single interpolation and the break-even
+values against the (constant) competitor totals are solved per segment.
+"""
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.topsis import Directions, topsis_batch_from_normalized
+
+
+def sweep_weights(base_weights: np.ndarray, j: int, grid: np.ndarray) -> np.ndarray:
+    """
+    (g, n) weight vectors with w_j = grid[g] and the other weights rescaled
+    proportionally to sum to 1 - grid[g].
+    """
+    base = np.asarray(base_weights, dtype=float)
+    grid = np.asarray(grid, dtype=float)
+    n = base.shape[0]
+    if not 0 <= j < n:
+        raise ValueError("criterion index out of range")
+
+    share = np.where(np.arange(n) == j, 0.0, base)
+    total = share.sum()
+    if n > 1:
+        share = share / total if total > 0 else np.where(np.arange(n) == j, 0.0, 1.0 / (n - 1))
+    weights = (1.0 - grid)[:, None] * share[None, :]
+    weights[:, j] = grid
+    return weights
+
+
+def topsis_weight_sweep(
+    normalized_matrix: np.ndarray,
+    directions: Directions,
+    base_weights: np.ndarray,
+    j: int,
+    grid: np.ndarray,
+    distance: str = "euclidean",
+    distance_p: Optional[float] = None,
+) -> np.ndarray:
+    """C* for every grid point and alternative, shape (g, m)."""
+    weights = sweep_weights(base_weights, j, grid)
+    return topsis_batch_from_normalized(
+        normalized_matrix, weights, directions, distance=distance, distance_p=distance_p
+    ).c_star
+
+
+def vft_weight_sweep(utility: np.ndarray, base_weights: np.ndarray, j: int, grid: np.ndarray) -> np.ndarray:
+    """VFT totals for every grid point and alternative, shape (g, m)."""
+    return sweep_weights(base_weights, j, grid) @ np.asarray(utility, dtype=float).T
+
+
+def tornado_weights(base_weights: np.ndarray) -> np.ndarray:
+    """
+    (2n, n) extreme weight vectors: row j sets w_j = 0 and renormalizes the
+    others proportionally; row n + j sets w_j = 1 and the others to 0.
+    """
+    base = np.asarray(base_weights, dtype=float)
+    n = base.shape[0]
+    off_diag = 1.0 - np.eye(n)
+    others = base[None, :] * off_diag
+    totals = others.sum(axis=1, keepdims=True)
+    equal = off_diag / max(n - 1, 1)
+    w0 = np.where(totals > 0, others / np.where(totals > 0, totals, 1.0), equal)
+    return np.vstack([w0, np.eye(n)])
+
+
+def tornado_frame(
+    extreme_scores: np.ndarray,
+    base_scores: np.ndarray,
+    alternative_names: Sequence[str],
+    criterion_names: Sequence[str],
+) -> pd.DataFrame:
+    n = len(criterion_names)
+    m = len(alternative_names)
+    w0 = extreme_scores[:n].T    # (m, n)
+    w1 = extreme_scores[n:].T
+    lo = np.minimum(w0, w1)
+    hi = np.maximum(w0, w1)
+    return pd.DataFrame(
+        {
+            "alternative": np.repeat(np.asarray(alternative_names, dtype=object), n),
+            "criterion": np.tile(np.asarray(criterion_names, dtype=object), m),
+            "base_score": np.repeat(base_scores, n),
+            "weight0_score": w0.ravel(),
+            "weight1_score": w1.ravel(),
+            "min_score": lo.ravel(),
+            "max_score": hi.ravel(),
+            "spread": (hi - lo).ravel(),
+        }
+    )
+
+
+def topsis_tornado(
+    normalized_matrix: np.ndarray,
+    directions: Directions,
+    base_weights: np.ndarray,
+    alternative_names: Sequence[str],
+    criterion_names: Sequence[str],
+    distance: str = "euclidean",
+    distance_p: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Tornado data for every (alternative, criterion) pair from one batched
+    TOPSIS pass over the base weights plus the 2n extreme weight vectors.
+    """
+    base = np.asarray(base_weights, dtype=float)
+    if base.sum() <= 0:
+        base = np.ones_like(base) / max(len(base), 1)
+    weights = np.vstack([base[None, :] / base.sum(), tornado_weights(base)])
+    c_star = topsis_batch_from_normalized(
+        normalized_matrix, weights, directions, distance=distance, distance_p=distance_p
+    ).c_star
+    return tornado_frame(c_star[1:], c_star[0], alternative_names, criterion_names)
+
+
+def vft_tornado(
+    utility: np.ndarray,
+    base_weights: np.ndarray,
+    alternative_names: Sequence[str],
+    criterion_names: Sequence[str],
+) -> pd.DataFrame:
+    """Tornado data for every (alternative, criterion) pair; base scores use base_weights as given."""
+    utility = np.asarray(utility, dtype=float)
+    base = np.asarray(base_weights, dtype=float)
+    totals = np.vstack([base[None, :], tornado_weights(base)]) @ utility.T
+    return tornado_frame(totals[1:], totals[0], alternative_names, criterion_names)
+
+
+def _breakpoints(points: Sequence[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    pts = np.asarray(list(points), dtype=float).reshape(-1, 2)
+    order = np.argsort(pts[:, 0], kind="stable")
+    return pts[order, 0], pts[order, 1]
+
+
+def vft_score_sweep(
+    points: Sequence[Tuple[float, float]],
+    raw_grid: np.ndarray,
+    weight: float,
+    rest_total: float,
+) -> np.ndarray:
+    """
+    Total score of one alternative for every raw value in raw_grid.
+
+    points: the criterion's value-function breakpoints (x, y)
+    rest_total: the alternative's total without this criterion's contribution
+    """
+    grid = np.asarray(raw_grid, dtype=float)
+    if not points:
+        return np.full(grid.shape, float(rest_total))
+    xs, ys = _breakpoints(points)
+    return rest_total + weight * np.interp(grid, xs, ys)
+
+
+def vft_break_even(
+    points: Sequence[Tuple[float, float]],
+    weight: float,
+    rest_total: float,
+    competitor_totals: np.ndarray,
+    competitor_names: Sequence[str],
+) -> pd.DataFrame:
+    """
+    Exact raw values at which the swept alternative ties a competitor.
+
+    Returns columns competitor, raw_value, total, ahead_above (True when the
+    swept alternative's total rises through the tie, i.e. it leads for
+    higher raw values), sorted by raw_value. A tie along a flat segment is
+    reported at the segment's ends. Touching a competitor's total without
+    crossing it (a peak or valley exactly at the tie) is not a break-even
+    and is left out, as is a tie exactly at the domain's upper end, since
+    there is nothing above it to lead over.
+    """
+    columns = ["competitor", "raw_value", "total", "ahead_above"]
+    b = np.asarray(competitor_totals, dtype=float)
+    if len(points) < 2 or weight == 0 or b.size == 0:
+        return pd.DataFrame(columns=columns)
+
+    xs, ys = _breakpoints(points)
+    target = (b - rest_total) / weight                  # (C,) value needed to tie
+    y0, y1 = ys[:-1, None], ys[1:, None]                # (S, 1) segment ends
+    dx = (xs[1:] - xs[:-1])[:, None]
+    dy = y1 - y0
+    lo, hi = np.minimum(y0, y1), np.maximum(y0, y1)
+    hit = (dy != 0) & (dx > 0) & (target[None, :] >= lo) & (target[None, :] <= hi)
+    seg, comp = np.nonzero(hit)
+    if seg.size == 0:
+        return pd.DataFrame(columns=columns)
+
+    x = xs[seg] + (target[comp] - ys[seg]) * dx[seg, 0] / dy[seg, 0]
+    # Crossing exactly at a breakpoint is found from both neighbouring segments.
+    keep = np.unique(np.column_stack([comp, np.round(x, 12)]), axis=0, return_index=True)[1]
+    comp, x = comp[keep], x[keep]
+
+    # Side of the tie on each side: sign of (value - target) at the nearest
+    # breakpoint off the tie, so flat stretches at the tie are skipped.
+    diff = ys[None, :] - target[comp][:, None]           # (K, P)
+    eps = 1e-9 * max(1.0, xs[-1] - xs[0])
+    off_tie = np.abs(diff) > 1e-12
+    left = off_tie & (xs[None, :] < x[:, None] - eps)
+    right = off_tie & (xs[None, :] > x[:, None] + eps)
+    rows = np.arange(len(x))
+    has_left, has_right = left.any(axis=1), right.any(axis=1)
+    side_left = np.where(has_left, np.sign(diff[rows, len(xs) - 1 - left[:, ::-1].argmax(axis=1)]), 0.0)
+    side_right = np.where(has_right, np.sign(diff[rows, right.argmax(axis=1)]), 0.0)
+    at_upper_end = ~has_right & (x >= xs[-1] - eps)
+    crosses = ~(has_left & has_right & (side_left == side_right)) & ~at_upper_end
+    # Tied from the crossing all the way to the upper end: use the approach direction.
+    ahead_above = np.where(has_right, side_right, -side_left) * weight > 0
+
+    comp, x, ahead_above = comp[crosses], x[crosses], ahead_above[crosses]
+    order = np.argsort(x, kind="stable")
+    comp, x, ahead_above = comp[order], x[order], ahead_above[order]
+    return pd.DataFrame(
+        {
+            "competitor": np.asarray(competitor_names, dtype=object)[comp],
+            "raw_value": x,
+            "total": b[comp],
+            "ahead_above": ahead_above,
+        },
+        columns=columns,
+    )
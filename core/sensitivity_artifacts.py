@@ -0,0 +1,159 @@
+# core/sensitivity_artifacts.py
+"""
+Standard sensitivity results for one run, computed once at save time.
+
+Bundles the one-at-a-time sweep of every criterion at a fixed resolution,
+the tornado extremes and both kinds of stability interval, so the
+sensitivity page can show a saved run without recomputing anything.
+Scores are kept as float32; interval bounds as float64.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from core.sensitivity import tornado_frame, sweep_weights, tornado_weights
+from core.stability import MODES, topsis_stability_intervals, vft_stability_intervals
+from core.topsis import Directions, topsis_batch_from_normalized
+
+SWEEP_POINTS = 50
+
+
+@dataclass(frozen=True)
+class SensitivityArtifacts:
+    base_weights: np.ndarray   # (n,) as used for base_scores
+    base_scores: np.ndarray    # (m,) float32
+    sweeps: np.ndarray         # (n, g, m) float32; sweeps[j] varies criterion j over grid
+    tornado: np.ndarray        # (2n, m) float32, rows as in tornado_weights()
+    stability: np.ndarray      # (len(MODES), n, 2) lower/upper bounds
+    stability_swaps: np.ndarray  # (len(MODES), n, 4) ahead/behind at lower, then upper; -1 if none
+
+    @property
+    def grid(self) -> np.ndarray:
+        return np.linspace(0.0, 1.0, self.sweeps.shape[1])
+
+    def matches(self, base_weights: np.ndarray, base_scores: np.ndarray) -> bool:
+        """True when these artifacts describe the given inputs (weights up to scale)."""
+        w = np.asarray(base_weights, dtype=float)
+        own = self.base_weights
+        if w.shape != own.shape or np.shape(base_scores) != self.base_scores.shape:
+            return False
+        w_sum, own_sum = w.sum(), own.sum()
+        if w_sum > 0 and own_sum > 0 and not np.allclose(w / w_sum, own / own_sum, atol=1e-9):
+            return False
+        return bool(np.allclose(base_scores, self.base_scores, atol=1e-5))
+
+    def tornado_frame(self, alternative_names: Sequence[str], criterion_names: Sequence[str]) -> pd.DataFrame:
+        """Same layout as core.sensitivity.topsis_tornado / vft_tornado."""
+        return tornado_frame(
+            self.tornado.astype(float), self.base_scores.astype(float), alternative_names, criterion_names
+        )
+
+    def stability_frame(
+        self,
+        alternative_names: Sequence[str],
+        criterion_names: Sequence[str],
+        mode: str = "ranking",
+    ) -> pd.DataFrame:
+        """Same layout as core.stability.*_stability_intervals."""
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of: {', '.join(MODES)}")
+        k = MODES.index(mode)
+        bounds = self.stability[k]
+        swaps = self.stability_swaps[k]
+        total = self.base_weights.sum()
+
+        def pair(a: int, b: int):
+            return None if a < 0 else (alternative_names[a], alternative_names[b])
+
+        return pd.DataFrame(
+            {
+                "criterion": list(criterion_names),
+                "base_weight": self.base_weights / total if total > 0 else self.base_weights,
+                "lower": bounds[:, 0],
+                "upper": bounds[:, 1],
+                "lower_swap": [pair(int(s[0]), int(s[1])) for s in swaps],
+                "upper_swap": [pair(int(s[2]), int(s[3])) for s in swaps],
+            }
+        )
+
+
+def _stability_arrays(frames: Sequence[pd.DataFrame]):
+    bounds = np.stack([f[["lower", "upper"]].to_numpy(dtype=float) for f in frames])
+
+    def flat(swap) -> tuple:
+        return (-1, -1) if swap is None else swap
+
+    swaps = np.array(
+        [[flat(lo) + flat(hi) for lo, hi in zip(f["lower_swap"], f["upper_swap"])] for f in frames],
+        dtype=np.int32,
+    ).reshape(len(frames), -1, 4)
+    return bounds, swaps
+
+
+def topsis_sensitivity_artifacts(
+    normalized_matrix: np.ndarray,
+    directions: Directions,
+    base_weights: np.ndarray,
+    grid_points: int = SWEEP_POINTS,
+    distance: str = "euclidean",
+    distance_p: Optional[float] = None,
+) -> SensitivityArtifacts:
+    r = np.asarray(normalized_matrix, dtype=float)
+    m, n = r.shape
+    base = np.asarray(base_weights, dtype=float)
+    if base.sum() <= 0:
+        base = np.ones(n)
+    base = base / base.sum()
+    grid = np.linspace(0.0, 1.0, grid_points)
+
+    # Base, tornado extremes and every sweep point share one batched pass.
+    weights = np.vstack([base[None, :], tornado_weights(base)] + [sweep_weights(base, j, grid) for j in range(n)])
+    c_star = topsis_batch_from_normalized(r, weights, directions, distance=distance, distance_p=distance_p).c_star
+
+    idx = list(range(m))
+    crit = list(range(n))
+    frames = [
+        topsis_stability_intervals(r, directions, base, idx, crit, mode=mode, distance=distance, distance_p=distance_p)
+        for mode in MODES
+    ]
+    bounds, swaps = _stability_arrays(frames)
+    return SensitivityArtifacts(
+        base_weights=base,
+        base_scores=c_star[0].astype(np.float32),
+        sweeps=c_star[1 + 2 * n:].reshape(n, grid_points, m).astype(np.float32),
+        tornado=c_star[1:1 + 2 * n].astype(np.float32),
+        stability=bounds,
+        stability_swaps=swaps,
+    )
+
+
+def vft_sensitivity_artifacts(
+    utility: np.ndarray,
+    base_weights: np.ndarray,
+    grid_points: int = SWEEP_POINTS,
+) -> SensitivityArtifacts:
+    """base_weights are used as given for base_scores, as in vft_tornado."""
+    u = np.asarray(utility, dtype=float)
+    m, n = u.shape
+    base = np.asarray(base_weights, dtype=float)
+    grid = np.linspace(0.0, 1.0, grid_points)
+
+    weights = np.vstack([base[None, :], tornado_weights(base)] + [sweep_weights(base, j, grid) for j in range(n)])
+    totals = weights @ u.T
+
+    idx = list(range(m))
+    crit = list(range(n))
+    frames = [vft_stability_intervals(u, base, idx, crit, mode=mode) for mode in MODES]
+    bounds, swaps = _stability_arrays(frames)
+    return SensitivityArtifacts(
+        base_weights=base,
+        base_scores=totals[0].astype(np.float32),
+        sweeps=totals[1 + 2 * n:].reshape(n, grid_points, m).astype(np.float32),
+        tornado=totals[1:1 + 2 * n].astype(np.float32),
+        stability=bounds,
+        stability_swaps=swaps,
+    )
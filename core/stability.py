@@ -0,0 +1,212 @@
+# core/stability.py
+"""
+Exact weight stability intervals.
+
+For each criterion j the weight is moved along the same path as the
+one-at-a-time sweep in core.sensitivity (w_j = t, other weights rescaled
+proportionally), and we report the interval of t around the current weight
+over which the ranking, or only the top alternative, stays unchanged.
+
+The ranking can only change when two alternatives that are adjacent in the
+current order swap (or, for top-1, when some alternative overtakes the
+leader), so only those m - 1 pairs are tracked.
+
+VFT scores are linear in t, so every crossing has a closed form. TOPSIS
+scores are not; crossings are bracketed on a per-side grid in one batched
+pass and then refined by vectorized bisection, so the result is exact up
+to tol. A pair that crosses twice inside one grid cell can be missed;
+raise grid_points if curves are very wiggly.
+"""
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.ranking import Ranking
+from core.sensitivity import tornado_weights
+from core.topsis import Directions, topsis_batch_from_normalized
+
+MODES = ("ranking", "top1")
+
+
+def _normalized_base(base_weights: np.ndarray) -> np.ndarray:
+    base = np.asarray(base_weights, dtype=float)
+    total = base.sum()
+    return base / total if total > 0 else np.ones_like(base) / max(len(base), 1)
+
+
+def _tracked_pairs(base_scores: np.ndarray, mode: str) -> Tuple[np.ndarray, np.ndarray]:
+    """(ahead, behind) index arrays; score[ahead] >= score[behind] at the base weights."""
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of: {', '.join(MODES)}")
+    order = Ranking(base_scores).order
+    if mode == "ranking":
+        return order[:-1], order[1:]
+    return np.full(len(order) - 1, order[0]), order[1:]
+
+
+def _frame(
+    criterion_names: Sequence[str],
+    alternative_names: Sequence[str],
+    t0: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    lower_pair: np.ndarray,
+    upper_pair: np.ndarray,
+    ahead: np.ndarray,
+    behind: np.ndarray,
+) -> pd.DataFrame:
+    def swap(p: int) -> Optional[Tuple[str, str]]:
+        if p < 0:
+            return None
+        return alternative_names[ahead[p]], alternative_names[behind[p]]
+
+    return pd.DataFrame(
+        {
+            "criterion": list(criterion_names),
+            "base_weight": t0,
+            "lower": lower,
+            "upper": upper,
+            "lower_swap": [swap(int(p)) for p in lower_pair],
+            "upper_swap": [swap(int(p)) for p in upper_pair],
+        }
+    )
+
+
+def vft_stability_intervals(
+    utility: np.ndarray,
+    base_weights: np.ndarray,
+    alternative_names: Sequence[str],
+    criterion_names: Sequence[str],
+    mode: str = "ranking",
+) -> pd.DataFrame:
+    """
+    Closed-form stability intervals for VFT.
+
+    Along criterion j's path each total is s_i(t) = b_ij + t * (u_ij - b_ij),
+    where b_ij is alternative i's score with w_j = 0, so each tracked pair
+    crosses at most once, at t = t0 - d(t0) / slope.
+
+    Returns one row per criterion: base_weight, lower, upper, and the
+    (ahead, behind) pair that swaps at each bound (None when the bound is
+    the end of [0, 1]).
+    """
+    u = np.asarray(utility, dtype=float)
+    m, n = u.shape
+    w = _normalized_base(base_weights)
+    t0 = w.copy()
+    lower = np.zeros(n)
+    upper = np.ones(n)
+    lower_pair = np.full(n, -1)
+    upper_pair = np.full(n, -1)
+    if m < 2:
+        return _frame(criterion_names, alternative_names, t0, lower, upper, lower_pair, upper_pair,
+                      np.empty(0, int), np.empty(0, int))
+
+    ahead, behind = _tracked_pairs(u @ w, mode)
+    b = u @ tornado_weights(w)[:n].T     # (m, n): scores with w_j = 0
+    slope = u - b                          # d s_i / d t for criterion j
+    d_slope = slope[ahead] - slope[behind]                  # (P, n)
+    d0 = (b[ahead] - b[behind]) + t0[None, :] * d_slope     # (P, n), >= 0
+    d0 = np.maximum(d0, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = t0[None, :] - d0 / d_slope
+    up = np.where((d_slope < 0) & (root <= 1.0), root, np.inf)
+    down = np.where((d_slope > 0) & (root >= 0.0), root, -np.inf)
+
+    up_pair = up.argmin(axis=0)
+    down_pair = down.argmax(axis=0)
+    cols = np.arange(n)
+    has_up = np.isfinite(up[up_pair, cols])
+    has_down = np.isfinite(down[down_pair, cols])
+    upper = np.where(has_up, up[up_pair, cols], 1.0)
+    lower = np.where(has_down, down[down_pair, cols], 0.0)
+    upper_pair = np.where(has_up, up_pair, -1)
+    lower_pair = np.where(has_down, down_pair, -1)
+    return _frame(criterion_names, alternative_names, t0, lower, upper, lower_pair, upper_pair, ahead, behind)
+
+
+def topsis_stability_intervals(
+    normalized_matrix: np.ndarray,
+    directions: Directions,
+    base_weights: np.ndarray,
+    alternative_names: Sequence[str],
+    criterion_names: Sequence[str],
+    mode: str = "ranking",
+    grid_points: int = 64,
+    tol: float = 1e-10,
+    distance: str = "euclidean",
+    distance_p: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Stability intervals for TOPSIS by bracketing plus bisection.
+
+    grid_points: bracketing points on each side of the base weight
+    tol: width at which the bisection stops
+
+    Same columns as vft_stability_intervals.
+    """
+    r = np.asarray(normalized_matrix, dtype=float)
+    m, n = r.shape
+    w = _normalized_base(base_weights)
+    t0 = w.copy()
+    lower = np.zeros(n)
+    upper = np.ones(n)
+    lower_pair = np.full(n, -1)
+    upper_pair = np.full(n, -1)
+    if m < 2 or n < 2:
+        return _frame(criterion_names, alternative_names, t0, lower, upper, lower_pair, upper_pair,
+                      np.empty(0, int), np.empty(0, int))
+    if grid_points < 2:
+        raise ValueError("grid_points must be >= 2")
+
+    def score(t: np.ndarray, crit: np.ndarray) -> np.ndarray:
+        # (K,) path positions for criteria crit -> (K, m) closeness scores
+        weights = (1.0 - t)[:, None] * shares[crit] + t[:, None] * np.eye(n)[crit]
+        return topsis_batch_from_normalized(r, weights, directions, distance=distance, distance_p=distance_p).c_star
+
+    shares = tornado_weights(w)[:n]     # row j: other weights with w_j = 0, summing to 1
+    base_c = score(t0[:1], np.array([0]))[0]
+    ahead, behind = _tracked_pairs(base_c, mode)
+
+    steps = np.linspace(0.0, 1.0, grid_points)
+    crit_idx = np.repeat(np.arange(n), grid_points)
+    for side in ("upper", "lower"):
+        # Points walk outward from t0 to the end of [0, 1].
+        end = 1.0 if side == "upper" else 0.0
+        t = (t0[:, None] + (end - t0)[:, None] * steps[None, :]).ravel()
+        c = score(t, crit_idx).reshape(n, grid_points, m)
+        d = c[:, :, ahead] - c[:, :, behind]            # (n, G, P)
+        crossed = d[:, 1:, :] < 0                        # sign change between step k-1 and k
+        has = crossed.any(axis=1)                        # (n, P)
+        first = np.where(has, crossed.argmax(axis=1), grid_points)
+        k_min = first.min(axis=1)                        # first crossing cell per criterion
+
+        rows, pairs = np.nonzero(has & (first == k_min[:, None]))
+        if rows.size == 0:
+            continue
+        tt = t.reshape(n, grid_points)
+        ok = tt[rows, k_min[rows]]          # d >= 0 here
+        bad = tt[rows, k_min[rows] + 1]     # d < 0 here
+        while np.max(np.abs(bad - ok)) > tol:
+            mid = 0.5 * (ok + bad)
+            cm = score(mid, rows)
+            dm = cm[np.arange(len(rows)), ahead[pairs]] - cm[np.arange(len(rows)), behind[pairs]]
+            neg = dm < 0
+            bad = np.where(neg, mid, bad)
+            ok = np.where(neg, ok, mid)
+
+        root = 0.5 * (ok + bad)
+        dist = np.abs(root - t0[rows])
+        for j in np.unique(rows):
+            sel = np.flatnonzero(rows == j)
+            best = sel[np.argmin(dist[sel])]
+            if side == "upper":
+                upper[j], upper_pair[j] = root[best], pairs[best]
+            else:
+                lower[j], lower_pair[j] = root[best], pairs[best]
+
+    return _frame(criterion_names, alternative_names, t0, lower, upper, lower_pair, upper_pair, ahead, behind)
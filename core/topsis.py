@@ -1,9 +1,16 @@
 # core/topsis.py
 from dataclasses import dataclass
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple, Union
 
 import numpy as np
 
+from core.distance import distance_order, get_distance
+from core.normalization import get_normalization
+
+# Either the raw 'benefit'/'cost' strings or a mask from compile_directions().
+Directions = Union[Sequence[str], np.ndarray]
+
 
 @dataclass(frozen=True)
 class TopsisArtifacts:
@@ -14,17 +21,106 @@ class TopsisArtifacts:
     s_pos: np.ndarray              # S*
     s_neg: np.ndarray              # S-
     c_star: np.ndarray             # C*
+    normalization: str = "vector"
+    distance: str = "euclidean"
+    distance_p: Optional[float] = None  # Minkowski order, set only for 'minkowski'
+
+
+@dataclass(frozen=True)
+class CompactTopsisArtifacts:
+    """
+    Memory-lean TopsisArtifacts: the (m, n) input is kept once as float32 and
+    the normalized/weighted matrices are rebuilt from it on every access
+    instead of being stored. Ideals, distances and scores are small and kept
+    as computed. Hoist matrix accesses out of loops.
+    """
+    matrix: np.ndarray             # x_ij, float32
+    weights: np.ndarray            # w_j, float32
+    pis: np.ndarray                # A*
+    nis: np.ndarray                # A-
+    s_pos: np.ndarray              # S*
+    s_neg: np.ndarray              # S-
+    c_star: np.ndarray             # C*
+    normalization: str = "vector"
+    distance: str = "euclidean"
+    distance_p: Optional[float] = None
+
+    @property
+    def normalized_matrix(self) -> np.ndarray:
+        return get_normalization(self.normalization)(self.matrix)
+
+    @property
+    def weighted_matrix(self) -> np.ndarray:
+        return self.normalized_matrix * self.weights
+
+
+@dataclass(frozen=True)
+class TopsisBatchArtifacts:
+    normalized_matrix: np.ndarray            # r_ij, shape (m, n), shared by every batch row
+    weighted_matrix: Optional[np.ndarray]    # v_kij, shape (k, m, n), only kept on request
+    pis: np.ndarray                          # A*, shape (k, n)
+    nis: np.ndarray                          # A-, shape (k, n)
+    s_pos: np.ndarray                        # S*, shape (k, m)
+    s_neg: np.ndarray                        # S-, shape (k, m)
+    c_star: np.ndarray                       # C*, shape (k, m)
+
+
+@lru_cache(maxsize=256)
+def _compile_direction_tuple(directions: Tuple[str, ...]) -> np.ndarray:
+    mask = np.empty(len(directions), dtype=bool)
+    for j, d in enumerate(directions):
+        if d == "benefit":
+            mask[j] = True
+        elif d == "cost":
+            mask[j] = False
+        else:
+            raise ValueError("direction must be 'benefit' or 'cost'")
+    mask.setflags(write=False)
+    return mask
+
+
+def compile_directions(directions: Directions) -> np.ndarray:
+    """
+    Turn 'benefit'/'cost' strings into a read-only boolean benefit mask.
+
+    Masks are cached by direction tuple, so repeated runs on the same scenario
+    validate the strings once. A boolean array is passed through unchanged.
+    """
+    if isinstance(directions, np.ndarray) and directions.dtype == bool:
+        return directions
+    return _compile_direction_tuple(tuple(directions))
+
+
+def ideal_solutions(weighted_matrix: np.ndarray, benefit_mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    PIS/NIS for a weighted matrix of shape (..., m, n).
+
+    Reduces over the alternatives axis once for max and once for min, then
+    picks per criterion with the benefit mask.
+    """
+    col_max = weighted_matrix.max(axis=-2)
+    col_min = weighted_matrix.min(axis=-2)
+    pis = np.where(benefit_mask, col_max, col_min)
+    nis = np.where(benefit_mask, col_min, col_max)
+    return pis, nis
 
 
 def compute_topsis(
     matrix: np.ndarray,
     weights: np.ndarray,
-    directions: List[str],
-) -> TopsisArtifacts:
+    directions: Directions,
+    normalization: str = "vector",
+    distance: str = "euclidean",
+    distance_p: Optional[float] = None,
+    compact: bool = False,
+) -> Union[TopsisArtifacts, CompactTopsisArtifacts]:
     """
     matrix: shape (m, n)
     weights: shape (n,) must sum to 1 (or will behave as weighted scaling)
-    directions: list of 'benefit' or 'cost', length n
+    directions: list of 'benefit' or 'cost', length n, or a compiled benefit mask
+    normalization: key of core.normalization.NORMALIZATIONS
+    distance: one of core.distance.DISTANCES; 'minkowski' also needs distance_p
+    compact: return CompactTopsisArtifacts (float32, lazy matrices)
     """
     if matrix.ndim != 2:
         raise ValueError("matrix must be 2D")
@@ -33,29 +129,33 @@ def compute_topsis(
         raise ValueError("weights must have shape (n,)")
     if len(directions) != n:
         raise ValueError("directions length must match number of criteria")
+    benefit = compile_directions(directions)
+    normalize = get_normalization(normalization)
+    separation = get_distance(distance, distance_p)
 
-    denom = np.sqrt((matrix ** 2).sum(axis=0))
-    denom = np.where(denom == 0, 1.0, denom)
-    r = matrix / denom
+    r = normalize(matrix)
 
     v = r * weights
 
-    pis = np.zeros(n, dtype=float)
-    nis = np.zeros(n, dtype=float)
-    for j, d in enumerate(directions):
-        col = v[:, j]
-        if d == "benefit":
-            pis[j] = np.max(col)
-            nis[j] = np.min(col)
-        elif d == "cost":
-            pis[j] = np.min(col)
-            nis[j] = np.max(col)
-        else:
-            raise ValueError("direction must be 'benefit' or 'cost'")
+    pis, nis = ideal_solutions(v, benefit)
 
-    s_pos = np.sqrt(((v - pis) ** 2).sum(axis=1))
-    s_neg = np.sqrt(((v - nis) ** 2).sum(axis=1))
+    s_pos, s_neg = separation(v, pis, nis)
     c_star = s_neg / (s_pos + s_neg + 1e-12)
+    distance_p = float(distance_p) if distance == "minkowski" else None
+
+    if compact:
+        return CompactTopsisArtifacts(
+            matrix=matrix.astype(np.float32),
+            weights=weights.astype(np.float32),
+            pis=pis,
+            nis=nis,
+            s_pos=s_pos,
+            s_neg=s_neg,
+            c_star=c_star,
+            normalization=normalization,
+            distance=distance,
+            distance_p=distance_p,
+        )
 
     return TopsisArtifacts(
         normalized_matrix=r,
@@ -65,4 +165,106 @@ def compute_topsis(
         s_pos=s_pos,
         s_neg=s_neg,
         c_star=c_star,
+        normalization=normalization,
+        distance=distance,
+        distance_p=distance_p,
+    )
+
+
+def compute_topsis_batch(
+    matrix: np.ndarray,
+    weights_2d: np.ndarray,
+    directions: Directions,
+    keep_weighted: bool = False,
+    normalization: str = "vector",
+    distance: str = "euclidean",
+    distance_p: Optional[float] = None,
+) -> TopsisBatchArtifacts:
+    """
+    Score k weight vectors against the same decision matrix in one pass.
+
+    matrix: shape (m, n)
+    weights_2d: shape (k, n), one weight vector per row
+    directions: list of 'benefit' or 'cost', length n, or a compiled benefit mask
+    keep_weighted: also return the (k, m, n) weighted matrices
+    normalization, distance, distance_p: as for compute_topsis
+
+    Row b of every output equals compute_topsis(matrix, weights_2d[b], directions).
+    Normalization and column extrema are computed once; for finite Minkowski
+    orders the separation measures come from two matrix products instead of
+    a (k, m, n) temporary. Chebyshev needs the broadcast max.
+    """
+    if matrix.ndim != 2:
+        raise ValueError("matrix must be 2D")
+    get_distance(distance, distance_p)  # validate before normalizing
+    r = get_normalization(normalization)(matrix)
+    return topsis_batch_from_normalized(
+        r, weights_2d, directions, keep_weighted=keep_weighted, distance=distance, distance_p=distance_p
+    )
+
+
+def topsis_batch_from_normalized(
+    normalized_matrix: np.ndarray,
+    weights_2d: np.ndarray,
+    directions: Directions,
+    keep_weighted: bool = False,
+    distance: str = "euclidean",
+    distance_p: Optional[float] = None,
+) -> TopsisBatchArtifacts:
+    """
+    compute_topsis_batch for an already normalized (m, n) matrix, e.g. one
+    loaded from a persisted run.
+    """
+    r = normalized_matrix
+    if r.ndim != 2:
+        raise ValueError("matrix must be 2D")
+    m, n = r.shape
+    if weights_2d.ndim != 2 or weights_2d.shape[1] != n:
+        raise ValueError("weights_2d must have shape (k, n)")
+    if len(directions) != n:
+        raise ValueError("directions length must match number of criteria")
+    benefit = compile_directions(directions)
+    order = distance_order(distance, distance_p)
+
+    w = weights_2d.astype(float, copy=False)
+    r_max = r.max(axis=0)
+    r_min = r.min(axis=0)
+
+    # max_i(w * r_ij) is w * max(r) for w >= 0 and w * min(r) otherwise, so the
+    # ideals are fixed per (batch, criterion) by the sign of the weight alone.
+    pis_at_max = (w >= 0) == benefit
+    pis = np.where(pis_at_max, w * r_max, w * r_min)
+    nis = np.where(pis_at_max, w * r_min, w * r_max)
+
+    # |v_ij - pis_j| = |w_j| * |r_ij - r*_j| with r* either the column max or min.
+    w_abs = np.abs(w)
+    dev_max = np.abs(r - r_max)  # (m, n)
+    dev_min = np.abs(r - r_min)
+    if np.isinf(order):
+        at_max = pis_at_max[:, None, :]
+        scaled_max = w_abs[:, None, :] * dev_max
+        scaled_min = w_abs[:, None, :] * dev_min
+        s_pos = np.where(at_max, scaled_max, scaled_min).max(axis=2)
+        s_neg = np.where(at_max, scaled_min, scaled_max).max(axis=2)
+    else:
+        d_max = (dev_max ** order).T  # (n, m)
+        d_min = (dev_min ** order).T
+        w_p = w_abs ** order
+        w_p_max = np.where(pis_at_max, w_p, 0.0)
+        w_p_min = w_p - w_p_max
+        s_pos = np.maximum(w_p_max @ d_max + w_p_min @ d_min, 0.0)
+        s_neg = np.maximum(w_p_max @ d_min + w_p_min @ d_max, 0.0)
+        if order != 1.0:
+            s_pos = s_pos ** (1.0 / order)
+            s_neg = s_neg ** (1.0 / order)
+    c_star = s_neg / (s_pos + s_neg + 1e-12)
+
+    return TopsisBatchArtifacts(
+        normalized_matrix=r,
+        weighted_matrix=r[None, :, :] * w[:, None, :] if keep_weighted else None,
+        pis=pis,
+        nis=nis,
+        s_pos=s_pos,
+        s_neg=s_neg,
+        c_star=c_star,
     )
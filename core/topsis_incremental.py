@@ -0,0 +1,228 @@
+# core/topsis_incremental.py
+"""
+Incremental TOPSIS for what-if editing.
+
+IncrementalTopsis keeps the normalized and weighted matrices, the ideal
+solutions and the per-alternative distance accumulators sum_j |v_ij - A*_j|^p
+between edits. Every supported normalization works column by column, so
+changing one measurement or one weight only touches that criterion's column:
+its old contribution is subtracted from the accumulators, the column is
+rebuilt, and the new contribution is added back, all in O(m).
+"""
+from __future__ import annotations
+
+from typing import Optional, Sequence
+
+import numpy as np
+
+from core.distance import distance_order
+from core.normalization import get_normalization
+from core.topsis import Directions, TopsisArtifacts, compile_directions
+
+# Accumulators drift slightly under repeated subtract/add; rebuild them from
+# scratch after this many column updates.
+_REFRESH_EVERY = 512
+
+
+class IncrementalTopsis:
+    """
+    TOPSIS state that can be updated one cell or one weight at a time.
+
+    matrix: raw (m, n) decision matrix, or None when built with from_normalized()
+    weights: (n,) weights, used as given unless normalize_weights is set
+    directions: list of 'benefit' or 'cost', length n, or a compiled benefit mask
+    normalization, distance, distance_p: as for compute_topsis; the distance
+        must have a finite Minkowski order (Chebyshev is not supported)
+    normalize_weights: report results as if weights were divided by their sum.
+        C* is scale invariant, so the raw weights can be edited one at a time
+        while outputs match compute_topsis on the normalized vector.
+    """
+
+    def __init__(
+        self,
+        matrix: Optional[np.ndarray],
+        weights: np.ndarray,
+        directions: Directions,
+        normalization: str = "vector",
+        distance: str = "euclidean",
+        distance_p: Optional[float] = None,
+        normalize_weights: bool = False,
+        _normalized: Optional[np.ndarray] = None,
+    ):
+        order = distance_order(distance, distance_p)
+        if np.isinf(order):
+            raise ValueError("incremental TOPSIS requires a finite distance order")
+        self._order = order
+        self._normalize = get_normalization(normalization)
+        self.normalization = normalization
+        self.distance = distance
+        self.distance_p = float(distance_p) if distance == "minkowski" else None
+        self.normalize_weights = normalize_weights
+
+        if _normalized is not None:
+            self._x = None
+            self._r = np.array(_normalized, dtype=float)
+        else:
+            if matrix is None or matrix.ndim != 2:
+                raise ValueError("matrix must be 2D")
+            self._x = np.array(matrix, dtype=float)
+            self._r = self._normalize(self._x)
+        m, n = self._r.shape
+        w = np.array(weights, dtype=float)
+        if w.shape != (n,):
+            raise ValueError("weights must have shape (n,)")
+        if len(directions) != n:
+            raise ValueError("directions length must match number of criteria")
+        self._benefit = compile_directions(directions)
+        self._w = w
+        self.refresh()
+
+    @classmethod
+    def from_normalized(
+        cls,
+        normalized_matrix: np.ndarray,
+        weights: np.ndarray,
+        directions: Directions,
+        distance: str = "euclidean",
+        distance_p: Optional[float] = None,
+        normalize_weights: bool = False,
+        normalization: str = "vector",
+    ) -> "IncrementalTopsis":
+        """
+        Build from an already normalized matrix (e.g. a persisted run).
+        Weight updates work as usual; cell updates need the raw matrix.
+        """
+        if normalized_matrix.ndim != 2:
+            raise ValueError("matrix must be 2D")
+        return cls(
+            None,
+            weights,
+            directions,
+            normalization=normalization,
+            distance=distance,
+            distance_p=distance_p,
+            normalize_weights=normalize_weights,
+            _normalized=normalized_matrix,
+        )
+
+    # ------------------------------------------------------------------
+    # State maintenance
+    # ------------------------------------------------------------------
+    def refresh(self) -> None:
+        """Recompute weighted matrix, ideals and accumulators from scratch (O(m*n))."""
+        p = self._order
+        self._v = self._r * self._w
+        col_max = self._v.max(axis=0)
+        col_min = self._v.min(axis=0)
+        self._pis = np.where(self._benefit, col_max, col_min)
+        self._nis = np.where(self._benefit, col_min, col_max)
+        self._acc_pos = (np.abs(self._v - self._pis) ** p).sum(axis=1)
+        self._acc_neg = (np.abs(self._v - self._nis) ** p).sum(axis=1)
+        self._updates = 0
+
+    def _replace_column(self, j: int, r_col: Optional[np.ndarray] = None, w_j: Optional[float] = None) -> None:
+        p = self._order
+        v_col = self._v[:, j]
+        self._acc_pos -= np.abs(v_col - self._pis[j]) ** p
+        self._acc_neg -= np.abs(v_col - self._nis[j]) ** p
+
+        if r_col is not None:
+            self._r[:, j] = r_col
+        if w_j is not None:
+            self._w[j] = w_j
+        v_col = self._r[:, j] * self._w[j]
+        self._v[:, j] = v_col
+
+        hi, lo = v_col.max(), v_col.min()
+        self._pis[j], self._nis[j] = (hi, lo) if self._benefit[j] else (lo, hi)
+        self._acc_pos += np.abs(v_col - self._pis[j]) ** p
+        self._acc_neg += np.abs(v_col - self._nis[j]) ** p
+
+        self._updates += 1
+        if self._updates >= _REFRESH_EVERY:
+            self.refresh()
+
+    def set_weight(self, j: int, weight: float) -> None:
+        """Change the weight of criterion j in O(m)."""
+        self._replace_column(j, w_j=float(weight))
+
+    def set_weights(self, weights: Sequence[float]) -> None:
+        """Apply a full weight vector, updating only the criteria that changed."""
+        w = np.asarray(weights, dtype=float)
+        if w.shape != self._w.shape:
+            raise ValueError("weights must have shape (n,)")
+        changed = np.flatnonzero(w != self._w)
+        if len(changed) * 2 > len(w):
+            self._w = w.copy()
+            self.refresh()
+            return
+        for j in changed:
+            self._replace_column(int(j), w_j=float(w[j]))
+
+    def set_value(self, i: int, j: int, value: float) -> None:
+        """Change measurement (i, j) in O(m); only column j is renormalized."""
+        if self._x is None:
+            raise ValueError("cell updates need the raw matrix; build with IncrementalTopsis(matrix, ...)")
+        col = self._x[:, j].copy()
+        col[i] = float(value)
+        r_col = self._normalize(col[:, None])[:, 0]
+        self._x[:, j] = col
+        self._replace_column(j, r_col=r_col)
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+    def _scale(self) -> float:
+        if not self.normalize_weights:
+            return 1.0
+        total = float(self._w.sum())
+        return 1.0 / total if total > 0 else 1.0
+
+    @property
+    def weights(self) -> np.ndarray:
+        return self._w * self._scale()
+
+    @property
+    def normalized_matrix(self) -> np.ndarray:
+        return self._r.copy()
+
+    @property
+    def weighted_matrix(self) -> np.ndarray:
+        return self._v * self._scale()
+
+    @property
+    def pis(self) -> np.ndarray:
+        return self._pis * self._scale()
+
+    @property
+    def nis(self) -> np.ndarray:
+        return self._nis * self._scale()
+
+    @property
+    def s_pos(self) -> np.ndarray:
+        return np.maximum(self._acc_pos, 0.0) ** (1.0 / self._order) * self._scale()
+
+    @property
+    def s_neg(self) -> np.ndarray:
+        return np.maximum(self._acc_neg, 0.0) ** (1.0 / self._order) * self._scale()
+
+    @property
+    def c_star(self) -> np.ndarray:
+        s_pos, s_neg = self.s_pos, self.s_neg
+        return s_neg / (s_pos + s_neg + 1e-12)
+
+    def artifacts(self) -> TopsisArtifacts:
+        """Snapshot of the current state in the same shape compute_topsis returns."""
+        s_pos, s_neg = self.s_pos, self.s_neg
+        return TopsisArtifacts(
+            normalized_matrix=self.normalized_matrix,
+            weighted_matrix=self.weighted_matrix,
+            pis=self.pis,
+            nis=self.nis,
+            s_pos=s_pos,
+            s_neg=s_neg,
+            c_star=s_neg / (s_pos + s_neg + 1e-12),
+            normalization=self.normalization,
+            distance=self.distance,
+            distance_p=self.distance_p,
+        )
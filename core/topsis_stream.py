@@ -0,0 +1,225 @@
+# core/topsis_stream.py
+"""
+Out-of-core TOPSIS for very large alternative sets.
+
+Two passes over row chunks of the decision matrix:
+  1. accumulate the per-column statistics the chosen normalization needs
+     (sums, sums of squares, extrema), which also fix the ideal solutions,
+     because every normalization is monotone within a column;
+  2. normalize, weight and score each chunk, keeping only a running top-k.
+
+Peak memory is a few chunk-sized arrays plus O(n + k), independent of m.
+The source is a path to a .npy file (opened memory-mapped), an array or
+memmap, or a zero-argument callable returning a fresh iterator of (rows, n)
+chunks, since the data has to be read twice.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from core.distance import get_distance
+from core.normalization import NORMALIZATIONS
+from core.topsis import Directions, compile_directions
+
+ChunkSource = Union[str, os.PathLike, np.ndarray, Callable[[], Iterable[np.ndarray]]]
+
+
+@dataclass(frozen=True)
+class StreamingTopsisResult:
+    m: int                     # number of alternatives scored
+    pis: np.ndarray            # A*, shape (n,)
+    nis: np.ndarray            # A-, shape (n,)
+    top_indices: np.ndarray    # row indices of the best k alternatives, best first
+    top_scores: np.ndarray     # their C* scores
+
+
+def _iter_chunks(source: ChunkSource, chunk_rows: int) -> Iterator[np.ndarray]:
+    if isinstance(source, (str, os.PathLike)):
+        source = np.load(source, mmap_mode="r")
+    if isinstance(source, np.ndarray):
+        if source.ndim != 2:
+            raise ValueError("matrix must be 2D")
+        for start in range(0, source.shape[0], chunk_rows):
+            yield np.asarray(source[start:start + chunk_rows], dtype=float)
+        return
+    if not callable(source):
+        raise ValueError("chunk source must be a .npy path, an array, or a callable returning chunks")
+    for chunk in source():
+        chunk = np.asarray(chunk, dtype=float)
+        if chunk.ndim != 2:
+            raise ValueError("chunks must be 2D")
+        yield chunk
+
+
+def _column_stats(source: ChunkSource, chunk_rows: int, n: int, normalization: str) -> Tuple[int, dict]:
+    m = 0
+    col_min = np.full(n, np.inf)
+    col_max = np.full(n, -np.inf)
+    acc = np.zeros(n)
+    for chunk in _iter_chunks(source, chunk_rows):
+        if chunk.shape[1] != n:
+            raise ValueError("every chunk must have one column per weight")
+        if chunk.shape[0] == 0:
+            continue
+        m += chunk.shape[0]
+        np.minimum(col_min, chunk.min(axis=0), out=col_min)
+        np.maximum(col_max, chunk.max(axis=0), out=col_max)
+        if normalization == "vector":
+            acc += (chunk ** 2).sum(axis=0)
+        elif normalization == "sum":
+            acc += chunk.sum(axis=0)
+        elif normalization == "logarithmic":
+            if (chunk <= 0).any():
+                raise ValueError("logarithmic normalization requires strictly positive values")
+            acc += np.log(chunk).sum(axis=0)
+    if m == 0:
+        raise ValueError("matrix has no rows")
+    return m, {"min": col_min, "max": col_max, "acc": acc}
+
+
+def _column_normalizer(stats: dict, normalization: str) -> Callable[[np.ndarray], np.ndarray]:
+    """Chunk-wise equivalent of core.normalization, given whole-column statistics."""
+    col_min, col_max, acc = stats["min"], stats["max"], stats["acc"]
+    if normalization == "vector":
+        denom = np.sqrt(acc)
+        denom = np.where(denom == 0, 1.0, denom)
+        return lambda x: x / denom
+    if normalization == "minmax":
+        rng = np.where((col_max - col_min) == 0, 1.0, col_max - col_min)
+        return lambda x: (x - col_min) / rng
+    if normalization == "sum":
+        col_sum = np.where(acc == 0, 1.0, acc)
+        return lambda x: x / col_sum
+    if normalization == "max":
+        abs_max = np.maximum(np.abs(col_min), np.abs(col_max))
+        abs_max = np.where(abs_max == 0, 1.0, abs_max)
+        return lambda x: x / abs_max
+    if normalization == "logarithmic":
+        log_sum = np.where(acc == 0, 1.0, acc)
+        return lambda x: np.log(x) / log_sum
+    raise ValueError(
+        f"unknown normalization '{normalization}' (expected one of: {', '.join(NORMALIZATIONS)})"
+    )
+
+
+def _merge_top_k(
+    best_idx: np.ndarray, best_scores: np.ndarray, idx: np.ndarray, scores: np.ndarray, k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    all_idx = np.concatenate([best_idx, idx])
+    all_scores = np.concatenate([best_scores, scores])
+    if len(all_scores) > k:
+        keep = np.argpartition(-all_scores, k - 1)[:k]
+        all_idx, all_scores = all_idx[keep], all_scores[keep]
+    return all_idx, all_scores
+
+
+def iter_topsis_scores(
+    source: ChunkSource,
+    weights: np.ndarray,
+    directions: Directions,
+    normalization: str = "vector",
+    distance: str = "euclidean",
+    distance_p: Optional[float] = None,
+    chunk_rows: int = 65536,
+) -> Tuple[StreamingTopsisResult, Iterator[Tuple[int, np.ndarray]]]:
+    """
+    Run the statistics pass and return (result without top-k, score iterator).
+
+    The iterator yields (row_offset, c_star_chunk) for the second pass, so
+    callers can write scores to a memmap or a database as they arrive.
+    """
+    weights = np.asarray(weights, dtype=float)
+    if weights.ndim != 1:
+        raise ValueError("weights must have shape (n,)")
+    n = weights.shape[0]
+    if len(directions) != n:
+        raise ValueError("directions length must match number of criteria")
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1")
+    benefit = compile_directions(directions)
+    separation = get_distance(distance, distance_p)
+
+    m, stats = _column_stats(source, chunk_rows, n, normalization)
+    normalize = _column_normalizer(stats, normalization)
+
+    # Normalization is monotone per column, so weighted extrema come from the raw extrema.
+    v_a = normalize(stats["max"][None, :])[0] * weights
+    v_b = normalize(stats["min"][None, :])[0] * weights
+    col_max = np.maximum(v_a, v_b)
+    col_min = np.minimum(v_a, v_b)
+    pis = np.where(benefit, col_max, col_min)
+    nis = np.where(benefit, col_min, col_max)
+
+    def scores() -> Iterator[Tuple[int, np.ndarray]]:
+        # A callable source is re-invoked here; it must replay the same rows.
+        offset = 0
+        for chunk in _iter_chunks(source, chunk_rows):
+            if chunk.shape[1] != n:
+                raise ValueError("every chunk must have one column per weight")
+            if chunk.shape[0] == 0:
+                continue
+            if offset + chunk.shape[0] > m:
+                raise ValueError(f"chunk source yielded more than the {m} rows of the first pass")
+            v = normalize(chunk) * weights
+            s_pos, s_neg = separation(v, pis, nis)
+            yield offset, s_neg / (s_pos + s_neg + 1e-12)
+            offset += chunk.shape[0]
+        if offset != m:
+            raise ValueError(f"chunk source yielded {offset} rows on the second pass, expected {m}")
+
+    head = StreamingTopsisResult(
+        m=m, pis=pis, nis=nis, top_indices=np.empty(0, dtype=np.int64), top_scores=np.empty(0)
+    )
+    return head, scores()
+
+
+def compute_topsis_streaming(
+    source: ChunkSource,
+    weights: np.ndarray,
+    directions: Directions,
+    top_k: int = 10,
+    normalization: str = "vector",
+    distance: str = "euclidean",
+    distance_p: Optional[float] = None,
+    chunk_rows: int = 65536,
+    scores_out: Optional[np.ndarray] = None,
+) -> StreamingTopsisResult:
+    """
+    Two-pass chunked TOPSIS returning the best top_k alternatives.
+
+    source: .npy path, (m, n) array/memmap, or callable returning row chunks
+    weights, directions, normalization, distance, distance_p: as for compute_topsis
+    scores_out: optional (m,) array (e.g. np.lib.format.open_memmap) that
+        receives every C* score
+
+    Scores match compute_topsis on the full matrix. The running top-k is
+    merged per chunk with np.argpartition rather than a per-row heap.
+    """
+    if top_k < 1:
+        raise ValueError("top_k must be >= 1")
+    head, scores = iter_topsis_scores(
+        source, weights, directions, normalization, distance, distance_p, chunk_rows
+    )
+    if scores_out is not None and scores_out.shape != (head.m,):
+        raise ValueError("scores_out must have shape (m,)")
+
+    best_idx = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0)
+    for offset, c_star in scores:
+        if scores_out is not None:
+            scores_out[offset:offset + len(c_star)] = c_star
+        idx = np.arange(offset, offset + len(c_star), dtype=np.int64)
+        best_idx, best_scores = _merge_top_k(best_idx, best_scores, idx, c_star, top_k)
+
+    order = np.lexsort((best_idx, -best_scores))
+    return StreamingTopsisResult(
+        m=head.m,
+        pis=head.pis,
+        nis=head.nis,
+        top_indices=best_idx[order],
+        top_scores=best_scores[order],
+    )
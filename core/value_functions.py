@@ -0,0 +1,248 @@
+# core/value_functions.py
+"""
+Compiled single-attribute value functions for VFT.
+
+Each function is immutable: its parameters and breakpoint arrays are fixed
+at construction (breakpoints sorted once, stored contiguous and read-only),
+and __call__ accepts a scalar or an ndarray. Attribute.value_function caches
+one instance and rebuilds it only when the attribute's scaling changes, so
+scoring, previews and sensitivity sweeps all share the same compiled object.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _frozen(values) -> np.ndarray:
+    arr = np.ascontiguousarray(values, dtype=float)
+    arr.setflags(write=False)
+    return arr
+
+
+class ValueFunction(ABC):
+    """Base class: maps raw scores to values in [0, 1]."""
+
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def _set(self, name, value) -> None:
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        return {
+            name: getattr(self, name)
+            for cls in type(self).__mro__
+            for name in getattr(cls, "__slots__", ())
+        }
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+    @abstractmethod
+    def __call__(self, x):
+        """Value of a scalar or ndarray of raw scores."""
+
+
+class ConstantValueFunction(ValueFunction):
+    """Same value everywhere; used for missing or degenerate definitions."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: float = 0.0):
+        self._set("value", float(value))
+
+    def __call__(self, x):
+        if np.ndim(x) == 0:
+            return self.value
+        return np.full(np.shape(x), self.value)
+
+
+class LinearValueFunction(ValueFunction):
+    """Straight line from min_val to max_val, clamped to [0, 1]."""
+
+    __slots__ = ("min_val", "max_val", "increasing")
+
+    def __init__(self, min_val: float, max_val: float, increasing: bool = True):
+        if max_val == min_val:
+            raise ValueError("linear value function needs min_val != max_val")
+        self._set("min_val", float(min_val))
+        self._set("max_val", float(max_val))
+        self._set("increasing", bool(increasing))
+
+    def __call__(self, x):
+        span = self.max_val - self.min_val
+        if self.increasing:
+            val = (np.asarray(x, dtype=float) - self.min_val) / span
+        else:
+            val = (self.max_val - np.asarray(x, dtype=float)) / span
+        out = np.clip(val, 0.0, 1.0)
+        return float(out) if out.ndim == 0 else out
+
+
+class PiecewiseLinearValueFunction(ValueFunction):
+    """Linear interpolation between (x, y) breakpoints, flat outside them."""
+
+    __slots__ = ("xs", "ys")
+
+    def __init__(self, points: Iterable[Tuple[float, float]]):
+        pts = np.asarray(list(points), dtype=float).reshape(-1, 2)
+        if len(pts) == 0:
+            raise ValueError("piecewise linear value function needs at least one point")
+        order = np.argsort(pts[:, 0], kind="stable")
+        self._set("xs", _frozen(pts[order, 0]))
+        self._set("ys", _frozen(pts[order, 1]))
+
+    @property
+    def points(self) -> list:
+        return list(zip(self.xs.tolist(), self.ys.tolist()))
+
+    def __call__(self, x):
+        out = np.interp(x, self.xs, self.ys)
+        return float(out) if np.ndim(out) == 0 else out
+
+
+class ExponentialValueFunction(ValueFunction):
+    """
+    Exponential value function on [min_val, max_val] with risk parameter rho:
+    v(x) = (1 - exp(-(x - min_val) / rho)) / (1 - exp(-(max_val - min_val) / rho))
+    for increasing preference (mirrored for decreasing). Large |rho| tends to
+    linear; inputs are clamped to the range.
+    """
+
+    __slots__ = ("min_val", "max_val", "rho", "increasing")
+
+    def __init__(self, min_val: float, max_val: float, rho: float, increasing: bool = True):
+        if max_val <= min_val:
+            raise ValueError("exponential value function needs min_val < max_val")
+        if rho == 0 or not np.isfinite(rho):
+            raise ValueError("exponential value function needs a finite, non-zero rho")
+        self._set("min_val", float(min_val))
+        self._set("max_val", float(max_val))
+        self._set("rho", float(rho))
+        self._set("increasing", bool(increasing))
+
+    def __call__(self, x):
+        x = np.clip(np.asarray(x, dtype=float), self.min_val, self.max_val)
+        dist = x - self.min_val if self.increasing else self.max_val - x
+        span = self.max_val - self.min_val
+        out = np.expm1(-dist / self.rho) / np.expm1(-span / self.rho)
+        return float(out) if out.ndim == 0 else out
+
+
+class SCurveValueFunction(ValueFunction):
+    """
+    Logistic S-curve on [min_val, max_val] centred at midpoint, rescaled so the
+    range ends map exactly to 0 and 1. steepness is per unit of x.
+    """
+
+    __slots__ = ("min_val", "max_val", "midpoint", "steepness", "increasing", "_lo", "_hi")
+
+    def __init__(
+        self,
+        min_val: float,
+        max_val: float,
+        midpoint: Optional[float] = None,
+        steepness: float = 1.0,
+        increasing: bool = True,
+    ):
+        if max_val <= min_val:
+            raise ValueError("S-curve value function needs min_val < max_val")
+        if steepness <= 0:
+            raise ValueError("S-curve value function needs steepness > 0")
+        mid = (min_val + max_val) / 2.0 if midpoint is None else float(midpoint)
+        self._set("min_val", float(min_val))
+        self._set("max_val", float(max_val))
+        self._set("midpoint", mid)
+        self._set("steepness", float(steepness))
+        self._set("increasing", bool(increasing))
+        self._set("_lo", self._logistic(self.min_val))
+        self._set("_hi", self._logistic(self.max_val))
+
+    def _logistic(self, x):
+        return 1.0 / (1.0 + np.exp(-self.steepness * (x - self.midpoint)))
+
+    def __call__(self, x):
+        x = np.clip(np.asarray(x, dtype=float), self.min_val, self.max_val)
+        out = (self._logistic(x) - self._lo) / (self._hi - self._lo)
+        if not self.increasing:
+            out = 1.0 - out
+        return float(out) if out.ndim == 0 else out
+
+
+ZERO = ConstantValueFunction(0.0)
+
+# Attribute.scaling_type -> value_functions.function_type
+FUNCTION_TYPES = {
+    "Linear": "linear",
+    "Custom": "piecewise_linear",
+    "Exponential": "exponential",
+    "S-Curve": "s_curve",
+}
+SCALING_TYPES = {ft: st for st, ft in FUNCTION_TYPES.items()}
+
+# Breakpoints stored for exponential / S-curve functions, so readers that
+# only know points (sensitivity views, exports) see the same curve.
+CURVE_POINTS = 101
+
+
+@lru_cache(maxsize=1024)
+def _piecewise_cached(points: Tuple[Tuple[float, float], ...]) -> PiecewiseLinearValueFunction:
+    return PiecewiseLinearValueFunction(points)
+
+
+def piecewise_from_points(points: Sequence[Tuple[float, float]]) -> ValueFunction:
+    """Shared compiled function for a list of (x, y) points (0 when empty)."""
+    if not points:
+        return ZERO
+    return _piecewise_cached(tuple((float(x), float(y)) for x, y in points))
+
+
+def compile_value_function(
+    scaling_type: str,
+    min_val: float,
+    max_val: float,
+    scaling_direction: str = "Increasing",
+    custom_points: Optional[Sequence[Tuple[float, float]]] = None,
+    rho: Optional[float] = None,
+    midpoint: Optional[float] = None,
+    steepness: Optional[float] = None,
+) -> ValueFunction:
+    """
+    Compiled equivalent of an Attribute's scaling settings.
+
+    rho (Exponential) defaults to half the range; steepness (S-Curve)
+    defaults to 10 / range, so the curve spans the range whatever its units.
+    """
+    increasing = scaling_direction == "Increasing"
+    if scaling_type == "Linear":
+        if max_val == min_val:
+            return ZERO
+        return LinearValueFunction(min_val, max_val, increasing=increasing)
+    if scaling_type == "Custom":
+        return piecewise_from_points(custom_points or [])
+    if scaling_type == "Exponential":
+        if max_val <= min_val:
+            return ZERO
+        rho = (max_val - min_val) / 2.0 if rho is None else rho
+        return ExponentialValueFunction(min_val, max_val, rho, increasing=increasing)
+    if scaling_type == "S-Curve":
+        if max_val <= min_val:
+            return ZERO
+        steepness = 10.0 / (max_val - min_val) if steepness is None else steepness
+        return SCurveValueFunction(min_val, max_val, midpoint, steepness, increasing=increasing)
+    return ZERO
+
+
+def curve_points(
+    value_function: ValueFunction, min_val: float, max_val: float, count: int = CURVE_POINTS
+) -> list:
+    """(x, y) samples of value_function at count evenly spaced raw values."""
+    xs = np.linspace(float(min_val), float(max_val), count)
+    return list(zip(xs.tolist(), np.asarray(value_function(xs), dtype=float).tolist()))
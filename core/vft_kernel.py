@@ -0,0 +1,58 @@
+# core/vft_kernel.py
+"""
+Vectorized VFT scoring.
+
+Each attribute's compiled value function (see core.value_functions) is
+applied to a whole column of the (m, n) raw matrix at once, so scoring costs
+n vectorized calls instead of m * n Python-level evaluations.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Sequence
+
+import numpy as np
+
+from core.value_functions import ValueFunction
+
+if TYPE_CHECKING:
+    from core.vft_model import Attribute
+
+
+@dataclass(frozen=True)
+class VFTScores:
+    utility: np.ndarray    # u_ij in [0, 1], shape (m, n)
+    weighted: np.ndarray   # w_j * u_ij, shape (m, n)
+    total: np.ndarray      # sum_j w_j * u_ij, shape (m,)
+
+
+def utility_matrix(matrix: np.ndarray, value_functions: Sequence[Optional[ValueFunction]]) -> np.ndarray:
+    """Apply one compiled value function per column of an (m, n) raw matrix."""
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.ndim != 2:
+        raise ValueError("matrix must be 2D")
+    if len(value_functions) != matrix.shape[1]:
+        raise ValueError("one value function is required per criterion")
+    utility = np.zeros_like(matrix)
+    for j, vf in enumerate(value_functions):
+        if vf is not None:
+            utility[:, j] = vf(matrix[:, j])
+    return utility
+
+
+def score_vft(
+    matrix: np.ndarray,
+    attributes: Sequence[Optional[Attribute]],
+    weights: np.ndarray,
+) -> VFTScores:
+    """
+    matrix: raw scores, shape (m, n)
+    attributes: one Attribute (or None for a zero column) per criterion
+    weights: shape (n,), used as given
+    """
+    weights = np.asarray(weights, dtype=float)
+    if weights.shape != (len(attributes),):
+        raise ValueError("weights must have shape (n,)")
+    utility = utility_matrix(matrix, [a.value_function if a is not None else None for a in attributes])
+    weighted = utility * weights
+    return VFTScores(utility=utility, weighted=weighted, total=weighted.sum(axis=1))
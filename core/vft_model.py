@@ -1,16 +1,37 @@
 import json
 import uuid
+from collections.abc import MutableMapping
 import pandas as pd
 import numpy as np
 
+from core.value_functions import compile_value_function
+from core.vft_kernel import score_vft
+
 class Attribute:
     """
     Represents an attribute (objective) in the VFT model.
     """
+    __slots__ = (
+        "id", "name", "min_val", "max_val", "unit", "weight", "swing_weight",
+        "scaling_type", "scaling_direction", "custom_points", "rho", "midpoint", "steepness",
+        "_value_function",
+    )
+
+    # Fields that define the value function; assigning any of them drops the
+    # compiled function. Replace custom_points rather than mutating the list.
+    _SCALING_FIELDS = frozenset({
+        "min_val", "max_val", "scaling_type", "scaling_direction", "custom_points", "rho", "midpoint", "steepness",
+    })
+
     def __init__(self, name, min_val=0.0, max_val=100.0, unit="", weight=0.0,
-                 scaling_type="Linear", scaling_direction="Increasing", custom_points=None, id=None, swing_weight=50.0):
+                 scaling_type="Linear", scaling_direction="Increasing", custom_points=None, id=None, swing_weight=50.0,
+                 rho=None, midpoint=None, steepness=None):
         """
         Initialize an Attribute.
+
+        scaling_type: "Linear", "Custom" (piecewise through custom_points),
+        "Exponential" (shape rho) or "S-Curve" (midpoint, steepness); see
+        core.value_functions.compile_value_function for the defaults.
         """
         self.id = id if id is not None else str(uuid.uuid4())
         self.name = name
@@ -22,35 +43,30 @@ class Attribute:
         self.scaling_type = scaling_type
         self.scaling_direction = scaling_direction
         self.custom_points = custom_points if custom_points is not None else []
+        self.rho = None if rho is None else float(rho)
+        self.midpoint = None if midpoint is None else float(midpoint)
+        self.steepness = None if steepness is None else float(steepness)
 
-    def get_value(self, raw_score):
-        if self.scaling_type == "Linear":
-            return self._linear_scaling(raw_score)
-        elif self.scaling_type == "Custom":
-            return self._custom_scaling(raw_score)
-        return 0.0
-
-    def _linear_scaling(self, x):
-        if self.max_val == self.min_val:
-            return 0.0
-
-        if self.scaling_direction == "Increasing":
-            val = (x - self.min_val) / (self.max_val - self.min_val)
-        else: # Decreasing
-            val = (self.max_val - x) / (self.max_val - self.min_val)
-
-        return max(0.0, min(1.0, val)) # Clamp between 0 and 1
+    def __setattr__(self, name, value):
+        if name in self._SCALING_FIELDS:
+            object.__setattr__(self, "_value_function", None)
+        object.__setattr__(self, name, value)
 
-    def _custom_scaling(self, x):
-        if not self.custom_points:
-            return 0.0
+    @property
+    def value_function(self):
+        """Compiled value function, built on first use and reused until the scaling changes."""
+        vf = self._value_function
+        if vf is None:
+            vf = compile_value_function(
+                self.scaling_type, self.min_val, self.max_val, self.scaling_direction, self.custom_points,
+                rho=self.rho, midpoint=self.midpoint, steepness=self.steepness,
+            )
+            object.__setattr__(self, "_value_function", vf)
+        return vf
 
-        # Sort points by x
-        points = sorted(self.custom_points, key=lambda p: p[0])
-        xs = [p[0] for p in points]
-        ys = [p[1] for p in points]
-
-        return float(np.interp(x, xs, ys))
+    def get_value(self, raw_score):
+        """Value of a raw score (scalar or ndarray) in [0, 1]."""
+        return self.value_function(raw_score)
 
     def to_dict(self):
         return {
@@ -63,7 +79,10 @@ class Attribute:
             "swing_weight": self.swing_weight,
             "scaling_type": self.scaling_type,
             "scaling_direction": self.scaling_direction,
-            "custom_points": self.custom_points
+            "custom_points": self.custom_points,
+            "rho": self.rho,
+            "midpoint": self.midpoint,
+            "steepness": self.steepness,
         }
 
     @classmethod
@@ -71,29 +90,115 @@ class Attribute:
         return cls(**data)
 
 
+class _BoundScores(MutableMapping):
+    """Live name -> score view of a bound alternative; writes go to the model."""
+    __slots__ = ("_alt",)
+
+    def __init__(self, alt):
+        self._alt = alt
+
+    def _column(self, name):
+        alt = self._alt
+        j = alt._model._attr_index.get(name)
+        if j is None:
+            return None, np.nan
+        return j, alt._model._scores[alt._row, j]
+
+    def __getitem__(self, name):
+        j, val = self._column(name)
+        if j is None:
+            return self._alt._extra[name]
+        if np.isnan(val):
+            raise KeyError(name)
+        return float(val)
+
+    def __setitem__(self, name, score):
+        self._alt.set_score(name, score)
+
+    def __delitem__(self, name):
+        j, val = self._column(name)
+        if j is None:
+            del self._alt._extra[name]
+        elif np.isnan(val):
+            raise KeyError(name)
+        else:
+            self._alt._model._scores[self._alt._row, j] = np.nan
+
+    def __iter__(self):
+        alt = self._alt
+        yield from alt._model._row_scores(alt._row)
+        yield from list(alt._extra)
+
+    def __len__(self):
+        alt = self._alt
+        return len(alt._model._row_scores(alt._row)) + len(alt._extra)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
 class Alternative:
     """
     Represents an alternative solution in the VFT model.
+
+    Standalone, scores live in a dict. Once added to a VFTModel, scores for
+    the model's attributes live in the model's score matrix and the dict only
+    keeps scores for attribute names the model does not have; scores is then
+    a live mapping over both, so alt.scores[name] = x still updates the model.
     """
+    __slots__ = ("id", "name", "_extra", "_model", "_row")
+
     def __init__(self, name, scores=None, id=None):
         """
         Initialize an Alternative.
         """
         self.id = id if id is not None else str(uuid.uuid4())
         self.name = name
-        self.scores = scores if scores is not None else {}
+        self._extra = dict(scores) if scores is not None else {}
+        self._model = None
+        self._row = -1
+
+    @property
+    def scores(self):
+        if self._model is None:
+            return self._extra
+        return _BoundScores(self)
 
     def set_score(self, attribute_name, score):
-        self.scores[attribute_name] = float(score)
+        if self._model is not None:
+            j = self._model._attr_index.get(attribute_name)
+            if j is not None:
+                self._model._scores[self._row, j] = float(score)
+                return
+        self._extra[attribute_name] = float(score)
 
     def get_score(self, attribute_name):
-        return self.scores.get(attribute_name, 0.0)
+        if self._model is not None:
+            j = self._model._attr_index.get(attribute_name)
+            if j is not None:
+                val = self._model._scores[self._row, j]
+                return 0.0 if np.isnan(val) else float(val)
+        return self._extra.get(attribute_name, 0.0)
+
+    def _bind(self, model, row):
+        """Move scores for the model's attributes into its score matrix."""
+        extra = self._extra
+        self._extra = {}
+        self._model = model
+        self._row = row
+        for name, score in extra.items():
+            self.set_score(name, score)
+
+    def _unbind(self):
+        self._extra = dict(self.scores)
+        self._model = None
+        self._row = -1
 
     def to_dict(self):
         return {
             "id": self.id,
             "name": self.name,
-            "scores": self.scores
+            "scores": dict(self.scores)
         }
 
     @classmethod
@@ -105,66 +210,133 @@ class VFTModel:
     """
     Main class for the Value Focus Thinking (VFT) Model.
     Manages attributes and alternatives, and performs calculations.
+
+    Raw scores are held in one (m, n) float array (NaN = not set) with
+    name -> index maps for attributes and alternatives, so lookups and
+    additions are O(1) amortized and building a model is linear.
     """
+    __slots__ = ("attributes", "alternatives", "_attr_index", "_alt_index", "_scores")
+
     def __init__(self):
         self.attributes = []
         self.alternatives = []
+        self._attr_index = {}
+        self._alt_index = {}
+        self._scores = np.full((0, 0), np.nan)
 
+    # ------------------------------------------------------------------
+    # Score matrix storage
+    # ------------------------------------------------------------------
+    def _ensure_capacity(self, rows, cols):
+        cap_rows, cap_cols = self._scores.shape
+        if rows <= cap_rows and cols <= cap_cols:
+            return
+        grown = np.full(
+            (max(rows, 2 * cap_rows if rows > cap_rows else cap_rows),
+             max(cols, 2 * cap_cols if cols > cap_cols else cap_cols)),
+            np.nan,
+        )
+        grown[:cap_rows, :cap_cols] = self._scores
+        self._scores = grown
+
+    def _row_scores(self, row):
+        values = self._scores[row, :len(self.attributes)]
+        return {
+            attr.name: float(v)
+            for attr, v in zip(self.attributes, values)
+            if not np.isnan(v)
+        }
+
+    def _reindex_attributes(self):
+        self._attr_index = {a.name: j for j, a in enumerate(self.attributes)}
+
+    def _reindex_alternatives(self):
+        self._alt_index = {}
+        for i, alt in enumerate(self.alternatives):
+            alt._row = i
+            self._alt_index[alt.name] = i
+
+    @property
+    def score_matrix(self):
+        """(m, n) raw scores in attribute order; unset scores are 0."""
+        m, n = len(self.alternatives), len(self.attributes)
+        return np.nan_to_num(self._scores[:m, :n], nan=0.0)
+
+    # ------------------------------------------------------------------
+    # Attributes and alternatives
+    # ------------------------------------------------------------------
     def add_attribute(self, attribute):
         # Check if name exists
-        if any(a.name == attribute.name for a in self.attributes):
+        if attribute.name in self._attr_index:
             raise ValueError(f"Attribute {attribute.name} already exists.")
+        j = len(self.attributes)
+        self._ensure_capacity(self._scores.shape[0], j + 1)
         self.attributes.append(attribute)
+        self._attr_index[attribute.name] = j
+        self._scores[:, j] = np.nan
+        # Pick up scores alternatives already carried for this name
+        for alt in self.alternatives:
+            if attribute.name in alt._extra:
+                self._scores[alt._row, j] = alt._extra.pop(attribute.name)
 
     def remove_attribute(self, name):
-        self.attributes = [a for a in self.attributes if a.name != name]
+        j = self._attr_index.get(name)
+        if j is None:
+            return
+        del self.attributes[j]
         # Also remove scores from alternatives
-        for alt in self.alternatives:
-            if name in alt.scores:
-                del alt.scores[name]
+        self._scores = np.delete(self._scores, j, axis=1)
+        self._reindex_attributes()
 
     def add_alternative(self, alternative):
-        if any(a.name == alternative.name for a in self.alternatives):
+        if alternative.name in self._alt_index:
             raise ValueError(f"Alternative {alternative.name} already exists.")
+        i = len(self.alternatives)
+        self._ensure_capacity(i + 1, self._scores.shape[1])
+        self._scores[i, :] = np.nan
         self.alternatives.append(alternative)
+        self._alt_index[alternative.name] = i
+        alternative._bind(self, i)
 
     def remove_alternative(self, name):
-        self.alternatives = [a for a in self.alternatives if a.name != name]
+        i = self._alt_index.get(name)
+        if i is None:
+            return
+        alt = self.alternatives.pop(i)
+        alt._unbind()
+        self._scores = np.delete(self._scores, i, axis=0)
+        self._reindex_alternatives()
 
     def update_attribute(self, original_name, new_attribute):
-        idx = next((i for i, a in enumerate(self.attributes) if a.name == original_name), -1)
+        idx = self._attr_index.get(original_name, -1)
         if idx != -1:
             self.attributes[idx] = new_attribute
-            # Update alternative keys if name changed
+            # Scores stay in the same column; only the name lookup changes
             if original_name != new_attribute.name:
-                for alt in self.alternatives:
-                    if original_name in alt.scores:
-                        alt.scores[new_attribute.name] = alt.scores.pop(original_name)
+                del self._attr_index[original_name]
+                self._attr_index[new_attribute.name] = idx
 
     def update_alternative(self, original_name, new_alternative):
-        idx = next((i for i, a in enumerate(self.alternatives) if a.name == original_name), -1)
+        idx = self._alt_index.get(original_name, -1)
         if idx != -1:
+            self.alternatives[idx]._unbind()
             self.alternatives[idx] = new_alternative
+            del self._alt_index[original_name]
+            self._alt_index[new_alternative.name] = idx
+            self._scores[idx, :] = np.nan
+            new_alternative._bind(self, idx)
 
     def calculate_scores(self):
-        data = []
-        for alt in self.alternatives:
-            row = {"Alternative": alt.name, "Total Score": 0.0}
-            weighted_sum = 0.0
-            for attr in self.attributes:
-                raw = alt.get_score(attr.name)
-                val = attr.get_value(raw)
-                w_score = val * attr.weight
-                weighted_sum += w_score
-
-                # row[f"{attr.name} (Raw)"] = raw
-                # row[f"{attr.name} (Value)"] = val
-                row[f"{attr.name} (Weighted)"] = w_score
-
-            row["Total Score"] = weighted_sum
-            data.append(row)
-
-        return pd.DataFrame(data)
+        weights = np.array([attr.weight for attr in self.attributes], dtype=float)
+        scores = score_vft(self.score_matrix, self.attributes, weights)
+
+        df = pd.DataFrame(
+            scores.weighted,
+            columns=[f"{attr.name} (Weighted)" for attr in self.attributes],
+        )
+        df.insert(0, "Total Score", scores.total)
+        df.insert(0, "Alternative", [alt.name for alt in self.alternatives])
+        return df
 
     def to_json(self):
         return json.dumps({
@@ -0,0 +1,145 @@
+# core/weight_plane.py
+"""
+Two-criterion weight-plane sensitivity.
+
+The weights of criteria i and j are set to every pair (a, b) on a square
+grid over [0, 1] with a + b <= 1; the remaining 1 - a - b is shared among
+the other criteria in proportion to their base weights (equally when those
+are all zero). Cells with a + b > 1 are infeasible and left empty.
+
+For each feasible cell we keep the winning alternative and its margin over
+the runner-up. Cells are scored in chunks with the batched kernels, so a
+200 x 200 grid (about 20k feasible weight vectors) only ever holds one
+(chunk, m) score block.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from core.topsis import Directions, compile_directions, topsis_batch_from_normalized
+
+DEFAULT_GRID_POINTS = 101
+PLANE_CHUNK_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class WeightPlane:
+    i: int                  # criterion on the x axis
+    j: int                  # criterion on the y axis
+    grid: np.ndarray        # (g,) weight values, shared by both axes
+    winner: np.ndarray      # (g, g) alternative index, row = w_j step, col = w_i step; -1 where infeasible
+    margin: np.ndarray      # (g, g) winner score minus runner-up score; NaN where infeasible
+
+    @property
+    def feasible(self) -> np.ndarray:
+        return self.winner >= 0
+
+    def win_share(self, m: int) -> np.ndarray:
+        """(m,) share of feasible cells won by each alternative."""
+        won = self.winner[self.feasible]
+        if won.size == 0:
+            return np.zeros(m)
+        return np.bincount(won, minlength=m) / won.size
+
+
+def plane_weights(
+    base_weights: np.ndarray,
+    i: int,
+    j: int,
+    grid: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Weight vectors for the feasible cells of the (w_i, w_j) grid.
+
+    Returns (weights (K, n), rows (K,), cols (K,)) where rows index w_j and
+    cols index w_i on the grid.
+    """
+    base = np.asarray(base_weights, dtype=float)
+    grid = np.asarray(grid, dtype=float)
+    n = base.shape[0]
+    if not (0 <= i < n and 0 <= j < n):
+        raise ValueError("criterion index out of range")
+    if i == j:
+        raise ValueError("the two criteria must differ")
+    if n < 3:
+        raise ValueError("a weight plane needs at least three criteria")
+
+    rest = np.ones(n, dtype=bool)
+    rest[[i, j]] = False
+    share = np.where(rest, base, 0.0)
+    total = share.sum()
+    share = share / total if total > 0 else rest / rest.sum()
+
+    rows, cols = np.nonzero(grid[:, None] + grid[None, :] <= 1.0 + 1e-12)
+    a = grid[cols]
+    b = grid[rows]
+    remainder = np.clip(1.0 - a - b, 0.0, None)
+    weights = remainder[:, None] * share[None, :]
+    weights[:, i] = a
+    weights[:, j] = b
+    return weights, rows, cols
+
+
+def _plane(
+    scorer: Callable[[np.ndarray], np.ndarray],
+    base_weights: np.ndarray,
+    i: int,
+    j: int,
+    grid_points: int,
+    chunk_size: int,
+) -> WeightPlane:
+    if grid_points < 2:
+        raise ValueError("grid_points must be >= 2")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be > 0")
+    grid = np.linspace(0.0, 1.0, grid_points)
+    weights, rows, cols = plane_weights(base_weights, i, j, grid)
+
+    winner = np.full((grid_points, grid_points), -1, dtype=np.int32)
+    margin = np.full((grid_points, grid_points), np.nan)
+    for start in range(0, len(weights), chunk_size):
+        stop = start + chunk_size
+        scores = scorer(weights[start:stop])                     # (k, m)
+        r, c = rows[start:stop], cols[start:stop]
+        winner[r, c] = scores.argmax(axis=1)
+        if scores.shape[1] > 1:
+            top2 = -np.partition(-scores, 1, axis=1)[:, :2]
+            margin[r, c] = top2[:, 0] - top2[:, 1]
+    return WeightPlane(i=i, j=j, grid=grid, winner=winner, margin=margin)
+
+
+def topsis_weight_plane(
+    normalized_matrix: np.ndarray,
+    directions: Directions,
+    base_weights: np.ndarray,
+    i: int,
+    j: int,
+    grid_points: int = DEFAULT_GRID_POINTS,
+    chunk_size: int = PLANE_CHUNK_SIZE,
+    distance: str = "euclidean",
+    distance_p: Optional[float] = None,
+) -> WeightPlane:
+    """Winner and C* margin over the (w_i, w_j) plane; r_ij has shape (m, n)."""
+    r = np.asarray(normalized_matrix, dtype=float)
+    benefit = np.array(compile_directions(directions))
+
+    def scorer(weights: np.ndarray) -> np.ndarray:
+        return topsis_batch_from_normalized(r, weights, benefit, distance=distance, distance_p=distance_p).c_star
+
+    return _plane(scorer, base_weights, i, j, grid_points, chunk_size)
+
+
+def vft_weight_plane(
+    utility: np.ndarray,
+    base_weights: np.ndarray,
+    i: int,
+    j: int,
+    grid_points: int = DEFAULT_GRID_POINTS,
+    chunk_size: int = PLANE_CHUNK_SIZE,
+) -> WeightPlane:
+    """Winner and total-score margin over the (w_i, w_j) plane; u_ij has shape (m, n)."""
+    u = np.asarray(utility, dtype=float)
+    return _plane(lambda weights: weights @ u.T, base_weights, i, j, grid_points, chunk_size)
@@ -0,0 +1,79 @@
+# persistence/bulk_copy.py
+"""
+Bulk writes of run artifacts through PostgreSQL COPY.
+
+Artifacts are dense (alternative x criterion) arrays, so instead of one
+parameter dict per cell the columns are laid out with NumPy (ids repeated /
+tiled, values raveled), formatted into a CSV buffer by a single pandas call
+and streamed with COPY ... FROM STDIN on the caller's connection, inside its
+transaction. Floats are written with round-trip precision; NaN becomes NULL.
+
+Drivers without psycopg2's copy_expert fall back to one executemany INSERT.
+"""
+from __future__ import annotations
+
+import io
+from typing import Any, Dict, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def matrix_columns(
+    row_ids: Sequence[str],
+    col_ids: Sequence[str],
+    values: np.ndarray,
+    row_key: str = "alternative_id",
+    col_key: str = "criterion_id",
+    value_key: str = "value",
+) -> Dict[str, np.ndarray]:
+    """Long-format columns for an (m, n) matrix, row-major like values.ravel()."""
+    values = np.asarray(values)
+    m, n = values.shape
+    if len(row_ids) != m or len(col_ids) != n:
+        raise ValueError("row_ids and col_ids must match the matrix shape")
+    return {
+        row_key: np.repeat(np.asarray(row_ids, dtype=object), n),
+        col_key: np.tile(np.asarray(col_ids, dtype=object), m),
+        value_key: values.ravel(),
+    }
+
+
+def _frame(columns: Mapping[str, Any]) -> pd.DataFrame:
+    lengths = {len(v) for v in columns.values() if np.ndim(v) == 1}
+    if len(lengths) > 1:
+        raise ValueError("column arrays must all have the same length")
+    size = lengths.pop() if lengths else 1
+    return pd.DataFrame({k: (v if np.ndim(v) == 1 else [v] * size) for k, v in columns.items()})
+
+
+def copy_columns(conn: Connection, table: str, columns: Mapping[str, Any]) -> int:
+    """
+    Write rows given as column name -> 1D array (scalars are broadcast) into
+    table. Returns the number of rows written.
+    """
+    df = _frame(columns)
+    if df.empty:
+        return 0
+
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):
+            buf = io.StringIO()
+            df.to_csv(buf, header=False, index=False)
+            buf.seek(0)
+            cursor.copy_expert(
+                f"COPY {table} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv)",
+                buf,
+            )
+            return len(df)
+    finally:
+        cursor.close()
+
+    # Boxing to object gives plain Python scalars that any driver can bind.
+    rows = df.astype(object).where(df.notna(), None).to_dict("records")
+    sql = f"INSERT INTO {table} ({', '.join(df.columns)}) VALUES ({', '.join(':' + c for c in df.columns)})"
+    conn.execute(text(sql), rows)
+    return len(rows)
@@ -1,11 +1,12 @@
 # persistence/engine.py
 # persistence/engine.py
 import os
+import threading
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, make_url, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -29,9 +30,38 @@ def load_env():
 load_env()
 
 
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise RuntimeError(f"{name} must be an integer, got {raw!r}")
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name, "").strip().lower()
+    if not raw:
+        return default
+    if raw in ("1", "true", "yes", "on"):
+        return True
+    if raw in ("0", "false", "no", "off"):
+        return False
+    raise RuntimeError(f"{name} must be true or false, got {raw!r}")
+
+
 @dataclass(frozen=True)
 class DBConfig:
     database_url: str
+    pool_size: int = 5                # DB_POOL_SIZE: connections kept open
+    max_overflow: int = 10            # DB_MAX_OVERFLOW: extra connections under burst load
+    pool_timeout: int = 30            # DB_POOL_TIMEOUT: seconds to wait for a free connection
+    pool_recycle: int = 1800          # DB_POOL_RECYCLE: seconds before a connection is replaced; -1 = never
+    pool_use_lifo: bool = True        # DB_POOL_LIFO: reuse the most recent connection, let idle ones age out
+    pool_pre_ping: bool = True        # DB_POOL_PRE_PING: test each connection on checkout
+    statement_timeout_ms: int = 0     # DB_STATEMENT_TIMEOUT_MS: server-side limit per statement; 0 = none
+    application_name: str = "mcda-app"  # DB_APPLICATION_NAME: shown in pg_stat_activity
 
 
 _engine: Optional[Engine] = None
@@ -41,19 +71,130 @@ def get_db_config() -> DBConfig:
     url = os.getenv("DATABASE_URL")
     if not url:
         raise RuntimeError("DATABASE_URL is not set. Put it in .env or export it.")
-    return DBConfig(database_url=url)
+    return DBConfig(
+        database_url=url,
+        pool_size=_env_int("DB_POOL_SIZE", 5),
+        max_overflow=_env_int("DB_MAX_OVERFLOW", 10),
+        pool_timeout=_env_int("DB_POOL_TIMEOUT", 30),
+        pool_recycle=_env_int("DB_POOL_RECYCLE", 1800),
+        pool_use_lifo=_env_bool("DB_POOL_LIFO", True),
+        pool_pre_ping=_env_bool("DB_POOL_PRE_PING", True),
+        statement_timeout_ms=_env_int("DB_STATEMENT_TIMEOUT_MS", 0),
+        application_name=os.getenv("DB_APPLICATION_NAME", "").strip() or "mcda-app",
+    )
+
+
+# -------------------------
+# Pool metrics
+# -------------------------
+class PoolMetrics:
+    """Counters fed by pool events; read them through pool_stats()."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.checked_out = 0
+        self.peak_checked_out = 0
+
+    def attach(self, engine: Engine) -> None:
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+
+    def _on_connect(self, dbapi_conn, record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_conn, record, proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+
+    def _on_checkin(self, dbapi_conn, record):
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def _on_invalidate(self, dbapi_conn, record, exc):
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "invalidations": self.invalidations,
+                "peak_checked_out": self.peak_checked_out,
+            }
+
+
+_metrics = PoolMetrics()
+
+
+def _connect_args(cfg: DBConfig) -> dict:
+    """Session settings sent with every new PostgreSQL connection."""
+    if make_url(cfg.database_url).get_backend_name() != "postgresql":
+        return {}
+    args = {"application_name": cfg.application_name}
+    if cfg.statement_timeout_ms > 0:
+        args["options"] = f"-c statement_timeout={cfg.statement_timeout_ms}"
+    return args
 
 
 def get_engine() -> Engine:
+    """
+    Process-wide engine configured from the DB_* environment variables.
+
+    With DB_POOL_PRE_PING=false no test query is sent on checkout. Dead
+    connections are then handled after the fact: connections older than
+    DB_POOL_RECYCLE are replaced before use, and a disconnect error on any
+    connection invalidates the whole pool, so only the statement that hit
+    it fails and the next checkout opens a fresh connection.
+    """
     global _engine
     if _engine is not None:
         return _engine
 
     cfg = get_db_config()
-    _engine = create_engine(cfg.database_url, pool_pre_ping=True, future=True)
+    engine = create_engine(
+        cfg.database_url,
+        pool_size=cfg.pool_size,
+        max_overflow=cfg.max_overflow,
+        pool_timeout=cfg.pool_timeout,
+        pool_recycle=cfg.pool_recycle,
+        pool_use_lifo=cfg.pool_use_lifo,
+        pool_pre_ping=cfg.pool_pre_ping,
+        connect_args=_connect_args(cfg),
+        future=True,
+    )
+    _metrics.attach(engine)
+    _engine = engine
     return _engine
 
 
+def pool_stats() -> dict:
+    """
+    Current pool usage (size, checked_in, checked_out, overflow) plus
+    counters since start (connects, checkouts, invalidations,
+    peak_checked_out). Empty before the engine is created.
+    """
+    if _engine is None:
+        return {}
+    pool = _engine.pool
+    stats = {}
+    for key in ("size", "checkedin", "checkedout", "overflow"):
+        fn = getattr(pool, key, None)
+        if fn is not None:
+            stats[key.replace("checked", "checked_")] = fn()
+    stats.update(_metrics.snapshot())
+    stats["status"] = pool.status()
+    return stats
+
+
 def ping_db() -> bool:
     try:
         eng = get_engine()
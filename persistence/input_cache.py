@@ -0,0 +1,182 @@
+# persistence/input_cache.py
+"""
+Process-wide cache for analysis inputs read on every Streamlit rerun.
+
+Entries are keyed by (kind, scenario_id, preference_set_id, run_id, data
+version). The version is a counter per scenario, preference set and run that
+the repositories bump whenever they write the underlying rows:
+
+  scenario        criteria, alternatives, measurements, value functions,
+                  preference-set and run lists
+  preference set  criterion weights
+  run             stored run artifacts (runs can be overwritten in place)
+
+A write therefore makes every older entry unreachable, and those entries are
+dropped right away. Loaders run only on a miss, so reruns that change nothing
+in the database (slider moves) are served without a round trip.
+
+Cached values are shared between sessions: treat them as read-only.
+Writes made by other processes are not seen until this process writes the
+same scope or the entry is evicted.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+MAX_ENTRIES = 512
+
+
+class InputCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._versions: Dict[Tuple[str, str], int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _version(self, scope: str, key: Optional[str]) -> int:
+        return self._versions.get((scope, key), 0) if key else 0
+
+    def data_version(
+        self,
+        scenario_id: Optional[str] = None,
+        preference_set_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+    ) -> Tuple[int, int, int]:
+        with self._lock:
+            return (
+                self._version("scenario", scenario_id),
+                self._version("preference_set", preference_set_id),
+                self._version("run", run_id),
+            )
+
+    def get_or_load(
+        self,
+        kind: str,
+        loader: Callable[[], Any],
+        scenario_id: Optional[str] = None,
+        preference_set_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        extra: Hashable = None,
+    ) -> Any:
+        """
+        Return the cached value for this key and data version, calling
+        loader() once on a miss. extra distinguishes calls that share the
+        same ids but take other arguments.
+        """
+        with self._lock:
+            key = (
+                kind,
+                scenario_id,
+                preference_set_id,
+                run_id,
+                extra,
+                self.data_version(scenario_id, preference_set_id, run_id),
+            )
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Load outside the lock; concurrent misses may each load, the last store wins.
+        value = loader()
+        with self._lock:
+            # Skip the store if a write landed while loading.
+            if key[-1] == self.data_version(scenario_id, preference_set_id, run_id):
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def _invalidate(self, scope: str, key: Optional[str], position: int) -> None:
+        if not key:
+            return
+        with self._lock:
+            self._versions[(scope, key)] = self._versions.get((scope, key), 0) + 1
+            stale = [k for k in self._entries if k[position] == key]
+            for k in stale:
+                del self._entries[k]
+
+    def invalidate_scenario(self, scenario_id: Optional[str]) -> None:
+        self._invalidate("scenario", scenario_id, 1)
+
+    def invalidate_preference_set(self, preference_set_id: Optional[str]) -> None:
+        self._invalidate("preference_set", preference_set_id, 2)
+
+    def invalidate_run(self, run_id: Optional[str]) -> None:
+        self._invalidate("run", run_id, 3)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = InputCache()
+
+
+def get_input_cache() -> InputCache:
+    return _cache
+
+
+def cached_input(
+    kind: str,
+    loader: Callable[[], Any],
+    scenario_id: Optional[str] = None,
+    preference_set_id: Optional[str] = None,
+    run_id: Optional[str] = None,
+    extra: Hashable = None,
+) -> Any:
+    return _cache.get_or_load(kind, loader, scenario_id, preference_set_id, run_id, extra)
+
+
+def invalidate_scenario(scenario_id: Optional[str]) -> None:
+    _cache.invalidate_scenario(scenario_id)
+
+
+def invalidate_preference_set(preference_set_id: Optional[str]) -> None:
+    _cache.invalidate_preference_set(preference_set_id)
+
+
+def invalidate_run(run_id: Optional[str]) -> None:
+    _cache.invalidate_run(run_id)
+
+
+def cached_loader(
+    scenario: Optional[str] = None,
+    preference_set: Optional[str] = None,
+    run: Optional[str] = None,
+):
+    """
+    Decorator for loader functions with hashable arguments. The named
+    parameters supply the scenario / preference set / run ids whose data
+    versions are part of the key; the full argument list is part of it too.
+    """
+
+    def decorate(fn):
+        sig = inspect.signature(fn)
+        kind = f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = bound.arguments
+            return cached_input(
+                kind,
+                lambda: fn(*args, **kwargs),
+                scenario_id=arguments[scenario] if scenario else None,
+                preference_set_id=arguments[preference_set] if preference_set else None,
+                run_id=arguments[run] if run else None,
+                extra=tuple(arguments.items()),
+            )
+
+        wrapper.uncached = fn
+        return wrapper
+
+    return decorate
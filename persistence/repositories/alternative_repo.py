@@ -4,6 +4,9 @@ from typing import Dict, List, Optional
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from persistence.input_cache import invalidate_scenario
+from persistence.repositories.scenario_repo import refresh_content_fingerprint
+
 
 class AlternativeRepo:
     def __init__(self, engine: Engine):
@@ -42,7 +45,9 @@ class AlternativeRepo:
                     continue
                 row = conn.execute(text(insert_sql), {"scenario_id": scenario_id, "name": name}).mappings().first()
                 name_to_id[name] = str(row["alternative_id"])
+            refresh_content_fingerprint(conn, scenario_id)
 
+        invalidate_scenario(scenario_id)
         return name_to_id
 
     def delete_missing(self, scenario_id: str, keep_names: List[str]) -> None:
@@ -54,3 +59,5 @@ class AlternativeRepo:
         """
         with self.engine.begin() as conn:
             conn.execute(text(sql), {"scenario_id": scenario_id, "keep_names": keep_names})
+            refresh_content_fingerprint(conn, scenario_id)
+        invalidate_scenario(scenario_id)
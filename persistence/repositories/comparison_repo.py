@@ -0,0 +1,89 @@
+# persistence/repositories/comparison_repo.py
+from typing import Dict, List, Sequence, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+class ComparisonRepo:
+    """
+    Bulk reads for comparing several runs at once. Each method issues one
+    query for all requested runs (run_id = ANY(:ids)) and returns a
+    long-format DataFrame with a run_id column.
+    """
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+
+    def _frame(self, sql: str, params: dict, columns: List[str]) -> pd.DataFrame:
+        with self.engine.begin() as conn:
+            rows = conn.execute(text(sql), params).all()
+        return pd.DataFrame(rows, columns=columns)
+
+    def latest_runs(self, selections: Sequence[Tuple[str, str]], method: str) -> Dict[Tuple[str, str], str]:
+        """(scenario_id, preference_set_id) -> run_id of the most recent run with this method."""
+        if not selections:
+            return {}
+        sql = """
+        SELECT DISTINCT ON (r.scenario_id, r.preference_set_id)
+               r.scenario_id::text, r.preference_set_id::text, r.run_id::text
+        FROM runs r
+        JOIN unnest(CAST(:sids AS uuid[]), CAST(:pids AS uuid[])) AS sel(sid, pid)
+          ON r.scenario_id = sel.sid AND r.preference_set_id = sel.pid
+        WHERE r.method = :method
+        ORDER BY r.scenario_id, r.preference_set_id, r.executed_at DESC
+        """
+        params = {
+            "sids": [s for s, _ in selections],
+            "pids": [p for _, p in selections],
+            "method": method,
+        }
+        with self.engine.begin() as conn:
+            rows = conn.execute(text(sql), params).all()
+        return {(sid, pid): rid for sid, pid, rid in rows}
+
+    def load_scores(self, run_ids: Sequence[str]) -> pd.DataFrame:
+        """run_id, alternative_name, score, rank; best rank first within each run."""
+        sql = """
+        SELECT rs.run_id::text, a.name, rs.score, rs.rank
+        FROM result_scores rs
+        JOIN alternatives a ON a.alternative_id = rs.alternative_id
+        WHERE rs.run_id = ANY(CAST(:ids AS uuid[]))
+        ORDER BY rs.run_id, rs.rank
+        """
+        return self._frame(sql, {"ids": list(run_ids)}, ["run_id", "alternative_name", "score", "rank"])
+
+    def load_distances(self, run_ids: Sequence[str]) -> pd.DataFrame:
+        """run_id, alternative, s_pos, s_neg, c_star; best C* first within each run."""
+        sql = """
+        SELECT d.run_id::text, a.name, d.s_pos, d.s_neg, d.c_star
+        FROM topsis_distances d
+        JOIN alternatives a ON a.alternative_id = d.alternative_id
+        WHERE d.run_id = ANY(CAST(:ids AS uuid[]))
+        ORDER BY d.run_id, d.c_star DESC
+        """
+        return self._frame(sql, {"ids": list(run_ids)}, ["run_id", "alternative", "s_pos", "s_neg", "c_star"])
+
+    def load_weighted_long(self, run_ids: Sequence[str], method: str) -> pd.DataFrame:
+        """
+        run_id, Alternative, Criterion, Weighted Value from the TOPSIS
+        weighted matrix or the VFT weighted utilities, sorted by names.
+        """
+        if method == "topsis":
+            table, value_col = "topsis_weighted_values", "value"
+        elif method == "vft":
+            table, value_col = "vft_weighted_utilities", "weighted_utility"
+        else:
+            raise ValueError("method must be 'topsis' or 'vft'")
+        sql = f"""
+        SELECT v.run_id::text, a.name, c.name, v.{value_col}
+        FROM {table} v
+        JOIN alternatives a ON a.alternative_id = v.alternative_id
+        JOIN criteria c ON c.criterion_id = v.criterion_id
+        WHERE v.run_id = ANY(CAST(:ids AS uuid[]))
+        ORDER BY v.run_id, a.name, c.name
+        """
+        return self._frame(
+            sql, {"ids": list(run_ids)}, ["run_id", "Alternative", "Criterion", "Weighted Value"]
+        )
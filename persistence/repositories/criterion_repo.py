@@ -4,6 +4,9 @@ from typing import Dict, List
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from persistence.input_cache import invalidate_scenario
+from persistence.repositories.scenario_repo import refresh_content_fingerprint
+
 
 class CriterionRepo:
     def __init__(self, engine: Engine):
@@ -60,7 +63,9 @@ class CriterionRepo:
                     name_to_id[name] = str(row_db["criterion_id"])
                 else:
                     conn.execute(text(update_sql), payload)
+            refresh_content_fingerprint(conn, scenario_id)
 
+        invalidate_scenario(scenario_id)
         return name_to_id
 
     def delete_missing(self, scenario_id: str, keep_names: List[str]) -> None:
@@ -72,3 +77,5 @@ class CriterionRepo:
         """
         with self.engine.begin() as conn:
             conn.execute(text(sql), {"scenario_id": scenario_id, "keep_names": keep_names})
+            refresh_content_fingerprint(conn, scenario_id)
+        invalidate_scenario(scenario_id)
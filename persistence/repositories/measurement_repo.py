@@ -5,6 +5,9 @@ import pandas as pd
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from persistence.input_cache import invalidate_scenario
+from persistence.repositories.scenario_repo import refresh_content_fingerprint
+
 
 class MeasurementRepo:
     def __init__(self, engine: Engine):
@@ -61,3 +64,5 @@ class MeasurementRepo:
         with self.engine.begin() as conn:
             conn.execute(text(del_sql), {"scenario_id": scenario_id})
             conn.execute(text(ins_sql), payloads)
+            refresh_content_fingerprint(conn, scenario_id)
+        invalidate_scenario(scenario_id)
@@ -4,6 +4,8 @@ from typing import Dict, List, Optional
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from persistence.input_cache import invalidate_preference_set, invalidate_scenario
+
 
 class PreferenceRepo:
     def __init__(self, engine: Engine):
@@ -32,7 +34,8 @@ class PreferenceRepo:
             if row:
                 return str(row["preference_set_id"])
             row2 = conn.execute(text(ins), {"scenario_id": scenario_id, "type": pref_type, "name": name, "created_by": created_by}).mappings().first()
-            return str(row2["preference_set_id"])
+        invalidate_scenario(scenario_id)
+        return str(row2["preference_set_id"])
 
     def load_weights_by_criterion_name(self, preference_set_id: str) -> Dict[str, float]:
         sql = """
@@ -59,3 +62,4 @@ class PreferenceRepo:
         with self.engine.begin() as conn:
             conn.execute(text(del_sql), {"pref_id": preference_set_id})
             conn.execute(text(ins_sql), payloads)
+        invalidate_preference_set(preference_set_id)
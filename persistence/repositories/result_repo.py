@@ -1,30 +1,46 @@
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import numpy as np
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from core.ranking import Ranking
+from persistence.bulk_copy import copy_columns
+from persistence.input_cache import invalidate_run
+from persistence.unit_of_work import UnitOfWork, after_commit, begin
+
 
 class ResultRepo:
-    def __init__(self, engine: Engine):
+    def __init__(self, engine: Engine, uow: Optional[UnitOfWork] = None):
         self.engine = engine
+        self.uow = uow
 
-    def replace_scores(self, run_id: str, alt_id_to_score: Dict[str, float]) -> None:
-        del_sql = "DELETE FROM result_scores WHERE run_id = :run_id"
-        ins_sql = """
-        INSERT INTO result_scores (run_id, alternative_id, score, rank)
-        VALUES (:run_id, :alternative_id, :score, :rank)
+    def replace_scores(
+        self, run_id: str, alt_id_to_score: Dict[str, float], top_k: Optional[int] = None
+    ) -> None:
         """
-        sorted_items = sorted(alt_id_to_score.items(), key=lambda kv: kv[1], reverse=True)
-
-        payloads: List[dict] = []
-        for idx, (alt_id, score) in enumerate(sorted_items, start=1):
-            payloads.append(
-                {"run_id": run_id, "alternative_id": alt_id, "score": float(score), "rank": int(idx)}
-            )
+        Store scores with 1-based ranks (ties keep insertion order).
+        With top_k, only the best top_k alternatives are written.
+        """
+        del_sql = "DELETE FROM result_scores WHERE run_id = :run_id"
+        alt_ids = np.asarray(list(alt_id_to_score), dtype=object)
+        scores = np.fromiter(alt_id_to_score.values(), dtype=float, count=len(alt_ids))
+        ranking = Ranking(scores)
+        picked = ranking.order if top_k is None else ranking.top(top_k)
 
-        with self.engine.begin() as conn:
+        with begin(self.engine, self.uow) as conn:
             conn.execute(text(del_sql), {"run_id": run_id})
-            if payloads:
-                conn.execute(text(ins_sql), payloads)
+            copy_columns(
+                conn,
+                "result_scores",
+                {
+                    "run_id": run_id,
+                    "alternative_id": alt_ids[picked],
+                    "score": scores[picked],
+                    "rank": np.arange(1, len(picked) + 1),
+                },
+            )
+        after_commit(self.uow, invalidate_run, run_id)
 
     def get_scores_with_names(self, run_id: str) -> List[dict]:
         sql = """
@@ -34,6 +50,6 @@ class ResultRepo:
         WHERE rs.run_id = :run_id
         ORDER BY rs.rank ASC
         """
-        with self.engine.begin() as conn:
+        with begin(self.engine, self.uow) as conn:
             rows = conn.execute(text(sql), {"run_id": run_id}).mappings().all()
         return [dict(r) for r in rows]
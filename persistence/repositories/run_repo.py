@@ -2,10 +2,14 @@ from typing import Optional, Dict, Any, List
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from persistence.input_cache import invalidate_scenario
+from persistence.unit_of_work import UnitOfWork, after_commit, begin
+
 
 class RunRepo:
-    def __init__(self, engine: Engine):
+    def __init__(self, engine: Engine, uow: Optional[UnitOfWork] = None):
         self.engine = engine
+        self.uow = uow
 
     def create_run(self, scenario_id: str, preference_set_id: str, method: str, executed_by: str = "", engine_version: str = "core=0.1.0") -> str:
         sql = """
@@ -13,7 +17,7 @@ class RunRepo:
         VALUES (:scenario_id, :preference_set_id, :method, :engine_version, :executed_by)
         RETURNING run_id::text AS run_id
         """
-        with self.engine.begin() as conn:
+        with begin(self.engine, self.uow) as conn:
             row = conn.execute(
                 text(sql),
                 {
@@ -24,6 +28,7 @@ class RunRepo:
                     "executed_by": executed_by,
                 },
             ).mappings().first()
+        after_commit(self.uow, invalidate_scenario, scenario_id)
         return str(row["run_id"])
 
     def list_runs(self, scenario_id: str, limit: int = 50) -> List[Dict[str, Any]]:
@@ -36,6 +41,6 @@ class RunRepo:
         ORDER BY executed_at DESC
         LIMIT :limit
         """
-        with self.engine.begin() as conn:
+        with begin(self.engine, self.uow) as conn:
             rows = conn.execute(text(sql), {"scenario_id": scenario_id, "limit": limit}).mappings().all()
         return [dict(r) for r in rows]
@@ -1,7 +1,25 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from sqlalchemy import text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+
+# Stored content fingerprint: "<alternatives>:<criteria>:<measurements>" sha256 digests,
+# computed in SQL by public.scenario_content_fingerprint().
+FINGERPRINT_PARTS = ("alternatives", "criteria", "measurements")
+
+
+def refresh_content_fingerprint(conn: Connection, scenario_id: str) -> None:
+    """Recompute the scenario's fingerprint inside the caller's transaction."""
+    conn.execute(
+        text(
+            """
+            UPDATE scenarios
+            SET content_fingerprint = public.scenario_content_fingerprint(:scenario_id)
+            WHERE scenario_id = :scenario_id
+            """
+        ),
+        {"scenario_id": scenario_id},
+    )
 
 
 class ScenarioRepo:
@@ -67,3 +85,32 @@ class ScenarioRepo:
         with self.engine.begin() as conn:
             row = conn.execute(text(sql), {"scenario_id": scenario_id}).mappings().first()
         return dict(row) if row else None
+
+    def get_content_fingerprints(self, scenario_ids: List[str]) -> Dict[str, str]:
+        """
+        scenario_id -> stored content fingerprint. Scenarios written before
+        fingerprints existed (or by code that bypasses the repositories) are
+        filled in on first read.
+        """
+        if not scenario_ids:
+            return {}
+        sql = """
+        SELECT scenario_id::text AS scenario_id, content_fingerprint
+        FROM scenarios
+        WHERE scenario_id = ANY(CAST(:ids AS uuid[]))
+        """
+        fill_sql = """
+        UPDATE scenarios
+        SET content_fingerprint = public.scenario_content_fingerprint(scenario_id)
+        WHERE scenario_id = ANY(CAST(:ids AS uuid[])) AND content_fingerprint IS NULL
+        RETURNING scenario_id::text AS scenario_id, content_fingerprint
+        """
+        ids = list(scenario_ids)
+        with self.engine.begin() as conn:
+            rows = conn.execute(text(sql), {"ids": ids}).mappings().all()
+            out = {r["scenario_id"]: r["content_fingerprint"] for r in rows}
+            missing = [sid for sid, fp in out.items() if fp is None]
+            if missing:
+                filled = conn.execute(text(fill_sql), {"ids": missing}).mappings().all()
+                out.update({r["scenario_id"]: r["content_fingerprint"] for r in filled})
+        return out
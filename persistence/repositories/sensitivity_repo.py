@@ -0,0 +1,99 @@
+# persistence/repositories/sensitivity_repo.py
+from typing import List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from core.sensitivity_artifacts import SensitivityArtifacts
+from core.stability import MODES
+from persistence.input_cache import invalidate_run
+from persistence.unit_of_work import UnitOfWork, after_commit, begin
+
+
+class SensitivityRepo:
+    """
+    Precomputed sensitivity results, one row per run in run_sensitivity.
+    Arrays are stored flattened and reshaped from the name lists on read.
+    """
+
+    def __init__(self, engine: Engine, uow: Optional[UnitOfWork] = None):
+        self.engine = engine
+        self.uow = uow
+
+    def save(
+        self,
+        run_id: str,
+        alternative_names: Sequence[str],
+        criterion_names: Sequence[str],
+        artifacts: SensitivityArtifacts,
+    ) -> None:
+        sql = """
+        INSERT INTO run_sensitivity (
+            run_id, alternative_names, criterion_names, base_weights, base_scores,
+            grid_points, sweeps, tornado, stability, stability_swaps
+        )
+        VALUES (
+            :run_id, :alternative_names, :criterion_names, :base_weights, :base_scores,
+            :grid_points, :sweeps, :tornado, :stability, :stability_swaps
+        )
+        ON CONFLICT (run_id) DO UPDATE SET alternative_names = EXCLUDED.alternative_names,
+                                           criterion_names = EXCLUDED.criterion_names,
+                                           base_weights = EXCLUDED.base_weights,
+                                           base_scores = EXCLUDED.base_scores,
+                                           grid_points = EXCLUDED.grid_points,
+                                           sweeps = EXCLUDED.sweeps,
+                                           tornado = EXCLUDED.tornado,
+                                           stability = EXCLUDED.stability,
+                                           stability_swaps = EXCLUDED.stability_swaps,
+                                           created_at = now()
+        """
+        params = {
+            "run_id": run_id,
+            "alternative_names": list(alternative_names),
+            "criterion_names": list(criterion_names),
+            "base_weights": artifacts.base_weights.astype(float).tolist(),
+            "base_scores": artifacts.base_scores.astype(float).tolist(),
+            "grid_points": int(artifacts.sweeps.shape[1]),
+            "sweeps": artifacts.sweeps.astype(float).ravel().tolist(),
+            "tornado": artifacts.tornado.astype(float).ravel().tolist(),
+            "stability": artifacts.stability.astype(float).ravel().tolist(),
+            "stability_swaps": artifacts.stability_swaps.astype(int).ravel().tolist(),
+        }
+        with begin(self.engine, self.uow) as conn:
+            conn.execute(text(sql), params)
+        after_commit(self.uow, invalidate_run, run_id)
+
+    def delete(self, run_id: str) -> None:
+        with begin(self.engine, self.uow) as conn:
+            conn.execute(text("DELETE FROM run_sensitivity WHERE run_id = :run_id"), {"run_id": run_id})
+        after_commit(self.uow, invalidate_run, run_id)
+
+    def get(self, run_id: str) -> Optional[dict]:
+        """
+        {"alternative_names", "criterion_names", "artifacts"} for the run, or
+        None when nothing was precomputed.
+        """
+        sql = """
+        SELECT alternative_names, criterion_names, base_weights, base_scores,
+               grid_points, sweeps, tornado, stability, stability_swaps
+        FROM run_sensitivity
+        WHERE run_id = :run_id
+        """
+        with begin(self.engine, self.uow) as conn:
+            row = conn.execute(text(sql), {"run_id": run_id}).mappings().first()
+        if row is None:
+            return None
+
+        alt_names: List[str] = list(row["alternative_names"])
+        crit_names: List[str] = list(row["criterion_names"])
+        m, n, g = len(alt_names), len(crit_names), int(row["grid_points"])
+        artifacts = SensitivityArtifacts(
+            base_weights=np.asarray(row["base_weights"], dtype=float),
+            base_scores=np.asarray(row["base_scores"], dtype=np.float32),
+            sweeps=np.asarray(row["sweeps"], dtype=np.float32).reshape(n, g, m),
+            tornado=np.asarray(row["tornado"], dtype=np.float32).reshape(2 * n, m),
+            stability=np.asarray(row["stability"], dtype=float).reshape(len(MODES), n, 2),
+            stability_swaps=np.asarray(row["stability_swaps"], dtype=np.int32).reshape(len(MODES), n, 4),
+        )
+        return {"alternative_names": alt_names, "criterion_names": crit_names, "artifacts": artifacts}
@@ -1,61 +1,97 @@
-from typing import Dict, List
+from typing import Dict, Optional, Sequence
+
+import numpy as np
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from persistence.bulk_copy import copy_columns, matrix_columns
+from persistence.input_cache import invalidate_run
+from persistence.unit_of_work import UnitOfWork, after_commit, begin
+
 
 class TopsisRepo:
-    def __init__(self, engine: Engine):
+    def __init__(self, engine: Engine, uow: Optional[UnitOfWork] = None):
         self.engine = engine
+        self.uow = uow
 
-    def save_run_config(self, run_id: str, normalization: str = "vector", distance: str = "euclidean") -> None:
+    def save_run_config(
+        self,
+        run_id: str,
+        normalization: str = "vector",
+        distance: str = "euclidean",
+        distance_p: Optional[float] = None,
+    ) -> None:
         sql = """
-        INSERT INTO topsis_run_config (run_id, normalization, distance)
-        VALUES (:run_id, :normalization, :distance)
-        ON CONFLICT (run_id) DO UPDATE SET normalization = EXCLUDED.normalization, distance = EXCLUDED.distance
-        """
-        with self.engine.begin() as conn:
-            conn.execute(text(sql), {"run_id": run_id, "normalization": normalization, "distance": distance})
-
-    def replace_normalized(self, run_id: str, rows: List[dict]) -> None:
-        del_sql = "DELETE FROM topsis_normalized_values WHERE run_id = :run_id"
-        ins_sql = """
-        INSERT INTO topsis_normalized_values (run_id, alternative_id, criterion_id, value)
-        VALUES (:run_id, :alternative_id, :criterion_id, :value)
+        INSERT INTO topsis_run_config (run_id, normalization, distance, distance_p)
+        VALUES (:run_id, :normalization, :distance, :distance_p)
+        ON CONFLICT (run_id) DO UPDATE SET normalization = EXCLUDED.normalization,
+                                           distance = EXCLUDED.distance,
+                                           distance_p = EXCLUDED.distance_p
         """
-        with self.engine.begin() as conn:
-            conn.execute(text(del_sql), {"run_id": run_id})
-            if rows:
-                conn.execute(text(ins_sql), rows)
-
-    def replace_weighted(self, run_id: str, rows: List[dict]) -> None:
-        del_sql = "DELETE FROM topsis_weighted_values WHERE run_id = :run_id"
-        ins_sql = """
-        INSERT INTO topsis_weighted_values (run_id, alternative_id, criterion_id, value)
-        VALUES (:run_id, :alternative_id, :criterion_id, :value)
-        """
-        with self.engine.begin() as conn:
-            conn.execute(text(del_sql), {"run_id": run_id})
-            if rows:
-                conn.execute(text(ins_sql), rows)
-
-    def replace_ideals(self, run_id: str, rows: List[dict]) -> None:
-        del_sql = "DELETE FROM topsis_ideals WHERE run_id = :run_id"
-        ins_sql = """
-        INSERT INTO topsis_ideals (run_id, criterion_id, pos_ideal, neg_ideal)
-        VALUES (:run_id, :criterion_id, :pos_ideal, :neg_ideal)
-        """
-        with self.engine.begin() as conn:
-            conn.execute(text(del_sql), {"run_id": run_id})
-            if rows:
-                conn.execute(text(ins_sql), rows)
-
-    def replace_distances(self, run_id: str, rows: List[dict]) -> None:
-        del_sql = "DELETE FROM topsis_distances WHERE run_id = :run_id"
-        ins_sql = """
-        INSERT INTO topsis_distances (run_id, alternative_id, s_pos, s_neg, c_star)
-        VALUES (:run_id, :alternative_id, :s_pos, :s_neg, :c_star)
+        with begin(self.engine, self.uow) as conn:
+            conn.execute(
+                text(sql),
+                {"run_id": run_id, "normalization": normalization, "distance": distance, "distance_p": distance_p},
+            )
+        after_commit(self.uow, invalidate_run, run_id)
+
+    def get_run_config(self, run_id: str) -> Optional[dict]:
+        sql = """
+        SELECT normalization, distance, distance_p
+        FROM topsis_run_config
+        WHERE run_id = :run_id
         """
-        with self.engine.begin() as conn:
-            conn.execute(text(del_sql), {"run_id": run_id})
-            if rows:
-                conn.execute(text(ins_sql), rows)
+        with begin(self.engine, self.uow) as conn:
+            row = conn.execute(text(sql), {"run_id": run_id}).mappings().first()
+        return dict(row) if row else None
+
+    def _replace(self, table: str, run_id: str, columns: Dict[str, object]) -> None:
+        with begin(self.engine, self.uow) as conn:
+            conn.execute(text(f"DELETE FROM {table} WHERE run_id = :run_id"), {"run_id": run_id})
+            copy_columns(conn, table, {"run_id": run_id, **columns})
+        after_commit(self.uow, invalidate_run, run_id)
+
+    def replace_normalized(
+        self, run_id: str, alternative_ids: Sequence[str], criterion_ids: Sequence[str], values: np.ndarray
+    ) -> None:
+        """values: (m, n) normalized matrix aligned with alternative_ids x criterion_ids."""
+        self._replace("topsis_normalized_values", run_id, matrix_columns(alternative_ids, criterion_ids, values))
+
+    def replace_weighted(
+        self, run_id: str, alternative_ids: Sequence[str], criterion_ids: Sequence[str], values: np.ndarray
+    ) -> None:
+        """values: (m, n) weighted matrix aligned with alternative_ids x criterion_ids."""
+        self._replace("topsis_weighted_values", run_id, matrix_columns(alternative_ids, criterion_ids, values))
+
+    def replace_ideals(
+        self, run_id: str, criterion_ids: Sequence[str], pos_ideal: np.ndarray, neg_ideal: np.ndarray
+    ) -> None:
+        self._replace(
+            "topsis_ideals",
+            run_id,
+            {
+                "criterion_id": np.asarray(criterion_ids, dtype=object),
+                "pos_ideal": np.asarray(pos_ideal, dtype=float),
+                "neg_ideal": np.asarray(neg_ideal, dtype=float),
+            },
+        )
+
+    def replace_distances(
+        self,
+        run_id: str,
+        alternative_ids: Sequence[str],
+        s_pos: np.ndarray,
+        s_neg: np.ndarray,
+        c_star: np.ndarray,
+    ) -> None:
+        """One row per alternative in alternative_ids; pass a subset (with matching arrays) to store fewer."""
+        self._replace(
+            "topsis_distances",
+            run_id,
+            {
+                "alternative_id": np.asarray(alternative_ids, dtype=object),
+                "s_pos": np.asarray(s_pos, dtype=float),
+                "s_neg": np.asarray(s_neg, dtype=float),
+                "c_star": np.asarray(c_star, dtype=float),
+            },
+        )
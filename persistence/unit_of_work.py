@@ -0,0 +1,78 @@
+# persistence/unit_of_work.py
+"""
+Several repository writes over one connection and one transaction.
+
+    with UnitOfWork(engine) as uow:
+        run_id = uow.repo(RunRepo).create_run(...)
+        uow.repo(TopsisRepo).save_run_config(run_id, ...)
+        uow.repo(ResultRepo).replace_scores(run_id, ...)
+
+Repositories built with uow= run their statements on uow.conn instead of
+checking out a connection and committing per method. A run is therefore
+saved with a single checkout and a single commit, and an error anywhere
+rolls the whole run back.
+
+Cache invalidations requested by those repositories are held until the
+transaction commits (and dropped on rollback), so no session re-caches a
+half-written run in between.
+"""
+from __future__ import annotations
+
+from contextlib import nullcontext
+from typing import Any, Callable, ContextManager, List, Optional, Tuple, Type, TypeVar
+
+from sqlalchemy.engine import Connection, Engine
+
+R = TypeVar("R")
+
+
+class UnitOfWork:
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.conn: Optional[Connection] = None
+        self._tx = None
+        self._pending: List[Tuple[Callable[..., Any], tuple]] = []
+
+    def __enter__(self) -> "UnitOfWork":
+        if self._tx is not None:
+            raise RuntimeError("UnitOfWork is already active")
+        self._tx = self.engine.begin()
+        self.conn = self._tx.__enter__()
+        self._pending = []
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        tx, self._tx, self.conn = self._tx, None, None
+        pending, self._pending = self._pending, []
+        tx.__exit__(exc_type, exc, tb)  # commits, or rolls back on error
+        if exc_type is None:
+            for fn, args in pending:
+                fn(*args)
+        return False
+
+    def repo(self, repo_cls: Type[R]) -> R:
+        """repo_cls bound to this unit of work."""
+        return repo_cls(self.engine, uow=self)
+
+    def after_commit(self, fn: Callable[..., Any], *args: Any) -> None:
+        if self.conn is None:
+            raise RuntimeError("UnitOfWork is not active")
+        if (fn, args) not in self._pending:
+            self._pending.append((fn, args))
+
+
+def begin(engine: Engine, uow: Optional[UnitOfWork]) -> ContextManager[Connection]:
+    """The unit of work's connection when given (committed by its owner), else engine.begin()."""
+    if uow is None:
+        return engine.begin()
+    if uow.conn is None:
+        raise RuntimeError("UnitOfWork is not active")
+    return nullcontext(uow.conn)
+
+
+def after_commit(uow: Optional[UnitOfWork], fn: Callable[..., Any], *args: Any) -> None:
+    """Call fn(*args) now, or once uow commits."""
+    if uow is None:
+        fn(*args)
+    else:
+        uow.after_commit(fn, *args)
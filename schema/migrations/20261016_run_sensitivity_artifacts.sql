@@ -0,0 +1,22 @@
+-- Precomputed sensitivity results per run, written at save time when requested.
+-- One row per run; arrays are flattened row-major:
+--   sweeps           (criteria, grid_points, alternatives) scores along each one-at-a-time sweep
+--   tornado          (2 * criteria, alternatives) scores at w_j = 0 (first half) and w_j = 1
+--   stability        (modes, criteria, 2) lower/upper stability bounds, modes = ranking, top1
+--   stability_swaps  (modes, criteria, 4) alternative positions swapping at each bound, -1 if none
+-- Names are stored so a reader can tell whether the run still matches the scenario.
+CREATE TABLE IF NOT EXISTS public.run_sensitivity (
+    run_id uuid NOT NULL,
+    alternative_names text[] NOT NULL,
+    criterion_names text[] NOT NULL,
+    base_weights double precision[] NOT NULL,
+    base_scores real[] NOT NULL,
+    grid_points integer NOT NULL,
+    sweeps real[] NOT NULL,
+    tornado real[] NOT NULL,
+    stability double precision[] NOT NULL,
+    stability_swaps integer[] NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL,
+    CONSTRAINT run_sensitivity_pkey PRIMARY KEY (run_id),
+    CONSTRAINT run_sensitivity_run_id_fkey FOREIGN KEY (run_id) REFERENCES public.runs(run_id) ON DELETE CASCADE
+);
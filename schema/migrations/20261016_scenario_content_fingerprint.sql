@@ -0,0 +1,38 @@
+-- Stored per-scenario content fingerprint for O(1) cross-scenario comparability checks.
+-- Three sha256 digests joined by ':' (alternatives, criteria metadata, measurements),
+-- so a mismatch can still be attributed to one part. Refreshed by the repositories
+-- whenever alternatives, criteria or measurements are written.
+CREATE OR REPLACE FUNCTION public.scenario_content_fingerprint(sid uuid) RETURNS text
+    LANGUAGE sql STABLE
+    AS $$
+    SELECT
+        encode(sha256(convert_to(coalesce((
+            SELECT string_agg(a.name, E'\x1f' ORDER BY a.name)
+            FROM public.alternatives a
+            WHERE a.scenario_id = sid
+        ), ''), 'UTF8')), 'hex')
+        || ':' ||
+        encode(sha256(convert_to(coalesce((
+            SELECT string_agg(c.name || E'\x1f' || c.direction || E'\x1f' || c.scale_type, E'\x1e' ORDER BY c.name)
+            FROM public.criteria c
+            WHERE c.scenario_id = sid
+        ), ''), 'UTF8')), 'hex')
+        || ':' ||
+        encode(sha256(convert_to(coalesce((
+            SELECT string_agg(
+                a.name || E'\x1f' || c.name || E'\x1f' || round(m.value_num::numeric, 10)::text,
+                E'\x1e' ORDER BY a.name, c.name
+            )
+            FROM public.measurements m
+            JOIN public.alternatives a ON a.alternative_id = m.alternative_id
+            JOIN public.criteria c ON c.criterion_id = m.criterion_id
+            WHERE m.scenario_id = sid
+        ), ''), 'UTF8')), 'hex')
+$$;
+
+ALTER TABLE public.scenarios
+    ADD COLUMN IF NOT EXISTS content_fingerprint text;
+
+UPDATE public.scenarios
+SET content_fingerprint = public.scenario_content_fingerprint(scenario_id)
+WHERE content_fingerprint IS NULL;
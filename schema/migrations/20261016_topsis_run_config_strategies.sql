@@ -0,0 +1,19 @@
+-- Allow pluggable TOPSIS normalization / distance strategies (core.normalization, core.distance).
+ALTER TABLE public.topsis_run_config DROP CONSTRAINT IF EXISTS topsis_run_config_normalization_check;
+ALTER TABLE public.topsis_run_config
+    ADD CONSTRAINT topsis_run_config_normalization_check
+    CHECK (normalization IN ('vector', 'minmax', 'sum', 'max', 'logarithmic'));
+
+ALTER TABLE public.topsis_run_config DROP CONSTRAINT IF EXISTS topsis_run_config_distance_check;
+ALTER TABLE public.topsis_run_config
+    ADD CONSTRAINT topsis_run_config_distance_check
+    CHECK (distance IN ('euclidean', 'manhattan', 'chebyshev', 'minkowski'));
+
+-- Minkowski order; only set when distance = 'minkowski'.
+ALTER TABLE public.topsis_run_config
+    ADD COLUMN IF NOT EXISTS distance_p double precision;
+
+ALTER TABLE public.topsis_run_config DROP CONSTRAINT IF EXISTS topsis_run_config_distance_p_check;
+ALTER TABLE public.topsis_run_config
+    ADD CONSTRAINT topsis_run_config_distance_p_check
+    CHECK ((distance = 'minkowski') = (distance_p IS NOT NULL) AND (distance_p IS NULL OR distance_p >= 1));
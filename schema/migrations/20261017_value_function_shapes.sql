@@ -0,0 +1,22 @@
+-- Exponential and S-curve value functions (core.value_functions).
+ALTER TABLE public.value_functions DROP CONSTRAINT IF EXISTS value_functions_function_type_check;
+ALTER TABLE public.value_functions
+    ADD CONSTRAINT value_functions_function_type_check
+    CHECK (function_type IN ('piecewise_linear', 'linear', 'exponential', 's_curve'));
+
+-- Shape parameters; NULL means the compile_value_function default.
+-- value_function_points keeps a sampled copy of the curve either way.
+ALTER TABLE public.value_functions
+    ADD COLUMN IF NOT EXISTS rho double precision,
+    ADD COLUMN IF NOT EXISTS midpoint double precision,
+    ADD COLUMN IF NOT EXISTS steepness double precision;
+
+ALTER TABLE public.value_functions DROP CONSTRAINT IF EXISTS value_functions_rho_check;
+ALTER TABLE public.value_functions
+    ADD CONSTRAINT value_functions_rho_check
+    CHECK (rho IS NULL OR (function_type = 'exponential' AND rho <> 0));
+
+ALTER TABLE public.value_functions DROP CONSTRAINT IF EXISTS value_functions_s_curve_check;
+ALTER TABLE public.value_functions
+    ADD CONSTRAINT value_functions_s_curve_check
+    CHECK ((midpoint IS NULL AND steepness IS NULL) OR (function_type = 's_curve' AND (steepness IS NULL OR steepness > 0)));
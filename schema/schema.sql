@@ -32,6 +32,39 @@ CREATE EXTENSION IF NOT EXISTS pgcrypto WITH SCHEMA public;
 COMMENT ON EXTENSION pgcrypto IS 'cryptographic functions';
 
 
+--
+-- Name: scenario_content_fingerprint(uuid); Type: FUNCTION; Schema: public; Owner: -
+--
+
+CREATE FUNCTION public.scenario_content_fingerprint(sid uuid) RETURNS text
+    LANGUAGE sql STABLE
+    AS $$
+    SELECT
+        encode(sha256(convert_to(coalesce((
+            SELECT string_agg(a.name, E'\x1f' ORDER BY a.name)
+            FROM public.alternatives a
+            WHERE a.scenario_id = sid
+        ), ''), 'UTF8')), 'hex')
+        || ':' ||
+        encode(sha256(convert_to(coalesce((
+            SELECT string_agg(c.name || E'\x1f' || c.direction || E'\x1f' || c.scale_type, E'\x1e' ORDER BY c.name)
+            FROM public.criteria c
+            WHERE c.scenario_id = sid
+        ), ''), 'UTF8')), 'hex')
+        || ':' ||
+        encode(sha256(convert_to(coalesce((
+            SELECT string_agg(
+                a.name || E'\x1f' || c.name || E'\x1f' || round(m.value_num::numeric, 10)::text,
+                E'\x1e' ORDER BY a.name, c.name
+            )
+            FROM public.measurements m
+            JOIN public.alternatives a ON a.alternative_id = m.alternative_id
+            JOIN public.criteria c ON c.criterion_id = m.criterion_id
+            WHERE m.scenario_id = sid
+        ), ''), 'UTF8')), 'hex')
+$$;
+
+
 SET default_tablespace = '';
 
 SET default_table_access_method = heap;
@@ -148,6 +181,25 @@ CREATE TABLE public.result_scores (
 );
 
 
+--
+-- Name: run_sensitivity; Type: TABLE; Schema: public; Owner: -
+--
+
+CREATE TABLE public.run_sensitivity (
+    run_id uuid NOT NULL,
+    alternative_names text[] NOT NULL,
+    criterion_names text[] NOT NULL,
+    base_weights double precision[] NOT NULL,
+    base_scores real[] NOT NULL,
+    grid_points integer NOT NULL,
+    sweeps real[] NOT NULL,
+    tornado real[] NOT NULL,
+    stability double precision[] NOT NULL,
+    stability_swaps integer[] NOT NULL,
+    created_at timestamp with time zone DEFAULT now() NOT NULL
+);
+
+
 --
 -- Name: runs; Type: TABLE; Schema: public; Owner: -
 --
@@ -190,6 +242,7 @@ CREATE TABLE public.scenarios (
     method_type text NOT NULL,
     created_at timestamp with time zone DEFAULT now() NOT NULL,
     created_by text,
+    content_fingerprint text,
     CONSTRAINT scenarios_method_type_check CHECK ((method_type = ANY (ARRAY['topsis'::text, 'vft'::text, 'ahp'::text])))
 );
 
@@ -239,8 +292,10 @@ CREATE TABLE public.topsis_run_config (
     run_id uuid NOT NULL,
     normalization text NOT NULL,
     distance text NOT NULL,
-    CONSTRAINT topsis_run_config_distance_check CHECK ((distance = 'euclidean'::text)),
-    CONSTRAINT topsis_run_config_normalization_check CHECK ((normalization = 'vector'::text))
+    distance_p double precision,
+    CONSTRAINT topsis_run_config_distance_check CHECK ((distance = ANY (ARRAY['euclidean'::text, 'manhattan'::text, 'chebyshev'::text, 'minkowski'::text]))),
+    CONSTRAINT topsis_run_config_distance_p_check CHECK ((((distance = 'minkowski'::text) = (distance_p IS NOT NULL)) AND ((distance_p IS NULL) OR (distance_p >= (1)::double precision)))),
+    CONSTRAINT topsis_run_config_normalization_check CHECK ((normalization = ANY (ARRAY['vector'::text, 'minmax'::text, 'sum'::text, 'max'::text, 'logarithmic'::text])))
 );
 
 
@@ -283,7 +338,12 @@ CREATE TABLE public.value_functions (
     created_at timestamp with time zone DEFAULT now() NOT NULL,
     created_by text,
     note text,
-    CONSTRAINT value_functions_function_type_check CHECK ((function_type = ANY (ARRAY['piecewise_linear'::text, 'linear'::text])))
+    rho double precision,
+    midpoint double precision,
+    steepness double precision,
+    CONSTRAINT value_functions_function_type_check CHECK ((function_type = ANY (ARRAY['piecewise_linear'::text, 'linear'::text, 'exponential'::text, 's_curve'::text]))),
+    CONSTRAINT value_functions_rho_check CHECK (((rho IS NULL) OR ((function_type = 'exponential'::text) AND (rho <> (0)::double precision)))),
+    CONSTRAINT value_functions_s_curve_check CHECK ((((midpoint IS NULL) AND (steepness IS NULL)) OR ((function_type = 's_curve'::text) AND ((steepness IS NULL) OR (steepness > (0)::double precision)))))
 );
 
 
@@ -414,6 +474,14 @@ ALTER TABLE ONLY public.result_scores
     ADD CONSTRAINT result_scores_pkey PRIMARY KEY (run_id, alternative_id);
 
 
+--
+-- Name: run_sensitivity run_sensitivity_pkey; Type: CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.run_sensitivity
+    ADD CONSTRAINT run_sensitivity_pkey PRIMARY KEY (run_id);
+
+
 --
 -- Name: runs runs_pkey; Type: CONSTRAINT; Schema: public; Owner: -
 --
@@ -706,6 +774,14 @@ ALTER TABLE ONLY public.result_scores
     ADD CONSTRAINT result_scores_run_id_fkey FOREIGN KEY (run_id) REFERENCES public.runs(run_id) ON DELETE CASCADE;
 
 
+--
+-- Name: run_sensitivity run_sensitivity_run_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
+--
+
+ALTER TABLE ONLY public.run_sensitivity
+    ADD CONSTRAINT run_sensitivity_run_id_fkey FOREIGN KEY (run_id) REFERENCES public.runs(run_id) ON DELETE CASCADE;
+
+
 --
 -- Name: runs runs_preference_set_id_fkey; Type: FK CONSTRAINT; Schema: public; Owner: -
 --
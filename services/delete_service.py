@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from persistence.input_cache import invalidate_run, invalidate_scenario
+
 
 @dataclass(frozen=True)
 class DeleteResult:
@@ -32,11 +34,16 @@ class DeleteService:
             conn.execute(text("DELETE FROM vft_criterion_utilities WHERE run_id = :rid"), {"rid": run_id})
             conn.execute(text("DELETE FROM vft_weighted_utilities WHERE run_id = :rid"), {"rid": run_id})
             conn.execute(text("DELETE FROM vft_run_config WHERE run_id = :rid"), {"rid": run_id})
+            conn.execute(text("DELETE FROM run_sensitivity WHERE run_id = :rid"), {"rid": run_id})
 
-            res = conn.execute(text("DELETE FROM runs WHERE run_id = :rid"), {"rid": run_id})
+            row = conn.execute(
+                text("DELETE FROM runs WHERE run_id = :rid RETURNING scenario_id::text"), {"rid": run_id}
+            ).first()
 
-        if res.rowcount == 0:
+        if row is None:
             return DeleteResult(False, f"No run found for run_id={run_id}")
+        invalidate_run(run_id)
+        invalidate_scenario(row[0])
         return DeleteResult(True, f"Deleted run {run_id}")
 
     def delete_scenario(self, scenario_id: str) -> DeleteResult:
@@ -59,6 +66,7 @@ class DeleteService:
                 conn.execute(text("DELETE FROM vft_criterion_utilities WHERE run_id = :rid"), {"rid": rid})
                 conn.execute(text("DELETE FROM vft_weighted_utilities WHERE run_id = :rid"), {"rid": rid})
                 conn.execute(text("DELETE FROM vft_run_config WHERE run_id = :rid"), {"rid": rid})
+                conn.execute(text("DELETE FROM run_sensitivity WHERE run_id = :rid"), {"rid": rid})
 
             conn.execute(text("DELETE FROM runs WHERE scenario_id = :sid"), {"sid": scenario_id})
             conn.execute(text("DELETE FROM criterion_weights WHERE preference_set_id IN (SELECT preference_set_id FROM preference_sets WHERE scenario_id = :sid)"), {"sid": scenario_id})
@@ -71,6 +79,9 @@ class DeleteService:
             conn.execute(text("DELETE FROM scenario_validation WHERE scenario_id = :sid"), {"sid": scenario_id})
             res = conn.execute(text("DELETE FROM scenarios WHERE scenario_id = :sid"), {"sid": scenario_id})
 
+        for (rid,) in run_ids:
+            invalidate_run(rid)
+        invalidate_scenario(scenario_id)
         if res.rowcount == 0:
             return DeleteResult(False, f"No scenario found for scenario_id={scenario_id}")
         return DeleteResult(True, f"Deleted scenario {scenario_id} and all its data")
@@ -5,6 +5,8 @@ import numpy as np
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from core.topsis import compile_directions
+
 
 @dataclass(frozen=True)
 class ScenarioData:
@@ -13,6 +15,7 @@ class ScenarioData:
     criterion_ids: List[str]
     criterion_names: List[str]
     directions: List[str]            # benefit/cost aligned with criterion order
+    benefit_mask: np.ndarray         # shape (n,), True where direction is benefit
     matrix: np.ndarray               # shape (m, n)
     weights: np.ndarray              # shape (n,)
     weight_by_criterion: Dict[str, float]
@@ -96,6 +99,7 @@ class ScenarioService:
             criterion_ids=crit_ids,
             criterion_names=crit_names,
             directions=directions,
+            benefit_mask=compile_directions(directions),
             matrix=X,
             weights=w,
             weight_by_criterion={crit_names[i]: float(w[i]) for i in range(n)},
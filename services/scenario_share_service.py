@@ -10,6 +10,8 @@ from typing import Any, Optional
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from persistence.repositories.scenario_repo import refresh_content_fingerprint
+
 
 class ScenarioShareService:
     """
@@ -134,7 +136,8 @@ class ScenarioShareService:
             vfs = conn.execute(
                 text("""
                     SELECT vf.value_function_id::text, c.name AS criterion_name,
-                           vf.function_type, vf.output_min, vf.output_max, vf.note
+                           vf.function_type, vf.rho, vf.midpoint, vf.steepness,
+                           vf.output_min, vf.output_max, vf.note
                     FROM value_functions vf
                     JOIN criteria c ON c.criterion_id = vf.criterion_id
                     WHERE vf.scenario_id = :sid
@@ -187,6 +190,18 @@ class ScenarioShareService:
                 run_dict["scores"] = [dict(r) for r in scores]
 
                 if run_dict["method"] == "topsis":
+                    # TOPSIS run config (normalization / distance strategy)
+                    cfg = conn.execute(
+                        text("""
+                            SELECT normalization, distance, distance_p
+                            FROM topsis_run_config
+                            WHERE run_id = :rid
+                        """),
+                        {"rid": run_id},
+                    ).mappings().first()
+                    if cfg:
+                        run_dict["topsis_config"] = dict(cfg)
+
                     # TOPSIS distances
                     dists = conn.execute(
                         text("""
@@ -356,6 +371,7 @@ class ScenarioShareService:
                     """),
                     {"sid": scenario_id, "aid": alt_id, "cid": crit_id, "val": m["value_num"]},
                 )
+            refresh_content_fingerprint(conn, scenario_id)
 
             # Preference sets
             pset_old_to_new = {}
@@ -401,16 +417,23 @@ class ScenarioShareService:
                 vf_row = conn.execute(
                     text("""
                         INSERT INTO value_functions
-                            (scenario_id, criterion_id, function_type, output_min, output_max, created_by, note)
-                        VALUES (:sid, :cid, :ft, :omin, :omax, :cb, :note)
+                            (scenario_id, criterion_id, function_type, rho, midpoint, steepness,
+                             output_min, output_max, created_by, note)
+                        VALUES (:sid, :cid, :ft, :rho, :mid, :steep, :omin, :omax, :cb, :note)
                         ON CONFLICT (scenario_id, criterion_id) DO UPDATE
-                            SET function_type=EXCLUDED.function_type
+                            SET function_type=EXCLUDED.function_type,
+                                rho=EXCLUDED.rho,
+                                midpoint=EXCLUDED.midpoint,
+                                steepness=EXCLUDED.steepness
                         RETURNING value_function_id::text AS value_function_id
                     """),
                     {
                         "sid": scenario_id,
                         "cid": crit_id,
                         "ft": vf.get("function_type", "linear"),
+                        "rho": vf.get("rho"),
+                        "mid": vf.get("midpoint"),
+                        "steep": vf.get("steepness"),
                         "omin": vf.get("output_min", 0.0),
                         "omax": vf.get("output_max", 1.0),
                         "cb": imported_by,
@@ -478,13 +501,19 @@ class ScenarioShareService:
 
                     # TOPSIS artifacts
                     if run.get("method") == "topsis":
+                        cfg = run.get("topsis_config") or {}
                         conn.execute(
                             text("""
-                                INSERT INTO topsis_run_config (run_id, normalization, distance)
-                                VALUES (:rid, 'vector', 'euclidean')
+                                INSERT INTO topsis_run_config (run_id, normalization, distance, distance_p)
+                                VALUES (:rid, :norm, :dist, :dp)
                                 ON CONFLICT DO NOTHING
                             """),
-                            {"rid": run_id},
+                            {
+                                "rid": run_id,
+                                "norm": cfg.get("normalization", "vector"),
+                                "dist": cfg.get("distance", "euclidean"),
+                                "dp": cfg.get("distance_p"),
+                            },
                         )
                         for d in run.get("topsis_distances", []):
                             alt_id = alt_name_to_id.get(d["alternative_name"])
@@ -1,86 +1,94 @@
-from typing import Dict, List
+from typing import Optional
 
 import numpy as np
 from sqlalchemy.engine import Engine
 
+from core.ranking import Ranking
+from core.sensitivity_artifacts import topsis_sensitivity_artifacts
 from core.topsis import compute_topsis
 from persistence.repositories.run_repo import RunRepo
 from persistence.repositories.result_repo import ResultRepo
+from persistence.repositories.sensitivity_repo import SensitivityRepo
 from persistence.repositories.topsis_repo import TopsisRepo
+from persistence.unit_of_work import UnitOfWork
 from services.scenario_service import ScenarioData
 
 
 class TopsisService:
     def __init__(self, engine: Engine):
         self.engine = engine
-        self.run_repo = RunRepo(engine)
-        self.result_repo = ResultRepo(engine)
-        self.topsis_repo = TopsisRepo(engine)
 
-    def run_and_persist(self, scenario_id: str, preference_set_id: str, executed_by: str, data: ScenarioData) -> str:
+    def run_and_persist(
+        self,
+        scenario_id: str,
+        preference_set_id: str,
+        executed_by: str,
+        data: ScenarioData,
+        normalization: str = "vector",
+        distance: str = "euclidean",
+        distance_p: Optional[float] = None,
+        top_k: Optional[int] = None,
+        precompute_sensitivity: bool = False,
+    ) -> str:
+        """
+        Compute TOPSIS for the scenario and persist the run.
+
+        top_k: store result scores and distances for the best top_k
+        alternatives only. Normalized/weighted matrices and ideals stay
+        complete because sensitivity analysis recomputes from them.
+
+        precompute_sensitivity: also store the standard sweeps, tornado
+        extremes and stability intervals for the run (run_sensitivity).
+        """
         w = data.weights.astype(float)
         w = w / (float(w.sum()) + 1e-12)
 
         artifacts = compute_topsis(
             matrix=data.matrix.astype(float),
             weights=w,
-            directions=data.directions,
-        )
-
-        run_id = self.run_repo.create_run(
-            scenario_id=scenario_id,
-            preference_set_id=preference_set_id,
-            method="topsis",
-            executed_by=executed_by,
+            directions=data.benefit_mask,
+            normalization=normalization,
+            distance=distance,
+            distance_p=distance_p,
         )
 
-        self.topsis_repo.save_run_config(run_id, normalization="vector", distance="euclidean")
-
+        normalized = artifacts.normalized_matrix
+        detail_idx = np.arange(len(data.alternative_ids)) if top_k is None else Ranking(artifacts.c_star).top(top_k)
         alt_id_to_score = {data.alternative_ids[i]: float(artifacts.c_star[i]) for i in range(len(data.alternative_ids))}
-        self.result_repo.replace_scores(run_id, alt_id_to_score)
-
-        # Persist TOPSIS matrices/artifacts
-        norm_rows: List[dict] = []
-        w_rows: List[dict] = []
-        ideal_rows: List[dict] = []
-        dist_rows: List[dict] = []
-
-        m, n = data.matrix.shape
-        for i in range(m):
-            for j in range(n):
-                norm_rows.append({
-                    "run_id": run_id,
-                    "alternative_id": data.alternative_ids[i],
-                    "criterion_id": data.criterion_ids[j],
-                    "value": float(artifacts.normalized_matrix[i, j]),
-                })
-                w_rows.append({
-                    "run_id": run_id,
-                    "alternative_id": data.alternative_ids[i],
-                    "criterion_id": data.criterion_ids[j],
-                    "value": float(artifacts.weighted_matrix[i, j]),
-                })
-
-        for j in range(n):
-            ideal_rows.append({
-                "run_id": run_id,
-                "criterion_id": data.criterion_ids[j],
-                "pos_ideal": float(artifacts.pis[j]),
-                "neg_ideal": float(artifacts.nis[j]),
-            })
+        sens = None
+        if precompute_sensitivity:
+            sens = topsis_sensitivity_artifacts(
+                normalized, data.benefit_mask, w, distance=artifacts.distance, distance_p=artifacts.distance_p
+            )
 
-        for i in range(m):
-            dist_rows.append({
-                "run_id": run_id,
-                "alternative_id": data.alternative_ids[i],
-                "s_pos": float(artifacts.s_pos[i]),
-                "s_neg": float(artifacts.s_neg[i]),
-                "c_star": float(artifacts.c_star[i]),
-            })
+        # Header, config, scores and artifacts commit together.
+        with UnitOfWork(self.engine) as uow:
+            topsis_repo = uow.repo(TopsisRepo)
+            run_id = uow.repo(RunRepo).create_run(
+                scenario_id=scenario_id,
+                preference_set_id=preference_set_id,
+                method="topsis",
+                executed_by=executed_by,
+            )
+            topsis_repo.save_run_config(
+                run_id,
+                normalization=artifacts.normalization,
+                distance=artifacts.distance,
+                distance_p=artifacts.distance_p,
+            )
+            uow.repo(ResultRepo).replace_scores(run_id, alt_id_to_score, top_k=top_k)
 
-        self.topsis_repo.replace_normalized(run_id, norm_rows)
-        self.topsis_repo.replace_weighted(run_id, w_rows)
-        self.topsis_repo.replace_ideals(run_id, ideal_rows)
-        self.topsis_repo.replace_distances(run_id, dist_rows)
+            topsis_repo.replace_normalized(run_id, data.alternative_ids, data.criterion_ids, normalized)
+            topsis_repo.replace_weighted(run_id, data.alternative_ids, data.criterion_ids, artifacts.weighted_matrix)
+            topsis_repo.replace_ideals(run_id, data.criterion_ids, artifacts.pis, artifacts.nis)
+            topsis_repo.replace_distances(
+                run_id,
+                np.asarray(data.alternative_ids, dtype=object)[detail_idx],
+                artifacts.s_pos[detail_idx],
+                artifacts.s_neg[detail_idx],
+                artifacts.c_star[detail_idx],
+            )
+            if sens is not None:
+                uow.repo(SensitivityRepo).save(run_id, data.alternative_names, data.criterion_names, sens)
 
         return run_id
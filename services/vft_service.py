@@ -8,7 +8,15 @@ from typing import Optional
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from core.ranking import Ranking
+from core.sensitivity_artifacts import vft_sensitivity_artifacts
+from core.value_functions import FUNCTION_TYPES, curve_points
+from core.vft_kernel import score_vft
 from core.vft_model import VFTModel, Attribute, Alternative
+from persistence.bulk_copy import copy_columns, matrix_columns
+from persistence.input_cache import invalidate_run, invalidate_scenario
+from persistence.repositories.sensitivity_repo import SensitivityRepo
+from persistence.unit_of_work import UnitOfWork
 
 
 class VFTService:
@@ -40,109 +48,132 @@ class VFTService:
         attributes: list,  # list of Attribute objects
         created_by: str = "",
     ) -> None:
-        """Upsert value functions into DB for all attributes."""
-        with self.engine.begin() as conn:
-            for attr in attributes:
-                crit_id = crit_map.get(attr.name)
-                if not crit_id:
-                    continue
-
-                func_type = "piecewise_linear" if attr.scaling_type == "Custom" else "linear"
-
-                # Upsert value_function
-                row = conn.execute(
-                    text("""
-                        SELECT value_function_id::text AS value_function_id
-                        FROM value_functions
-                        WHERE scenario_id = :sid AND criterion_id = :cid
-                    """),
-                    {"sid": scenario_id, "cid": crit_id},
-                ).mappings().first()
+        """
+        Upsert value functions into DB for all attributes: one upsert for
+        the function rows, one delete and one bulk insert for their points.
+        Exponential and S-curve functions keep their shape parameters and a
+        sampled copy of the curve as points.
+        """
+        functions = {}  # criterion_id -> (function_type, params, points); last attribute wins
+        for attr in attributes:
+            crit_id = crit_map.get(attr.name)
+            if not crit_id:
+                continue
 
-                if row:
-                    vf_id = row["value_function_id"]
-                    conn.execute(
-                        text("""
-                            UPDATE value_functions
-                            SET function_type = :ft, output_min = 0.0, output_max = 1.0,
-                                created_by = :cb
-                            WHERE value_function_id = :vfid
-                        """),
-                        {"ft": func_type, "cb": created_by, "vfid": vf_id},
-                    )
+            func_type = FUNCTION_TYPES.get(attr.scaling_type, "linear")
+            params = (
+                attr.rho if func_type == "exponential" else None,
+                attr.midpoint if func_type == "s_curve" else None,
+                attr.steepness if func_type == "s_curve" else None,
+            )
+            if func_type in ("exponential", "s_curve"):
+                points = curve_points(attr.value_function, attr.min_val, attr.max_val)
+            elif attr.scaling_type == "Custom" and attr.custom_points:
+                points = sorted(attr.custom_points, key=lambda p: p[0])
+            else:
+                # Linear: two-point representation
+                if attr.scaling_direction in ("Increasing", "Maximize"):
+                    points = [(attr.min_val, 0.0), (attr.max_val, 1.0)]
                 else:
-                    vf_id_row = conn.execute(
-                        text("""
-                            INSERT INTO value_functions
-                                (scenario_id, criterion_id, function_type, output_min, output_max, created_by)
-                            VALUES (:sid, :cid, :ft, 0.0, 1.0, :cb)
-                            RETURNING value_function_id::text AS value_function_id
-                        """),
-                        {"sid": scenario_id, "cid": crit_id, "ft": func_type, "cb": created_by},
-                    ).mappings().first()
-                    vf_id = vf_id_row["value_function_id"]
+                    points = [(attr.min_val, 1.0), (attr.max_val, 0.0)]
+            functions[str(crit_id)] = (func_type, params, points)
 
-                # Delete old points, insert new
-                conn.execute(
-                    text("DELETE FROM value_function_points WHERE value_function_id = :vfid"),
-                    {"vfid": vf_id},
-                )
+        if not functions:
+            return
 
-                if attr.scaling_type == "Custom" and attr.custom_points:
-                    points = sorted(attr.custom_points, key=lambda p: p[0])
-                else:
-                    # Linear: two-point representation
-                    if attr.scaling_direction in ("Increasing", "Maximize"):
-                        points = [(attr.min_val, 0.0), (attr.max_val, 1.0)]
-                    else:
-                        points = [(attr.min_val, 1.0), (attr.max_val, 0.0)]
+        with self.engine.begin() as conn:
+            rows = conn.execute(
+                text("""
+                    INSERT INTO value_functions
+                        (scenario_id, criterion_id, function_type, rho, midpoint, steepness,
+                         output_min, output_max, created_by)
+                    SELECT :sid, f.cid, f.ft, f.rho, f.mid, f.steep, 0.0, 1.0, :cb
+                    FROM unnest(
+                        CAST(:cids AS uuid[]), CAST(:fts AS text[]),
+                        CAST(:rhos AS float8[]), CAST(:mids AS float8[]), CAST(:steeps AS float8[])
+                    ) AS f(cid, ft, rho, mid, steep)
+                    ON CONFLICT (scenario_id, criterion_id) DO UPDATE
+                        SET function_type = EXCLUDED.function_type,
+                            rho = EXCLUDED.rho,
+                            midpoint = EXCLUDED.midpoint,
+                            steepness = EXCLUDED.steepness,
+                            output_min = EXCLUDED.output_min,
+                            output_max = EXCLUDED.output_max,
+                            created_by = EXCLUDED.created_by
+                    RETURNING value_function_id::text, criterion_id::text
+                """),
+                {
+                    "sid": scenario_id,
+                    "cb": created_by,
+                    "cids": list(functions),
+                    "fts": [ft for ft, _, _ in functions.values()],
+                    "rhos": [params[0] for _, params, _ in functions.values()],
+                    "mids": [params[1] for _, params, _ in functions.values()],
+                    "steeps": [params[2] for _, params, _ in functions.values()],
+                },
+            ).all()
+            vf_ids = {cid: vf_id for vf_id, cid in rows}
+
+            conn.execute(
+                text("DELETE FROM value_function_points WHERE value_function_id = ANY(CAST(:ids AS uuid[]))"),
+                {"ids": list(vf_ids.values())},
+            )
 
+            point_vf_ids, orders, xs, ys = [], [], [], []
+            for cid, (_, _, points) in functions.items():
                 for order, (x, y) in enumerate(points):
-                    conn.execute(
-                        text("""
-                            INSERT INTO value_function_points
-                                (value_function_id, point_order, x, y)
-                            VALUES (:vfid, :ord, :x, :y)
-                            ON CONFLICT (value_function_id, point_order)
-                            DO UPDATE SET x = EXCLUDED.x, y = EXCLUDED.y
-                        """),
-                        {"vfid": vf_id, "ord": order, "x": float(x), "y": float(y)},
-                    )
+                    point_vf_ids.append(vf_ids[cid])
+                    orders.append(order)
+                    xs.append(float(x))
+                    ys.append(float(y))
+            copy_columns(
+                conn,
+                "value_function_points",
+                {
+                    "value_function_id": np.asarray(point_vf_ids, dtype=object),
+                    "point_order": np.asarray(orders, dtype=int),
+                    "x": np.asarray(xs, dtype=float),
+                    "y": np.asarray(ys, dtype=float),
+                },
+            )
+        invalidate_scenario(scenario_id)
 
     def load_value_functions(self, scenario_id: str) -> dict:
-        """Load value functions keyed by criterion_id."""
+        """Load value functions keyed by criterion name, points in order."""
         with self.engine.begin() as conn:
             rows = conn.execute(
                 text("""
                     SELECT vf.value_function_id::text AS value_function_id,
                            vf.criterion_id::text AS criterion_id,
                            vf.function_type,
-                           c.name AS criterion_name
+                           vf.rho, vf.midpoint, vf.steepness,
+                           c.name AS criterion_name,
+                           p.x, p.y
                     FROM value_functions vf
                     JOIN criteria c ON c.criterion_id = vf.criterion_id
+                    LEFT JOIN value_function_points p ON p.value_function_id = vf.value_function_id
                     WHERE vf.scenario_id = :sid
+                    ORDER BY vf.criterion_id, p.point_order
                 """),
                 {"sid": scenario_id},
             ).mappings().all()
 
-            result = {}
-            for row in rows:
-                vf_id = row["value_function_id"]
-                crit_name = row["criterion_name"]
-                pts = conn.execute(
-                    text("""
-                        SELECT x, y FROM value_function_points
-                        WHERE value_function_id = :vfid
-                        ORDER BY point_order
-                    """),
-                    {"vfid": vf_id},
-                ).fetchall()
-                result[crit_name] = {
-                    "value_function_id": vf_id,
+        result = {}
+        for row in rows:
+            entry = result.setdefault(
+                row["criterion_name"],
+                {
+                    "value_function_id": row["value_function_id"],
                     "criterion_id": row["criterion_id"],
                     "function_type": row["function_type"],
-                    "points": [(float(r[0]), float(r[1])) for r in pts],
-                }
+                    "rho": row["rho"],
+                    "midpoint": row["midpoint"],
+                    "steepness": row["steepness"],
+                    "points": [],
+                },
+            )
+            if row["x"] is not None:
+                entry["points"].append((float(row["x"]), float(row["y"])))
         return result
 
     def run_and_persist(
@@ -156,42 +187,42 @@ class VFTService:
         alt_map: dict,  # name -> alternative_id
         crit_map: dict,  # name -> criterion_id
         run_label: Optional[str] = None,
+        precompute_sensitivity: bool = False,
     ) -> str:
-        """Execute VFT scoring and persist results."""
-        import numpy as np
-
+        """
+        Execute VFT scoring and persist results. With precompute_sensitivity
+        the standard sensitivity views are stored for the run as well.
+        """
         alt_names = list(matrix_df.index)
         crit_names = list(matrix_df.columns)
         attr_by_name = {a.name: a for a in attributes}
 
         # Compute utilities
-        utility_matrix = {}
-        weighted_matrix = {}
-        total_scores = {}
-
-        for alt_name in alt_names:
-            utility_matrix[alt_name] = {}
-            weighted_matrix[alt_name] = {}
-            total = 0.0
-            for crit_name in crit_names:
-                raw = float(matrix_df.loc[alt_name, crit_name])
-                attr = attr_by_name.get(crit_name)
-                if attr:
-                    u = attr.get_value(raw)
-                else:
-                    u = 0.0
-                w = float(weights.get(crit_name, 0.0))
-                utility_matrix[alt_name][crit_name] = u
-                weighted_matrix[alt_name][crit_name] = u * w
-                total += u * w
-            total_scores[alt_name] = total
+        mat = matrix_df.to_numpy(dtype=float)
+        w_arr = np.array([float(weights.get(c, 0.0)) for c in crit_names])
+        scores = score_vft(mat, [attr_by_name.get(c) for c in crit_names], w_arr)
 
         # Compute signature
-        mat = np.array([[float(matrix_df.loc[a, c]) for c in crit_names] for a in alt_names])
-        w_arr = np.array([float(weights.get(c, 0.0)) for c in crit_names])
         sig = self.compute_input_signature(mat, w_arr, ["benefit"] * len(crit_names))
 
-        with self.engine.begin() as conn:
+        # Long-format columns for every mapped cell, in matrix order
+        alt_idx = [i for i, a in enumerate(alt_names) if alt_map.get(a)]
+        crit_idx = [j for j, c in enumerate(crit_names) if crit_map.get(c)]
+        cells = np.ix_(alt_idx, crit_idx)
+        alt_ids = [alt_map[alt_names[i]] for i in alt_idx]
+        crit_ids = [crit_map[crit_names[j]] for j in crit_idx]
+
+        # Ranks count every alternative; unmapped ones are just not stored
+        order = Ranking(scores.total).order
+        mapped = np.array([bool(alt_map.get(alt_names[i])) for i in order], dtype=bool)
+        ranked = order[mapped]
+
+        sens = vft_sensitivity_artifacts(scores.utility, w_arr) if precompute_sensitivity else None
+
+        # The run_id is fresh, so every table is a plain bulk insert: no
+        # upserts and no deletes.
+        with UnitOfWork(self.engine) as uow:
+            conn = uow.conn
             row = conn.execute(
                 text("""
                     INSERT INTO runs
@@ -211,68 +242,45 @@ class VFTService:
             ).mappings().first()
             run_id = row["run_id"]
 
-            # vft_run_config
             conn.execute(
                 text("""
                     INSERT INTO vft_run_config (run_id, output_min, output_max, missing_policy)
                     VALUES (:rid, 0.0, 1.0, 'reject')
-                    ON CONFLICT (run_id) DO NOTHING
                 """),
                 {"rid": run_id},
             )
-
-            # Persist utilities
-            for alt_name in alt_names:
-                alt_id = alt_map.get(alt_name)
-                if not alt_id:
-                    continue
-                for crit_name in crit_names:
-                    crit_id = crit_map.get(crit_name)
-                    if not crit_id:
-                        continue
-                    raw = float(matrix_df.loc[alt_name, crit_name])
-                    u = utility_matrix[alt_name][crit_name]
-                    w = float(weights.get(crit_name, 0.0))
-                    wu = weighted_matrix[alt_name][crit_name]
-
-                    conn.execute(
-                        text("""
-                            INSERT INTO vft_criterion_utilities
-                                (run_id, alternative_id, criterion_id, raw_value, utility_value)
-                            VALUES (:rid, :aid, :cid, :rv, :uv)
-                            ON CONFLICT (run_id, alternative_id, criterion_id)
-                            DO UPDATE SET raw_value=EXCLUDED.raw_value, utility_value=EXCLUDED.utility_value
-                        """),
-                        {"rid": run_id, "aid": alt_id, "cid": crit_id, "rv": raw, "uv": u},
-                    )
-                    conn.execute(
-                        text("""
-                            INSERT INTO vft_weighted_utilities
-                                (run_id, alternative_id, criterion_id, weight, weighted_utility)
-                            VALUES (:rid, :aid, :cid, :w, :wu)
-                            ON CONFLICT (run_id, alternative_id, criterion_id)
-                            DO UPDATE SET weight=EXCLUDED.weight, weighted_utility=EXCLUDED.weighted_utility
-                        """),
-                        {"rid": run_id, "aid": alt_id, "cid": crit_id, "w": w, "wu": wu},
-                    )
-
-            # result_scores
-            conn.execute(
-                text("DELETE FROM result_scores WHERE run_id = :rid"),
-                {"rid": run_id},
+            copy_columns(
+                conn,
+                "vft_criterion_utilities",
+                {
+                    "run_id": run_id,
+                    **matrix_columns(alt_ids, crit_ids, mat[cells], value_key="raw_value"),
+                    "utility_value": scores.utility[cells].ravel(),
+                },
+            )
+            copy_columns(
+                conn,
+                "vft_weighted_utilities",
+                {
+                    "run_id": run_id,
+                    **matrix_columns(alt_ids, crit_ids, scores.weighted[cells], value_key="weighted_utility"),
+                    "weight": np.tile(w_arr[crit_idx], len(alt_idx)),
+                },
+            )
+            copy_columns(
+                conn,
+                "result_scores",
+                {
+                    "run_id": run_id,
+                    "alternative_id": np.array([alt_map[alt_names[i]] for i in ranked], dtype=object),
+                    "score": scores.total[ranked],
+                    "rank": np.flatnonzero(mapped) + 1,
+                },
             )
-            sorted_alts = sorted(total_scores.items(), key=lambda x: x[1], reverse=True)
-            for rank, (alt_name, score) in enumerate(sorted_alts, start=1):
-                alt_id = alt_map.get(alt_name)
-                if not alt_id:
-                    continue
-                conn.execute(
-                    text("""
-                        INSERT INTO result_scores (run_id, alternative_id, score, rank)
-                        VALUES (:rid, :aid, :sc, :rk)
-                    """),
-                    {"rid": run_id, "aid": alt_id, "sc": score, "rk": rank},
-                )
+            if sens is not None:
+                uow.repo(SensitivityRepo).save(run_id, alt_names, crit_names, sens)
+            uow.after_commit(invalidate_scenario, scenario_id)
+            uow.after_commit(invalidate_run, run_id)
 
         return run_id
 